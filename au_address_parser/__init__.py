@@ -1 +1,13 @@
-from .addr_parser import AbAddressUtility, standardise_address
\ No newline at end of file
+from .addr_parser import (MAX_LENGTH, AbAddressUtility, AddressParseError, ParsedAddress,
+                          ParseFailure, parse_many, standardise_address)
+from .aio import AsyncStandardiser
+from .cache import clear_parse_cache, disable_parse_cache, enable_parse_cache, parse_cache_info
+from .columns import parse_column
+from .gazetteer import Gazetteer, build_gazetteer
+from .gnaf import read_gnaf_psv
+from .ids import ID_SCHEMES, prop_ids
+from .incremental import Change, restandardise
+from .index import PropIndex, build_prop_index
+from .matching import AddressMatcher, Match
+from .parallel import standardise_many
+from .stats import disable_parse_stats, enable_parse_stats, parse_stats
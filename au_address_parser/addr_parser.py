@@ -1,11 +1,185 @@
-import re
+import sys
+from collections import namedtuple
 from hashlib import md5
 
+from . import cache as _cache
+from . import stats as _stats
+from .grammar import GRAMMAR
+from .ids import id_function
+from .reasons import (REASON_FORMAT, REASON_NO_LOCALITY, REASON_NO_POSTCODE, REASON_NO_STATE,
+                      REASON_NO_STREET_NAME, REASON_NO_STREET_NUMBER, REASON_NOT_A_STRING,
+                      REASON_TOO_LONG)
+from .tokenizer import parse_tokens
+
+#: A ``max_length`` that comfortably fits real addresses, for untrusted input
+MAX_LENGTH = 256
+
+#: Version of the parser's results, bumped whenever a change to the code
+#: changes any; changes to the grammar's tables show in ``GRAMMAR.version``
+PARSER_VERSION = 1
+
+PARSED_ADDR_FIELDS = ('flat_number_prefix', 'flat_number', 'flat_number_suffix',
+                      'number_first_prefix', 'number_first', 'number_first_suffix',
+                      'number_last_prefix', 'number_last', 'number_last_suffix',
+                      'street_name', 'street_type_abbr', 'street_type',
+                      'street_suffix', 'street_suffix_abbr',
+                      'locality', 'state', 'post')
+
+#: G-NAF columns an address is built from, as named in the G-NAF
+#: ``ADDRESS_VIEW`` (lower-cased)
+GNAF_FIELDS = ('flat_number_prefix', 'flat_number', 'flat_number_suffix',
+               'number_first_prefix', 'number_first', 'number_first_suffix',
+               'number_last_prefix', 'number_last', 'number_last_suffix',
+               'street_name', 'street_type_code', 'street_suffix_code',
+               'locality_name', 'state_abbreviation', 'postcode')
+
+# ``parsed_addr`` keys used when a G-NAF field is missing, in order
+_GNAF_ALIASES = {
+    'street_type_code': ('street_type', 'street_type_abbr'),
+    'street_suffix_code': ('street_suffix_abbr', 'street_suffix'),
+    'locality_name': ('locality',),
+    'state_abbreviation': ('state',),
+    'postcode': ('post',),
+}
+
+class AddressParseError(Exception):
+    """Raised when an address string can't be parsed.
+
+    :ivar reason: one of the ``REASON_*`` codes, e.g. ``'no_postcode'``.
+    """
+
+    def __init__(self, reason):
+        super().__init__(f'Not Valid Address Foramt ({reason})')
+        self.reason = reason
+
+
+ParseFailure = namedtuple('ParseFailure', ['addr_string', 'reason'])
+ParseFailure.__doc__ = """An address :func:`parse_many` couldn't parse, with the ``REASON_*`` code."""
+
+
+class ParsedAddress(namedtuple('ParsedAddress', PARSED_ADDR_FIELDS)):
+    """Compact, immutable result of parsing an address.
+
+    Holds the same parts as :attr:`AbAddressUtility.parsed_addr` in a plain
+    tuple, with ``None`` for missing parts.  State and street type/suffix
+    codes are interned, so millions of results share one copy of each.
+    The address forms and ``prop_id`` are computed each time they are read.
+
+    >>> from au_address_parser import parse_many
+    >>> parsed, = parse_many(['U2 42-44 Example St, STANMORE, NSW 2048'], compact=True)
+    >>> parsed.street_type
+    'STREET'
+    >>> parsed.std_address
+    '2/42 EXAMPLE ST, STANMORE NSW 2048'
+    >>> parsed.parsed_addr['number_last']
+    '44'
+
+    """
+
+    __slots__ = ()
+
+    _interned = frozenset(('street_type_abbr', 'street_type', 'street_suffix',
+                           'street_suffix_abbr', 'state'))
+
+    @classmethod
+    def _from_parts(cls, parts):
+        """Build from a dict of parts using empty strings for missing ones."""
+        return cls._make(
+            (sys.intern(parts[k]) if k in cls._interned else parts[k]) if parts[k] else None
+            for k in PARSED_ADDR_FIELDS)
+
+    @property
+    def parsed_addr(self):
+        """The parts as a new dict, see :attr:`AbAddressUtility.parsed_addr`."""
+        return dict(zip(PARSED_ADDR_FIELDS, self))
+
+    @property
+    def _flat(self):
+        return f"{self.flat_number_prefix or ''}{self.flat_number or ''}{self.flat_number_suffix or ''}"
+
+    @property
+    def _number_first(self):
+        return f"{self.number_first_prefix or ''}{self.number_first or ''}{self.number_first_suffix or ''}"
+
+    @property
+    def _number_last(self):
+        return f"{self.number_last_prefix or ''}{self.number_last or ''}{self.number_last_suffix or ''}"
+
+    @property
+    def _street_abbr(self):
+        return f"{self.street_name or ''}{' ' + self.street_type_abbr if self.street_type_abbr else ''}{' ' + self.street_suffix_abbr if self.street_suffix_abbr else ''}"
+
+    @property
+    def _street(self):
+        return f"{self.street_name or ''}{' ' + self.street_type if self.street_type else ''}{' ' + self.street_suffix if self.street_suffix else ''}"
+
+    @property
+    def _locality_part(self):
+        return f"{self.locality or ''} {self.state or ''} {self.post or ''}"
+
+    @property
+    def address_abbr(self):
+        flat, number_last = self._flat, self._number_last
+        return f"{flat + '/' if flat else ''}{self._number_first}{'-' + number_last if number_last else ''} {self._street_abbr}, {self._locality_part}"
+
+    @property
+    def std_address(self):
+        # Generating id requires removal of last street_number.  The fields
+        # are unpacked once, as every ID scheme formats this for each address
+        (flat_number_prefix, flat_number, flat_number_suffix,
+         number_first_prefix, number_first, number_first_suffix,
+         _, _, _, street_name, street_type_abbr, _, _, street_suffix_abbr,
+         locality, state, post) = self
+        flat = f"{flat_number_prefix or ''}{flat_number or ''}{flat_number_suffix or ''}"
+        return (f"{flat + '/' if flat else ''}"
+                f"{number_first_prefix or ''}{number_first or ''}{number_first_suffix or ''} "
+                f"{street_name or ''}{' ' + street_type_abbr if street_type_abbr else ''}"
+                f"{' ' + street_suffix_abbr if street_suffix_abbr else ''}, "
+                f"{locality or ''} {state or ''} {post or ''}")
+
+    @property
+    def address(self):
+        flat, number_last = self._flat, self._number_last
+        return f"{flat + '/' if flat else ''}{self._number_first}{'-' + number_last if number_last else ''} {self._street.title()}, {(self.locality or '').title()} {self.state or ''} {self.post or ''}"
+
+    @property
+    def prop_id(self):
+        return md5(self.std_address.encode()).hexdigest()
+
+    def address_id(self, scheme='md5_hex'):
+        """Return the ID of the address under one of the
+        :data:`~au_address_parser.ids.ID_SCHEMES`; ``'md5_hex'`` is
+        :attr:`prop_id`.  See :func:`prop_ids` for many addresses."""
+        return id_function(scheme)(self.std_address.encode())
+
+
+class _lazy(object):
+    """Compute an attribute on first access and store it on the instance,
+    later reads are plain attribute lookups and assignment still works."""
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
 
 class AbAddressUtility(object):
     """
 
     :param addr_string: address string to parse.
+    :param engine: ``'regex'`` (default) or ``'token'``, see :data:`ENGINES`.
+    :param max_length: if given, longer strings fail with ``'too_long'``
+                       before any parsing.  Together with ``engine='token'``
+                       this bounds the cost of every call, for input such as
+                       web forms where the regex engine can be made to
+                       backtrack for minutes.
+    :raises AddressParseError: if the address can't be parsed.
 
     >>> from au_address_parser import AbAddressUtility
     >>> addr = AbAddressUtility('U2 42-44 Example St, STANMORE, NSW 2048')
@@ -71,153 +245,285 @@ class AbAddressUtility(object):
 
     """
 
-    def __init__(self, addr_string):
+    rd_abbr_dict = GRAMMAR.street_type_abbrs
 
+    def __init__(self, addr_string, engine='regex', max_length=None):
+
+        if max_length is not None and len(addr_string) > max_length:
+            _stats.count_failure(REASON_TOO_LONG)
+            raise AddressParseError(REASON_TOO_LONG)
         self.addr_string = addr_string
         self._addr_string = addr_string.upper()
         self._addr_string = self._clean_address(self._addr_string)
 
-        # Try to locat comma
-        split_addr = self._addr_string.split(',')
-        if len(split_addr) == 2:      # Try to parse with 1 comma
-            street_part, locality_part = [i.strip() for i in split_addr]
-            prop_name = False
-        
-        elif len(split_addr) == 3:    # Try to parse with 2 commas
-            if re.match(r"(?P<state>(NSW|ACT|QLD|VIC|TAS|SA|NT|WA)){1}\s+(?P<post>(\d{1,4}){1})",
-                        split_addr[-1].strip()):
-                street_part, locality_part = split_addr[0].strip(
-                ), ' '.join([i.strip() for i in split_addr[-2:]])
-            else:
-                prop_name, street_part, locality_part = [
-                    i.strip() for i in split_addr]
-
-        
-        elif len(split_addr) == 1:    # Try to guess without comma
-            guess = self._addr_string.split()
-            if len(guess) == 6 or len(guess) == 7:
-                street_part, locality_part = ' '.join(
-                    guess[:3]), ' '.join(guess[3:])
-            else:
-                raise Exception('Not Valid Address Foramt')
-        else:
-            raise Exception('Not Valid Address Foramt')
-        
-        # Parse street part
-        street_part_patterns = [
-            r"(UNIT|LOT|SHOP|SUITE|U|ROOM)\s*(?P<flat_number>[A-Z]*\d+[A-Z]*)\s+(?P<number>[A-Z]*\d+[A-Z]*(-[A-Z]*\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$",
-            r"(?P<flat_number>\b[A-Z]*\d+[A-Z]*)/(?P<number>[A-Z]*\d+[A-Z]*(-\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$",
-            r"(?P<number>[A-Z]*\d+[A-Z]*(-[A-Z]*\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$"
-        ]
-        street_part_dict = {}
-        for pattern in street_part_patterns:
-            searched = re.search(pattern, street_part)
-            if searched:
-                street_part_dict = searched.groupdict()
-                break
-        
-        # Parse locality part
-        locality_part_patterns = [
-            r'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<state>(NSW|ACT|QLD|VIC|TAS|SA|NT|WA)){1}\s+(?P<post>(\d{1,4}){1}))',
-            r'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<state>(NSW|ACT|QLD|VIC|TAS|SA|NT|WA)){1})',
-            r'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<post>(\d{1,4}){1}))',
-            r'(?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)'
-        ]
-        locality_part_dict = {}
-        for pattern in locality_part_patterns:
-            searched = re.search(pattern, locality_part)
-            if searched:
-                locality_part_dict = searched.groupdict()
-                break
-        
-        # Parse flat number
-        flat_number_part = street_part_dict.get('flat_number', None)
-        if flat_number_part:
-            flat_number_dict = re.search(
-                r"(?P<flat_number_prefix>\b[A-Z]*)(?P<flat_number>\d+)(?P<flat_number_suffix>[A-Z]*)", flat_number_part).groupdict()
+        parsed, reason = self._parse(self._addr_string, engine)
+        if parsed is None:
+            raise AddressParseError(reason)
+        self._parsed = parsed
+
+    @classmethod
+    def _from_parsed(cls, addr_string, clean_addr_string, parsed):
+        """Build an instance from a :class:`ParsedAddress`, skipping
+        ``__init__``.  A ``clean_addr_string`` of ``None`` is cleaned when
+        first read."""
+        addr = cls.__new__(cls)
+        addr.addr_string = addr_string
+        if clean_addr_string is not None:
+            addr._addr_string = clean_addr_string
+        addr._parsed = parsed
+        return addr
+
+    @classmethod
+    def _parse(cls, address, engine='regex'):
+        """Parse a cleaned, upper-cased address into a :class:`ParsedAddress`,
+        going through the parse cache when it is enabled.
+
+        :param engine: name of the parse engine, a key of :data:`ENGINES`.
+        :returns: ``(parsed, None)``, or ``(None, reason)`` when the address
+                  can't be parsed.
+        """
+        try:
+            parse_address = ENGINES[engine]
+        except KeyError:
+            raise ValueError(f'engine must be one of {sorted(ENGINES)}, not {engine!r}')
+
+        parse_cache = _cache.active
+        if parse_cache is not None:
+            key = address if engine == 'regex' else (engine, address)
+            cached = parse_cache.get(key)
+            if cached is not None:
+                if isinstance(cached, str):
+                    return None, cached
+                return cached, None
+
+        stats = _stats.active
+        if stats is None:
+            parts, reason = parse_address(address)
         else:
-            flat_number_dict = {
-                'flat_number_prefix': '',
-                'flat_number': '',
-                'flat_number_suffix': '',
-            }
-
-        # Parse street number
-        number = street_part_dict.get('number', None)
-        number_dict = re.search(
-            r"((?P<number_first_prefix>\b[A-Z]+))*(?P<number_first>\d+)((?P<number_first_suffix>[A-Z]+))*(-((?P<number_last_prefix>\b[A-Z]+))*(?P<number_last>\d+)((?P<number_last_suffix>[A-Z]+))*)*", number).groupdict()
-        for k, v in number_dict.items():
-            if v is None:
-                number_dict[k] = ''
+            parts, reason = _stats.parse_traced(address, engine, parse_address, stats)
+        parsed = None if parts is None else ParsedAddress._from_parts(parts)
+        if parse_cache is not None:
+            parse_cache.put(key, reason if parsed is None else parsed)
+        return parsed, reason
+
+    @classmethod
+    def _parse_address(cls, address, trace=None):
+        """Split a cleaned, upper-cased address into parts.
+
+        Expected failures are reported rather than raised, so bulk callers
+        never pay for building a traceback.
+
+        :param address: cleaned, upper-cased address string.
+        :param trace: records the branches and timings of the stages for
+                      parse statistics, see :func:`.stats.parse_traced`.
+        :returns: ``(parts, None)``, a dict with empty strings for missing
+                  parts, or ``(None, reason)`` when the address can't be
+                  parsed.
+        """
+        branches = None if trace is None else trace.branches
+        parts = GRAMMAR.split_parts(address, branches=branches)
+        if trace is not None:
+            trace.stage('split')
+        if parts is None:
+            return None, REASON_FORMAT
+        street_part, locality_part = parts
+
+        street = GRAMMAR.match_street(street_part, branches)
+        if trace is not None:
+            trace.stage('street')
+        if street is None:
+            return None, REASON_NO_STREET_NUMBER
+        locality, reason = GRAMMAR.match_locality(locality_part, branches)
+        if trace is not None:
+            trace.stage('locality')
+        if locality is None:
+            return None, reason
 
         # Parse street name
-        street_name_part = street_part_dict.get('street_name', None)
-        street_name_dict = {
-            'street_name': '',
-            'street_type_abbr': '',
-            'street_type': '',
-            'street_suffix': '',
-            'street_suffix_abbr': ''
-        }
-        street_name_list = street_name_part.split()
+        parsed_addr, street_name_list = street
+        street_name_dict = GRAMMAR.split_street_name(street_name_list) if street_name_list else None
+        if trace is not None:
+            trace.stage('street_name')
+        if street_name_dict is None:
+            return None, REASON_NO_STREET_NAME
 
-        # Deal with unofficial_abbrs
-        street_name_list = self._deal_with_unofficial_abbrs(street_name_list)
+        # Assemble results
+        parsed_addr.update(street_name_dict)
+        parsed_addr.update(locality)
+        return parsed_addr, None
 
-        # Deal with street suffix
-        street_name_list, street_name_dict = self._deal_street_suffix(street_name_list, street_name_dict)
+    # Everything derived from the parse is computed on first access
+    @_lazy
+    def _addr_string(self):
+        return self._clean_address(self.addr_string.upper())
 
-        # Deal street abbr
-        street_name_list, street_name_dict = self._deal_street_abbr(street_name_list, street_name_dict)
+    @_lazy
+    def parsed_addr(self):
+        return self._parsed.parsed_addr
 
-        # Assemble results
-        self.parsed_addr = {}
-        for d in (flat_number_dict, number_dict, street_name_dict, locality_part_dict):
-            self.parsed_addr.update(d)
+    @_lazy
+    def address_abbr(self):
+        return self._parsed.address_abbr
+
+    @_lazy
+    def std_address(self):
+        return self._parsed.std_address
+
+    @_lazy
+    def address(self):
+        return self._parsed.address
+
+    @_lazy
+    def prop_id(self):
+        return self._parsed.prop_id
+
+    def address_id(self, scheme='md5_hex'):
+        """Return the ID of the address under one of the ID schemes, see
+        :meth:`ParsedAddress.address_id`.
+
+        >>> addr.address_id('md5')
+        b'\\xb8\\xb3\\xb9i\\xb7\\x0b)\\x0bD\\x90\\x0e\\x07\\x0f\\xcfK7'
+
+        """
+        return self._parsed.address_id(scheme)
 
-        a = self.parsed_addr
-        self._flat = f"{a['flat_number_prefix']}{a['flat_number']}{a['flat_number_suffix']}"
-        self._number_first = f"{a['number_first_prefix']}{a['number_first']}{a['number_first_suffix']}"
-        self._number_last = f"{a['number_last_prefix']}{a['number_last']}{a['number_last_suffix']}"
-        self._street_abbr = f"{a['street_name']}{' ' + a['street_type_abbr'] if len(a['street_type_abbr'])>0 else ''}{' '+a['street_suffix_abbr'] if len(a['street_suffix_abbr'])>0 else ''}"
-        self._street = f"{a['street_name']}{' ' + a['street_type'] if len(a['street_type'])>0 else ''}{' '+a['street_suffix'] if len(a['street_suffix'])>0 else ''}"
-        self._locality = a['locality']
-        self._state = a['state']
-        self._post = a['post']
+    @_lazy
+    def _flat(self):
+        return self._parsed._flat
 
-        self.address_abbr = f"{self._flat+'/' if len(self._flat)>0 else ''}{self._number_first}{'-'+self._number_last if len(self._number_last)>0 else ''} {self._street_abbr}, {a['locality']} {a['state']} {a['post']}"
+    @_lazy
+    def _number_first(self):
+        return self._parsed._number_first
 
-        # Generating id requires removal of last street_number
-        self.std_address = f"{self._flat+'/' if len(self._flat)>0 else ''}{self._number_first} {self._street_abbr}, {a['locality']} {a['state']} {a['post']}"
+    @_lazy
+    def _number_last(self):
+        return self._parsed._number_last
 
-        self.prop_id = md5(self.std_address.encode()).hexdigest()
+    @_lazy
+    def _street_abbr(self):
+        return self._parsed._street_abbr
 
-        self.address = f"{self._flat+'/' if len(self._flat)>0 else ''}{self._number_first}{'-'+self._number_last if len(self._number_last)>0 else ''} {self._street.title()}, {a['locality'].title()} {a['state']} {a['post']}"
+    @_lazy
+    def _street(self):
+        return self._parsed._street
 
-        for k, v in self.parsed_addr.items():
-            if v == '':
-                self.parsed_addr[k] = None
+    @_lazy
+    def _locality(self):
+        return self._parsed.locality
+
+    @_lazy
+    def _state(self):
+        return self._parsed.state
+
+    @_lazy
+    def _post(self):
+        return self._parsed.post
 
     @staticmethod
     def _clean_address(address):
-        address = re.sub(r'"[A-Z\s]*"\s', '', address)
-        address = re.sub(r"'[A-Z\s]*'\s", "", address)
-        address = re.sub(r"\s{2,}", " ", address)
-        address = re.sub(r",{2,}", ",", address)
-        address = address.replace('"', '')
-        address = address.replace('- ', '-')
-        address = address.replace(' -', '-')
-        address = address.replace('/ ', '/')
-        address = address.replace(' /', '/')
-        address = address.replace(' ,', ',')
-        return address
+        return GRAMMAR.clean(address)
+
+    @staticmethod
+    def _gnaf_values(fields):
+        """Return the :data:`GNAF_FIELDS` of a dict as strings, ``''`` for
+        missing ones, falling back to the matching ``parsed_addr`` keys."""
+        values = []
+        for name in GNAF_FIELDS:
+            value = fields.get(name)
+            for alias in _GNAF_ALIASES.get(name, ()):
+                if value is not None and value != '':
+                    break
+                value = fields.get(alias)
+            values.append('' if value is None else str(value))
+        return values
+
+    @staticmethod
+    def _gnaf_string(values):
+        """Format :data:`GNAF_FIELDS` values as an address string."""
+        (flat_number_prefix, flat_number, flat_number_suffix,
+         number_first_prefix, number_first, number_first_suffix,
+         number_last_prefix, number_last, number_last_suffix,
+         street_name, street_type_code, street_suffix_code,
+         locality_name, state_abbreviation, postcode) = values
+        _flat = f"{flat_number_prefix}{flat_number}{flat_number_suffix}"
+        _number_first = f"{number_first_prefix}{number_first}{number_first_suffix}"
+        _number_last = f"{number_last_prefix}{number_last}{number_last_suffix}"
+        if not number_first:
+            _number_first, _number_last = _number_last, ''
+        _street = ' '.join(p for p in (street_name, street_type_code, street_suffix_code) if p)
+        return f"{_flat+'/' if len(_flat)>0 else ''}{_number_first}{'-'+_number_last if len(_number_last)>0 else ''} {_street.title()}, {locality_name.title()} {state_abbreviation} {postcode}"
+
+    @classmethod
+    def _parse_gnaf(cls, values):
+        """Build a :class:`ParsedAddress` straight from :data:`GNAF_FIELDS`
+        values, without formatting and re-parsing an address string.
+
+        The street name, type and suffix are split with the same lookups
+        as a parse, so the result matches parsing :meth:`_gnaf_string`.
+
+        :returns: ``(parsed, None)``, or ``(None, reason)`` when a required
+                  part is missing.
+        """
+        (flat_number_prefix, flat_number, flat_number_suffix,
+         number_first_prefix, number_first, number_first_suffix,
+         number_last_prefix, number_last, number_last_suffix,
+         street_name, street_type_code, street_suffix_code,
+         locality_name, state_abbreviation, postcode) = [v.strip().upper() for v in values]
+
+        if not number_first:
+            # A lone last number reads as the street number, as in the
+            # formatted ``-44 EXAMPLE ST``
+            number_first_prefix, number_first, number_first_suffix = \
+                number_last_prefix, number_last, number_last_suffix
+            number_last_prefix = number_last = number_last_suffix = ''
+            if not number_first:
+                return None, REASON_NO_STREET_NUMBER
+        # In the order a parse of the formatted string fails in
+        if not locality_name:
+            return None, REASON_NO_LOCALITY
+        if state_abbreviation not in GRAMMAR.states:
+            return None, REASON_NO_STATE
+        if not (postcode.isdigit() and len(postcode) <= 4):
+            return None, REASON_NO_POSTCODE
+        street_name_list = f'{street_name} {street_type_code} {street_suffix_code}'.split()
+        if not street_name_list:
+            return None, REASON_NO_STREET_NAME
+        street_name_dict = GRAMMAR.split_street_name(street_name_list)
+        if street_name_dict is None:
+            return None, REASON_NO_STREET_NAME
+
+        # A prefix or suffix without its number isn't part of the address
+        if not flat_number:
+            flat_number_prefix = flat_number_suffix = ''
+        if not number_last:
+            number_last_prefix = number_last_suffix = ''
+        parts = {
+            'flat_number_prefix': flat_number_prefix,
+            'flat_number': flat_number,
+            'flat_number_suffix': flat_number_suffix,
+            'number_first_prefix': number_first_prefix,
+            'number_first': number_first,
+            'number_first_suffix': number_first_suffix,
+            'number_last_prefix': number_last_prefix,
+            'number_last': number_last,
+            'number_last_suffix': number_last_suffix,
+            'locality': ' '.join(locality_name.split()),
+            'state': state_abbreviation,
+            'post': postcode,
+        }
+        parts.update(street_name_dict)
+        return ParsedAddress._from_parts(parts), None
 
     @classmethod
     def from_gnaf_dict(cls, **kwags):
         """Create an AbAddressUtility class from a dict containing GNAF
-        information.
+        information, by formatting it as an address string and parsing it.
 
-        :params kwags: a dict from GNAF format.
+        :params kwags: a dict from GNAF format.  ``street_type`` or
+                       ``street_type_abbr``, ``street_suffix_abbr`` or
+                       ``street_suffix``, ``locality``, ``state`` and
+                       ``post`` stand in for missing G-NAF fields, so
+                       :attr:`parsed_addr` dicts are accepted too.
 
         >>> gnaf = {'flat_number_prefix': None,
                     'flat_number': '2',
@@ -238,35 +544,39 @@ class AbAddressUtility(object):
                     'postcode': '2048'}
         >>> addr = AbAddressUtility.from_gnaf_dict(**gnaf)
         >>> addr
-        <AbAddressUtility(addr_string='2/42-44 Example  , Stanmore NSW 2048')>
+        <AbAddressUtility(addr_string='2/42-44 Example Street, Stanmore NSW 2048')>
 
         """
-        a = {
-            'flat_number_prefix': kwags.get('flat_number_prefix', None),
-            'flat_number': kwags.get('flat_number', None),
-            'flat_number_suffix': kwags.get('flat_number_suffix', None),
-            'number_first_prefix': kwags.get('number_first_prefix', None),
-            'number_first': kwags.get('number_first', None),
-            'number_first_suffix': kwags.get('number_first_suffix', None),
-            'number_last_prefix': kwags.get('number_last_prefix', None),
-            'number_last': kwags.get('number_last', None),
-            'number_last_suffix': kwags.get('number_last_suffix', None),
-            'street_name': kwags.get('street_name', None),
-            'street_type_code': kwags.get('street_type_code', None),
-            'street_suffix_code': kwags.get('street_suffix_code', None),
-            'locality_name': kwags.get('locality_name', None),
-            'state_abbreviation': kwags.get('state_abbreviation', None),
-            'postcode': kwags.get('postcode', None),
-        }
-        for k, v in a.items():
-            if v is None:
-                a[k] = ''
-        _flat = f"{a['flat_number_prefix']}{a['flat_number']}{a['flat_number_suffix']}"
-        _number_first = f"{a['number_first_prefix']}{a['number_first']}{a['number_first_suffix']}"
-        _number_last = f"{a['number_last_prefix']}{a['number_last']}{a['number_last_suffix']}"
-        _street = f"{a['street_name']} {a['street_type_code']}{' '+a['street_suffix_code']}"
-        address = f"{_flat+'/' if len(_flat)>0 else ''}{_number_first}{'-'+_number_last if len(_number_last)>0 else ''} {_street.title()}, {a['locality_name'].title()} {a['state_abbreviation']} {a['postcode']}"
-        return cls(address)
+        return cls(cls._gnaf_string(cls._gnaf_values(kwags)))
+
+    @classmethod
+    def from_gnaf_fields(cls, **kwags):
+        """Create an AbAddressUtility class from G-NAF fields directly.
+
+        Takes the same fields as :meth:`from_gnaf_dict` and gives the same
+        result, but builds the parts from the fields instead of parsing a
+        formatted string, so it is several times faster.  The locality is
+        taken as given, so G-NAF localities the address patterns reject,
+        such as ``O'CONNOR``, are accepted.
+
+        :raises AddressParseError: if the street number, street name,
+                                   locality, state or postcode is missing,
+                                   or the postcode has more than four
+                                   digits.
+
+        >>> addr = AbAddressUtility.from_gnaf_fields(
+        ...     flat_number='2', number_first='42', number_last='44',
+        ...     street_name='EXAMPLE', street_type_code='STREET',
+        ...     locality_name='STANMORE', state_abbreviation='NSW', postcode='2048')
+        >>> addr.std_address
+        '2/42 EXAMPLE ST, STANMORE NSW 2048'
+
+        """
+        values = cls._gnaf_values(kwags)
+        parsed, reason = cls._parse_gnaf(values)
+        if parsed is None:
+            raise AddressParseError(reason)
+        return cls._from_parsed(cls._gnaf_string(values), None, parsed)
 
     @classmethod
     def from_elk_search(cls, **kwags):
@@ -285,92 +595,79 @@ class AbAddressUtility(object):
         address = f"{a['flat_part']+'/' if len(a['flat_part'])>0 else ''}{a['number_first']}{('-'+a['number_last']) if len(a['number_last'])>0 else ''} {a['street_part']}, {a['locality']}, {a['state']}"
         return cls(address)
 
-    def _deal_with_unofficial_abbrs(self, street_name_list):
-        unofficial_abbrs = {'BLVD': 'BOULEVARD',
-                            'LN': 'LANE', 'AV': 'AVENUE', "CR": "CRESCENT"}
-        if street_name_list[-1] in unofficial_abbrs.keys():
-            full_street_name = unofficial_abbrs[street_name_list[-1]]
-            street_name_list = street_name_list[:-1] + [full_street_name]
-        return street_name_list
-
-    def _deal_street_suffix(self, street_name_list, street_name_dict):
-        street_suffix_dict = {'WEST': 'W', 'EAST': 'E', 'NORTH': 'N', 'SOUTH': 'S', 'NORTHEAST': 'NE',
-                              'SOUTHEAST': 'SE', 'NORTHWEST': 'NW', 'SOUTHWEST': 'SW'}
-        if street_name_list[-1] in street_suffix_dict.keys():
-            street_name_dict['street_suffix'] = street_name_list[-1]
-            street_name_dict['street_suffix_abbr'] = street_suffix_dict[street_name_dict['street_suffix']]
-            street_name_list = street_name_list[:-1]
-        elif street_name_list[-1] in street_suffix_dict.values():
-            street_name_dict['street_suffix_abbr'] = street_name_list[-1]
-            for k, v in street_suffix_dict.items():
-                if street_name_list[-1] == v:
-                    street_name_dict['street_suffix'] = k
-                    break
-            street_name_list = street_name_list[:-1]
-        return street_name_list, street_name_dict
-
-    def _deal_street_abbr(self, street_name_list, street_name_dict):
-        self.rd_abbr_dict = {'ACCESS': 'ACCS', 'ALLEY': 'ALLY', 'ALLEYWAY': 'ALWY', 'AMBLE': 'AMBL', 'APPROACH': 'APP',
-                             'ARCADE': 'ARC', 'ARTERY': 'ART', 'ARTERIAL': 'ARTL', 'AVENUE': 'AVE', 'BANAN': 'BA',
-                             'BROADWAY': 'BDWY', 'BEND': 'BEND', 'BRAE': 'BRAE', 'BRACE': 'BRCE', 'BREAK': 'BRK',
-                             'BROW': 'BROW', 'BOULEVARD': 'BVD', 'BOARDWALK': 'BWLK', 'BYPASS': 'BYPA', 'BYWAY': 'BYWY',
-                             'CAUSEWAY': 'CAUS', 'CIRCUIT': 'CCT', 'CUL': 'CDS', 'CHASE': 'CH', 'CIRCLE': 'CIR',
-                             'CLOSE': 'CL', 'CIRCLET': 'CLT', 'COMMON': 'CMMN', 'CORNER': 'CNR', 'CONCOURSE': 'CON',
-                             'COVE': 'COVE', 'COPSE': 'CPS', 'CIRCUS': 'CRCS', 'CRESCENT': 'CRES', 'CROSSING': 'CRSG',
-                             'CROSS': 'CRSS', 'CREST': 'CRST', 'CUL-DE-SAC': 'CSAC', 'COURT': 'CT', 'CENTRE': 'CTR',
-                             'COURTYARD': 'CTYD', 'CUTTING': 'CUTT', 'DALE': 'DALE', 'DEVIATION': 'DEVN', 'DIP': 'DIP',
-                             'DRIVE': 'DR', 'DRIVEWAY': 'DRWY', 'DISTRIBUTOR': 'DSTR', 'EDGE': 'EDGE', 'ELBOW': 'ELB',
-                             'END': 'END', 'ENTRANCE': 'ENT', 'ESPLANADE': 'ESP', 'EXPRESSWAY': 'EXP', 'EXTENSION': 'EXTN',
-                             'FAIRWAY': 'FAWY', 'FIRETRAIL': 'FITR', 'FOLLOW': 'FOLW', 'FORMATION': 'FORM',
-                             'FRONTAGE': 'FRTG', 'FIRETRACK': 'FTRK', 'FOOTWAY': 'FTWY', 'FREEWAY': 'FWY', 'GAP': 'GAP',
-                             'GATE': 'GATE', 'GARDEN': 'GDN', 'GARDENS': 'GDNS', 'GLADE': 'GLD', 'GLEN': 'GLEN',
-                             'GROVE': 'GR', 'GRANGE': 'GRA', 'GREEN': 'GRN', 'HILL': 'HILL', 'HIGHROAD': 'HRD',
-                             'HEIGHTS': 'HTS', 'HIGHWAY': 'HWY', 'INTERCHANGE': 'INTG', 'JUNCTION': 'JNC', 'KEY': 'KEY',
-                             'LANE': 'LANE', 'LINE': 'LINE', 'LINK': 'LINK', 'LOOKOUT': 'LKT', 'LANEWAY': 'LNWY',
-                             'LOOP': 'LOOP', 'MALL': 'MALL', 'MEWS': 'MEWS', 'MEANDER': 'MNDR', 'MOTORWAY': 'MWY',
-                             'NOOK': 'NOOK', 'OUTLOOK': 'OTLK', 'PASS': 'PASS', 'PATH': 'PATH', 'PARADE': 'PDE',
-                             'PATHWAY': 'PHWY', 'PIAZZA': 'PIAZ', 'POCKET': 'PKT', 'PARKWAY': 'PKWY', 'PLACE': 'PL',
-                             'PLAZA': 'PLZA', 'POINT': 'PNT', 'PORT': 'PORT', 'PROMENADE': 'PROM', 'PASSAGE': 'PSGE',
-                             'QUADRANT': 'QDRT', 'QUAY': 'QY', 'QUAYS': 'QYS', 'RAMP': 'RAMP', 'ROAD': 'RD',
-                             'RIDGE': 'RDGE', 'ROADS': 'RDS', 'REST': 'REST', 'RING': 'RING', 'RISE': 'RISE',
-                             'RAMBLE': 'RMBL', 'ROW': 'ROW', 'ROWE': 'ROWE', 'ROUTE': 'RTE', 'RETREAT': 'RTT',
-                             'ROTARY': 'RTY', 'RUE': 'RUE', 'SUBWAY': 'SBWY', 'SHUNT': 'SHUN', 'SPUR': 'SPUR',
-                             'SQUARE': 'SQ', 'STREET': 'ST', 'STEPS': 'STPS', 'STRIP': 'STRP', 'STAIRS': 'STRS',
-                             'SERVICEWAY': 'SVWY', 'TARN': 'TARN', 'TERRACE': 'TCE', 'THOROUGHFARE': 'THOR',
-                             'TOLLWAY': 'TLWY', 'TOP': 'TOP', 'TOR': 'TOR', 'TRACK': 'TRK', 'TRAIL': 'TRL', 'TURN': 'TURN',
-                             'UNDERPASS': 'UPAS', 'VALE': 'VALE', 'VIADUCT': 'VIAD', 'VIEW': 'VIEW', 'VISTA': 'VSTA',
-                             'WALK': 'WALK', 'WAY': 'WAY', 'WHARF': 'WHRF', 'WALKWAY': 'WKWY', 'WYND': 'WYND',
-                             'OVAL': 'OVAL'}
-
-        if street_name_list[-1] in self.rd_abbr_dict.keys():
-            if street_name_list[0] == 'THE' and len(street_name_list) == 2:
-                street_name_dict['street_type_abbr'] = street_name_list[-1]
-            else:
-                street_name_dict['street_type_abbr'] = self.rd_abbr_dict[street_name_list[-1]]
-
-            street_name_dict['street_name'] = ' '.join(street_name_list[:-1])
-            street_name_dict['street_type'] = street_name_list[-1]
-
-        elif street_name_list[-1] in self.rd_abbr_dict.values():
-            street_name_dict['street_name'] = ' '.join(street_name_list[:-1])
-            street_name_dict['street_type_abbr'] = street_name_list[-1]
-            for k, v in self.rd_abbr_dict.items():
-                if street_name_dict['street_type_abbr'] == v:
-                    street_name_dict['street_type'] = k
-                    break
-            else:
-                street_name_dict['street_name'] = ' '.join(street_name_list)
+    def __repr__(self):
+        return f"<AbAddressUtility(addr_string='{self.addr_string}')>"
+
+#: Parse engines by name.  ``'regex'`` is the original pattern cascade and
+#: ``'token'`` the linear token engine in :mod:`.tokenizer`; both return the
+#: same parts for every address.
+ENGINES = {
+    'regex': AbAddressUtility._parse_address,
+    'token': parse_tokens,
+}
+
+
+def parse_many(addresses, *, on_error='record', compact=False, engine='regex', max_length=None):
+    """Parse many addresses lazily, one result per input.
+
+    Unparseable addresses don't raise; depending on ``on_error`` they are
+    yielded as a :class:`ParseFailure`, skipped, or re-raised as
+    :class:`AddressParseError`.
+
+    :param addresses: iterable of address strings.
+    :param on_error: ``'record'`` (default), ``'skip'`` or ``'raise'``.
+    :param compact: yield :class:`ParsedAddress` tuples instead of
+                    :class:`AbAddressUtility` instances.
+    :param engine: ``'regex'`` (default) or ``'token'``, see :data:`ENGINES`.
+    :param max_length: fail longer strings with ``'too_long'`` unparsed.
+                       For untrusted input use ``engine='token'`` and
+                       ``max_length=MAX_LENGTH``, so no address can stall
+                       the caller.
+
+    >>> from au_address_parser import parse_many
+    >>> list(parse_many(['22 Example ST, STANMORE, NSW 2048', 'STANMORE']))
+    [<AbAddressUtility(addr_string='22 Example ST, STANMORE, NSW 2048')>,
+    ParseFailure(addr_string='STANMORE', reason='format')]
+
+    """
+    if on_error not in ('record', 'skip', 'raise'):
+        raise ValueError(f"on_error must be 'record', 'skip' or 'raise', not {on_error!r}")
+    if engine not in ENGINES:
+        raise ValueError(f'engine must be one of {sorted(ENGINES)}, not {engine!r}')
+    return _parse_many(addresses, on_error, compact, engine, max_length)
+
+
+def _parse_many(addresses, on_error, compact, engine, max_length):
+    clean = GRAMMAR.clean
+    parse = AbAddressUtility._parse
+    from_parsed = AbAddressUtility._from_parsed
+    for addr_string in addresses:
+        if not isinstance(addr_string, str):
+            parsed, reason = None, REASON_NOT_A_STRING
+            _stats.count_failure(reason)
+        elif max_length is not None and len(addr_string) > max_length:
+            parsed, reason = None, REASON_TOO_LONG
+            _stats.count_failure(reason)
         else:
-            street_name_dict['street_name'] = ' '.join(street_name_list)
+            clean_addr_string = clean(addr_string.upper())
+            parsed, reason = parse(clean_addr_string, engine)
 
-        return street_name_list, street_name_dict
+        if parsed is not None:
+            yield parsed if compact else from_parsed(addr_string, clean_addr_string, parsed)
+        elif on_error == 'record':
+            yield ParseFailure(addr_string, reason)
+        elif on_error == 'raise':
+            raise AddressParseError(reason)
 
-    def __repr__(self):
-        return f"<AbAddressUtility(addr_string='{self.addr_string}')>"
 
-def standardise_address(address_string):
-    try:
-        addr_cls = AbAddressUtility(address_string)
-        return addr_cls.std_address
-    except:
+def standardise_address(address_string, engine='regex', max_length=None):
+    if not isinstance(address_string, str):
+        _stats.count_failure(REASON_NOT_A_STRING)
+        return None
+    if max_length is not None and len(address_string) > max_length:
+        _stats.count_failure(REASON_TOO_LONG)
+        return None
+    parsed, _ = AbAddressUtility._parse(GRAMMAR.clean(address_string.upper()), engine)
+    if parsed is None:
         return None
+    return parsed.std_address
@@ -0,0 +1,190 @@
+"""Standardise addresses from asyncio code without blocking the event loop."""
+import asyncio
+import time
+from collections import deque
+
+from .addr_parser import ENGINES, ParseFailure
+from .parallel import _parse_chunk
+from .reasons import REASON_NOT_A_STRING
+
+# asyncio.get_running_loop is new in Python 3.7; on 3.6 get_event_loop
+# returns the running loop when called from a coroutine or callback.
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncStandardiser(object):
+    """Parse addresses for coroutines in micro-batches on an executor.
+
+    When no batch is being parsed, the calls made in one turn of the event
+    loop go to the executor together straight away.  While one is, calls
+    queue until it finishes, ``max_batch_size`` addresses are waiting or
+    the oldest has waited ``max_wait`` seconds, so a lone request never
+    waits for a batch to fill and a busy service parses in large batches.
+    The event loop itself only ever queues work.  Calls for an address
+    already queued or being parsed share its result.
+
+    Parsing in the loop's default thread pool still competes with the loop
+    for the GIL; pass a :class:`~concurrent.futures.ProcessPoolExecutor`
+    to take it off the loop's process entirely.
+
+    :param max_batch_size: most addresses parsed in one executor call.
+    :param max_wait: longest time, in seconds, an address waits for its
+                     batch to fill.
+    :param executor: executor batches run on, the loop's default if
+                     ``None``.
+    :param engine: parse engine, see :func:`parse_many`.
+    :param max_length: longest address parsed, see :func:`parse_many`.
+    :param window: number of recent requests and batches the latency
+                   percentiles of :meth:`metrics` are taken over.
+
+    >>> from au_address_parser import AsyncStandardiser
+    >>> standardiser = AsyncStandardiser(max_batch_size=128, max_wait=0.002)
+    >>> await standardiser.standardise('22 Example ST, STANMORE, NSW 2048')
+    '22 EXAMPLE ST, STANMORE NSW 2048'
+    >>> standardiser.metrics()['requests']
+    1
+
+    """
+
+    def __init__(self, *, max_batch_size=256, max_wait=0.002, executor=None,
+                 engine='regex', max_length=None, window=10000):
+        if max_batch_size < 1:
+            raise ValueError(f'max_batch_size must be at least 1, not {max_batch_size}')
+        if max_wait < 0:
+            raise ValueError(f'max_wait must not be negative, not {max_wait}')
+        if engine not in ENGINES:
+            raise ValueError(f'engine must be one of {sorted(ENGINES)}, not {engine!r}')
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.engine = engine
+        self.max_length = max_length
+
+        # Futures of queued and running addresses, by address
+        self._futures = {}
+        self._queue = []
+        self._timer = None
+        self._running = set()
+
+        self._requests = 0
+        self._shared = 0
+        self._batches = 0
+        self._batched = 0
+        self._latencies = deque(maxlen=window)
+        self._batch_times = deque(maxlen=window)
+
+    async def parse(self, address):
+        """Parse ``address`` in the next batch.
+
+        :returns: a :class:`ParsedAddress`, or a :class:`ParseFailure` if it
+                  can't be parsed.
+        """
+        self._requests += 1
+        if not isinstance(address, str):
+            return ParseFailure(address, REASON_NOT_A_STRING)
+
+        start = time.perf_counter()
+        future = self._futures.get(address)
+        if future is None:
+            future = self._enqueue(address)
+        else:
+            self._shared += 1
+        # One caller giving up mustn't cancel the parse for the others
+        result = await asyncio.shield(future)
+        self._latencies.append(time.perf_counter() - start)
+        return result
+
+    async def standardise(self, address):
+        """Return the standardised ``address``, or ``None`` if it can't be
+        parsed, like :func:`standardise_address`."""
+        parsed = await self.parse(address)
+        return None if isinstance(parsed, ParseFailure) else parsed.std_address
+
+    def _enqueue(self, address):
+        loop = _running_loop()
+        future = loop.create_future()
+        self._futures[address] = future
+        self._queue.append(address)
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None and not self._running:
+            self._timer = loop.call_soon(self._flush)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return future
+
+    def _flush(self):
+        """Send the queued addresses to the executor as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+        loop = _running_loop()
+        started = time.perf_counter()
+        running = loop.run_in_executor(self.executor, _parse_chunk, batch,
+                                       self.engine, self.max_length)
+        self._running.add(running)
+        running.add_done_callback(lambda done: self._finish(batch, done, started))
+
+    def _finish(self, batch, done, started):
+        self._running.discard(done)
+        self._batches += 1
+        self._batched += len(batch)
+        self._batch_times.append(time.perf_counter() - started)
+        futures = [self._futures.pop(address) for address in batch]
+        if done.cancelled() or done.exception() is not None:
+            error = asyncio.CancelledError() if done.cancelled() else done.exception()
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for future, result in zip(futures, done.result()):
+                if not future.done():
+                    future.set_result(result)
+        # Addresses that queued behind this batch go next
+        if self._queue:
+            self._flush()
+
+    def metrics(self):
+        """Return counters and latency percentiles, in seconds, as a dict.
+
+        ``queue_depth`` addresses wait for a batch and ``in_flight`` are
+        queued or being parsed.  ``shared`` requests reused the parse of an
+        identical address in flight.  ``latency_*`` are per request, from
+        the call to its result, and ``batch_*`` per executor call.
+        """
+        latencies = sorted(self._latencies)
+        batch_times = sorted(self._batch_times)
+        return {
+            'requests': self._requests,
+            'shared': self._shared,
+            'queue_depth': len(self._queue),
+            'in_flight': len(self._futures),
+            'batches': self._batches,
+            'mean_batch_size': self._batched / self._batches if self._batches else 0.0,
+            'latency_p50': _percentile(latencies, 0.5),
+            'latency_p99': _percentile(latencies, 0.99),
+            'latency_max': latencies[-1] if latencies else None,
+            'batch_p50': _percentile(batch_times, 0.5),
+            'batch_p99': _percentile(batch_times, 0.99),
+        }
+
+    async def close(self):
+        """Parse everything still queued and wait for it to finish."""
+        self._flush()
+        if self._running:
+            await asyncio.wait(list(self._running))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
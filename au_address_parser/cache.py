@@ -0,0 +1,97 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+_MISSING = object()
+
+
+class ParseCache(object):
+    """Thread-safe, bounded LRU cache of parse results.
+
+    Keys are cleaned, upper-cased address strings, or ``(engine, address)``
+    for engines other than the default, and values are immutable parse
+    results, so cached entries can be shared between callers.
+
+    :param maxsize: maximum number of entries kept before the least
+                    recently used one is evicted.
+    """
+
+    def __init__(self, maxsize=100000):
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be at least 1, not {maxsize}')
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self._entries))
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The cache consulted by every parse, ``None`` while caching is off
+active = None
+
+
+def enable_parse_cache(maxsize=100000):
+    """Turn on result caching for every parse and return the new cache.
+
+    >>> from au_address_parser import enable_parse_cache, parse_cache_info
+    >>> cache = enable_parse_cache(maxsize=500000)
+    >>> parse_cache_info()
+    CacheInfo(hits=0, misses=0, evictions=0, maxsize=500000, currsize=0)
+
+    """
+    global active
+    active = ParseCache(maxsize)
+    return active
+
+
+def disable_parse_cache():
+    """Turn off result caching and drop the cache."""
+    global active
+    active = None
+
+
+def clear_parse_cache():
+    """Empty the active cache, if any, and reset its counters."""
+    if active is not None:
+        active.clear()
+
+
+def parse_cache_info():
+    """Return the active cache's :class:`CacheInfo`, or ``None`` if caching
+    is off."""
+    cache = active
+    return None if cache is None else cache.info()
@@ -0,0 +1,263 @@
+"""``au-addr`` command line tool.
+
+    au-addr standardise addresses.csv -o standardised.csv --column address
+    au-addr standardise feed.jsonl --workers 4 --summary summary.json
+    au-addr gazetteer NSW_ADDRESS_VIEW.psv VIC_ADDRESS_VIEW.psv -o gazetteer.bin
+    au-addr changes feed.csv --state feed.state --key-column id -o changes.csv
+
+Input is read and written a chunk of rows at a time, so memory use doesn't
+depend on the size of the file.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter, deque
+
+from .addr_parser import ENGINES, MAX_LENGTH, PARSED_ADDR_FIELDS, ParseFailure
+from .gazetteer import STATES, build_gazetteer
+from .gnaf import read_gnaf_places
+from .incremental import Change, restandardise
+from .parallel import _chunks, _map_chunks, _parse_chunk
+
+OUTPUT_FIELDS = ('std_address', 'prop_id') + PARSED_ADDR_FIELDS + ('reason',)
+
+_BUFFER_SIZE = 1 << 20
+
+
+def _result_fields(parsed):
+    if isinstance(parsed, ParseFailure):
+        return (None,) * (len(OUTPUT_FIELDS) - 1) + (parsed.reason,)
+    return (parsed.std_address, parsed.prop_id) + tuple(parsed) + (None,)
+
+
+def _format(path, fmt, default='csv'):
+    if fmt:
+        return fmt
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'csv' if path.endswith('.csv') else default
+
+
+def _open(path, mode):
+    """Open ``path``, or stdin/stdout for ``'-'``, with a large buffer so
+    rows are read and written in bulk."""
+    if path == '-':
+        path = (sys.stdin if mode == 'r' else sys.stdout).fileno()
+    return open(path, mode, encoding='utf-8', newline='', buffering=_BUFFER_SIZE,
+                closefd=not isinstance(path, int))
+
+
+def _read(stream, fmt, delimiter):
+    """Return ``(fieldnames, rows)``, rows being an iterator of dicts."""
+    if fmt == 'jsonl':
+        return None, (json.loads(line) for line in stream if line.strip())
+    reader = csv.DictReader(stream, delimiter=delimiter)
+    return reader.fieldnames or [], reader
+
+
+def _check_clash(fields, names):
+    """Stop if the input already has a field the output would overwrite."""
+    clash = [name for name in names if name in fields]
+    if clash:
+        raise SystemExit(f"au-addr: the input already has {', '.join(clash)}; "
+                         f"pass --prefix to name the output fields apart")
+
+
+def standardise(args):
+    """Run ``au-addr standardise``; return the summary dict."""
+    in_fmt = _format(args.input, args.format)
+    out_fmt = _format(args.output, args.output_format, in_fmt)
+    counts = Counter()
+    start = time.perf_counter()
+
+    names = [args.prefix + f for f in OUTPUT_FIELDS]
+    with _open(args.input, 'r') as src, _open(args.output, 'w') as dst:
+        fieldnames, rows = _read(src, in_fmt, args.delimiter)
+        if fieldnames is not None:
+            _check_clash(fieldnames, names)
+        if out_fmt == 'csv':
+            if fieldnames is None:
+                raise SystemExit('au-addr: CSV output needs CSV input')
+            writer = csv.writer(dst, delimiter=args.delimiter)
+            writer.writerow(list(fieldnames) + names)
+
+        # Rows stay here while their addresses are parsed, in order
+        pending = deque()
+
+        def address_chunks():
+            for chunk in _chunks(rows, args.chunksize):
+                pending.append(chunk)
+                yield [row.get(args.column) for row in chunk]
+
+        for results in _map_chunks(_parse_chunk, address_chunks(), args.workers,
+                                   args.engine, args.max_length):
+            chunk = pending.popleft()
+            out = []
+            for row, parsed in zip(chunk, results):
+                values = _result_fields(parsed)
+                counts[values[-1] or 'parsed'] += 1
+                if out_fmt == 'csv':
+                    out.append([row.get(f) for f in fieldnames] + list(values))
+                else:
+                    if fieldnames is None:
+                        _check_clash(row, names)
+                    row.update(zip(names, values))
+                    out.append(json.dumps(row) + '\n')
+            if out_fmt == 'csv':
+                writer.writerows(out)
+            else:
+                dst.write(''.join(out))
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    parsed = counts.pop('parsed', 0)
+    return {
+        'rows': total,
+        'parsed': parsed,
+        'failed': total - parsed,
+        'failure_reasons': dict(counts.most_common()),
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(total / elapsed) if elapsed else None,
+    }
+
+
+def gazetteer(args):
+    """Run ``au-addr gazetteer``; return the summary dict."""
+    start = time.perf_counter()
+    rows = 0
+    skipped = Counter()
+
+    def places():
+        nonlocal rows
+        for path in args.inputs:
+            for place in read_gnaf_places(path, delimiter=args.delimiter):
+                rows += 1
+                if place is None:
+                    skipped['short_row'] += 1
+                    continue
+                locality, state, post = place
+                if not locality.strip():
+                    skipped['no_locality'] += 1
+                elif state.strip().upper() not in STATES:
+                    skipped['bad_state'] += 1
+                elif not post.strip().isdigit() or len(post.strip()) > 4:
+                    skipped['bad_postcode'] += 1
+                else:
+                    yield locality, state.strip(), post.strip()
+
+    localities = build_gazetteer(args.output, places())
+    return {
+        'rows': rows,
+        'localities': localities,
+        'skipped': sum(skipped.values()),
+        'skip_reasons': dict(skipped.most_common()),
+        'seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def changes(args):
+    """Run ``au-addr changes``; return the summary dict."""
+    in_fmt = _format(args.input, args.format)
+    out_fmt = _format(args.output, args.output_format, in_fmt)
+    counts = Counter()
+    start = time.perf_counter()
+
+    with _open(args.input, 'r') as src, _open(args.output, 'w') as dst:
+        _, rows = _read(src, in_fmt, args.delimiter)
+        keyed = ((row.get(args.key_column), row.get(args.column)) for row in rows)
+        if out_fmt == 'csv':
+            writer = csv.writer(dst, delimiter=args.delimiter)
+            writer.writerow(Change._fields)
+        for change in restandardise(keyed, args.state, engine=args.engine,
+                                    max_length=args.max_length):
+            counts[change.op] += 1
+            if out_fmt == 'csv':
+                writer.writerow(change)
+            else:
+                dst.write(json.dumps(change._asdict()) + '\n')
+
+    elapsed = time.perf_counter() - start
+    return {
+        'inserts': counts['insert'],
+        'updates': counts['update'],
+        'deletes': counts['delete'],
+        'seconds': round(elapsed, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='au-addr', description='Australian address tools.')
+    commands = parser.add_subparsers(dest='command')
+    command = commands.add_parser(
+        'standardise', help='add std_address, prop_id and address parts to a CSV or JSONL file')
+    command.add_argument('input', help="CSV or JSONL file, '-' for stdin")
+    command.add_argument('-o', '--output', default='-', help="output file, '-' (default) for stdout")
+    command.add_argument('--format', choices=('csv', 'jsonl'),
+                         help='input format, by default from the file extension')
+    command.add_argument('--output-format', choices=('csv', 'jsonl'),
+                         help='output format, by default from the file extension or the input format')
+    command.add_argument('--column', default='address', help='field holding the address')
+    command.add_argument('--prefix', default='',
+                         help='prefix of the output fields, e.g. std_ when the input already '
+                              'has a state or post column')
+    command.add_argument('--delimiter', default=',', help='CSV delimiter')
+    command.add_argument('--workers', type=int, default=1,
+                         help='worker processes, defaults to 1 (parse in this process)')
+    command.add_argument('--chunksize', type=int, default=2000, help='rows parsed and written at a time')
+    command.add_argument('--engine', choices=sorted(ENGINES), default='regex')
+    command.add_argument('--max-length', type=int, default=None,
+                         help=f"fail longer addresses with 'too_long', e.g. {MAX_LENGTH}")
+    command.add_argument('--summary', help='write the run summary as JSON to this file '
+                                           'rather than stderr')
+
+    command = commands.add_parser(
+        'gazetteer', help='build a gazetteer table from G-NAF address PSV files')
+    command.add_argument('inputs', nargs='+', help='G-NAF ADDRESS_VIEW PSV files')
+    command.add_argument('-o', '--output', required=True, help='table file to write')
+    command.add_argument('--delimiter', default='|', help='PSV delimiter')
+    command.add_argument('--summary', help='write the run summary as JSON to this file '
+                                           'rather than stderr')
+
+    command = commands.add_parser(
+        'changes', help='write the rows inserted, updated or deleted since the last delivery of a feed')
+    command.add_argument('input', help="CSV or JSONL file, '-' for stdin")
+    command.add_argument('--state', required=True,
+                         help='state file of the last delivery, replaced with this one\'s')
+    command.add_argument('-o', '--output', default='-', help="output file, '-' (default) for stdout")
+    command.add_argument('--format', choices=('csv', 'jsonl'),
+                         help='input format, by default from the file extension')
+    command.add_argument('--output-format', choices=('csv', 'jsonl'),
+                         help='output format, by default from the file extension or the input format')
+    command.add_argument('--key-column', required=True, help='field identifying a row between deliveries')
+    command.add_argument('--column', default='address', help='field holding the address')
+    command.add_argument('--delimiter', default=',', help='CSV delimiter')
+    command.add_argument('--engine', choices=sorted(ENGINES), default='regex')
+    command.add_argument('--max-length', type=int, default=None,
+                         help=f"fail longer addresses with 'too_long', e.g. {MAX_LENGTH}")
+    command.add_argument('--summary', help='write the run summary as JSON to this file '
+                                           'rather than stderr')
+    args = parser.parse_args(argv)
+
+    if args.command == 'standardise':
+        if args.workers < 1 or args.chunksize < 1:
+            parser.error('--workers and --chunksize must be at least 1')
+        summary = standardise(args)
+    elif args.command == 'gazetteer':
+        summary = gazetteer(args)
+    elif args.command == 'changes':
+        summary = changes(args)
+    else:
+        parser.print_help()
+        return 2
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump(summary, f, indent=2)
+    else:
+        print(json.dumps(summary, indent=2), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
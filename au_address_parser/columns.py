@@ -0,0 +1,73 @@
+"""Parse whole pandas/NumPy columns of addresses.
+
+Needs pandas, installed with ``pip install au_address_parser[pandas]``.
+"""
+from .addr_parser import PARSED_ADDR_FIELDS, ParseFailure, parse_many
+
+COLUMN_FIELDS = PARSED_ADDR_FIELDS + ('std_address', 'prop_id', 'reason')
+
+
+def _pandas():
+    try:
+        import numpy as np
+        import pandas as pd
+    except ImportError:
+        raise ImportError('parse_column needs pandas, install au_address_parser[pandas]') from None
+    return np, pd
+
+
+def parse_column(values, *, engine='regex', max_length=None, categorical=True):
+    """Parse a column of addresses into a DataFrame of their parts.
+
+    Each distinct address is parsed once and the results are scattered back
+    to every row holding it, so columns that repeat addresses cost only as
+    much as their unique values.
+
+    :param values: pandas Series, NumPy object or string array, or list of
+                   address strings.  Missing values give empty rows.
+    :param engine: parse engine, see :func:`parse_many`.
+    :param max_length: longest address parsed, see :func:`parse_many`.
+    :param categorical: return ``category`` columns, which store each
+                        distinct value once, rather than ``object`` ones.
+    :returns: DataFrame with the :attr:`ParsedAddress.parsed_addr` parts,
+              ``std_address``, ``prop_id`` and the ``REASON_*`` code of
+              rows that couldn't be parsed, indexed like ``values``.
+
+    >>> import pandas as pd
+    >>> from au_address_parser import parse_column
+    >>> addresses = pd.Series(['22 Example ST, STANMORE, NSW 2048', 'STANMORE',
+    ...                        '22 Example ST, STANMORE, NSW 2048'])
+    >>> parse_column(addresses)[['std_address', 'reason']]
+                            std_address  reason
+    0  22 EXAMPLE ST, STANMORE NSW 2048     NaN
+    1                               NaN  format
+    2  22 EXAMPLE ST, STANMORE NSW 2048     NaN
+
+    """
+    np, pd = _pandas()
+    if not isinstance(values, (pd.Series, pd.Index, np.ndarray)):
+        values = np.array(values, dtype=object)
+    codes, uniques = pd.factorize(values)
+
+    rows = []
+    for parsed in parse_many(uniques, compact=True, engine=engine, max_length=max_length):
+        if isinstance(parsed, ParseFailure):
+            rows.append((None,) * len(PARSED_ADDR_FIELDS) + (None, None, parsed.reason))
+        else:
+            rows.append(tuple(parsed) + (parsed.std_address, parsed.prop_id, None))
+    if not rows:
+        rows = [(None,) * len(COLUMN_FIELDS)]
+    missing = codes < 0
+
+    columns = {}
+    for field, column in zip(COLUMN_FIELDS, zip(*rows)):
+        if categorical:
+            categories = pd.Categorical(column)
+            row_codes = np.where(missing, -1, categories.codes[codes])
+            columns[field] = pd.Categorical.from_codes(row_codes, dtype=categories.dtype)
+        else:
+            column = np.array(column, dtype=object)[codes]
+            column[missing] = None
+            columns[field] = column
+    index = values.index if isinstance(values, pd.Series) else None
+    return pd.DataFrame(columns, index=index)
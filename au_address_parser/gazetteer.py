@@ -0,0 +1,283 @@
+"""Gazetteer of the valid state and postcode pairs of every locality.
+
+The table is a compact binary file built ahead of time, for example from a
+G-NAF release with ``au-addr gazetteer``, and read on first use::
+
+    header   magic, locality count, pair count, names size
+    names    sorted locality names, newline-separated UTF-8
+    starts   (locality count + 1) x 4 bytes, first pair of each locality
+    states   pair count x 1 byte, index into :data:`STATES`
+    posts    pair count x 2 bytes, postcode as a number
+
+Numbers are big-endian.  Loaded, the names become a dict to their index
+and the pairs stay in typed arrays, so a lookup is one dict access and a
+slice.  A package built with a table at ``data/gazetteer.bin`` uses it by
+default.
+"""
+import os
+import struct
+import sys
+import time
+from array import array
+
+from .addr_parser import AbAddressUtility, ParseFailure
+from .grammar import GRAMMAR
+from .reasons import (REASON_LOCALITY_MISMATCH, REASON_NO_POSTCODE, REASON_NO_STATE,
+                      REASON_NOT_A_STRING, REASON_UNKNOWN_LOCALITY)
+
+#: States and territories a pair can have; ``OT`` is G-NAF's Other
+#: Territories, which the parser doesn't know but the gazetteer keeps
+STATES = GRAMMAR.states + ('OT',)
+_STATE_CODES = {state: i for i, state in enumerate(STATES)}
+
+#: Table used when :class:`Gazetteer` is given no path
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.bin')
+
+_MAGIC = b'AUGAZ001'
+_HEADER = struct.Struct('>8sIII')
+
+
+def _is_post(post):
+    return post.isdigit() and len(post) <= 4
+
+
+def build_gazetteer(path, places):
+    """Write a gazetteer table of ``places`` to ``path``.
+
+    :param places: iterable of ``(locality, state, post)``, repeats
+                   allowed, such as the parts of every address of a G-NAF
+                   release.
+    :returns: number of localities in the table.
+    :raises ValueError: if a state isn't one of :data:`STATES` or a
+                        postcode isn't one to four digits.
+
+    >>> from au_address_parser import build_gazetteer
+    >>> build_gazetteer('gazetteer.bin', [('STANMORE', 'NSW', '2048'),
+    ...                                   ('STANMORE', 'QLD', '4514')])
+    1
+
+    """
+    by_locality = {}
+    for locality, state, post in places:
+        code = _STATE_CODES.get(state.upper())
+        if code is None:
+            raise ValueError(f'{state!r} of {locality!r} is not one of {STATES}')
+        if not _is_post(post):
+            raise ValueError(f'{post!r} of {locality!r} is not a postcode')
+        by_locality.setdefault(' '.join(locality.upper().split()), set()).add((code, int(post)))
+    names = sorted(by_locality)
+    starts, states, posts = array('I', [0]), bytearray(), array('H')
+    for name in names:
+        for state, post in sorted(by_locality[name]):
+            states.append(state)
+            posts.append(post)
+        starts.append(len(posts))
+    names_blob = '\n'.join(names).encode()
+    if sys.byteorder == 'little':
+        starts.byteswap()
+        posts.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(names), len(posts), len(names_blob)))
+        f.write(names_blob)
+        f.write(starts.tobytes())
+        f.write(states)
+        f.write(posts.tobytes())
+    return len(names)
+
+
+class Gazetteer(object):
+    """Validate and complete the locality, state and postcode of addresses.
+
+    The table is read the first time it is needed, so creating one costs
+    nothing.
+
+    :param path: table written by :func:`build_gazetteer`, by default the
+                 one built into the package at :data:`DEFAULT_PATH`.
+
+    >>> from au_address_parser import Gazetteer
+    >>> gazetteer = Gazetteer('gazetteer.bin')
+    >>> gazetteer.places('STANMORE')
+    [('NSW', '2048'), ('QLD', '4514')]
+    >>> gazetteer.complete('STANMORE', post='2048')
+    ('NSW', '2048')
+    >>> gazetteer.parse('42 Example St, Stanmore 2048').std_address
+    '42 EXAMPLE ST, STANMORE NSW 2048'
+
+    """
+
+    def __init__(self, path=None):
+        self.path = DEFAULT_PATH if path is None else path
+        self._index = None
+        self._trie = None
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f'no gazetteer table at {self.path}, build one with build_gazetteer '
+                f'or `au-addr gazetteer`') from None
+        magic, localities, pairs, names_size = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f'{self.path} is not a gazetteer table')
+
+        offset = _HEADER.size
+        names = data[offset:offset + names_size].decode().split('\n') if localities else []
+        offset += names_size
+        self._starts = array('I', data[offset:offset + (localities + 1) * 4])
+        offset += (localities + 1) * 4
+        self._states = data[offset:offset + pairs]
+        offset += pairs
+        self._posts = array('H', data[offset:offset + pairs * 2])
+        if sys.byteorder == 'little':
+            self._starts.byteswap()
+            self._posts.byteswap()
+        self._index = {name: i for i, name in enumerate(names)}
+        self.load_seconds = time.perf_counter() - start
+
+    @property
+    def index(self):
+        """Locality names to their position in the table."""
+        if self._index is None:
+            self._load()
+        return self._index
+
+    @property
+    def trie(self):
+        """Token trie of the grammar and every locality, built on first use,
+        splitting addresses without commas at a known locality."""
+        if self._trie is None:
+            self._trie = GRAMMAR.token_trie(self.index)
+        return self._trie
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, locality):
+        return locality in self.index
+
+    def places(self, locality):
+        """Return the ``(state, post)`` pairs of ``locality``, an empty list
+        if it isn't in the gazetteer.  Postcodes have four digits."""
+        i = self.index.get(locality)
+        if i is None:
+            return []
+        start, end = self._starts[i], self._starts[i + 1]
+        return [(STATES[self._states[j]], f'{self._posts[j]:04d}') for j in range(start, end)]
+
+    def complete(self, locality, state=None, post=None):
+        """Fill in the state and postcode of ``locality`` from the pairs
+        agreeing with those given.
+
+        :returns: ``(state, post)`` with a missing part filled in when only
+                  one value fits and ``None`` when several do, or ``None``
+                  if the locality is unknown or no pair agrees.
+        """
+        i = self.index.get(locality)
+        if i is None:
+            return None
+        states, posts = self._states, self._posts
+        if post is not None and not _is_post(post):
+            return None
+        state_code = None if state is None else _STATE_CODES.get(state, -1)
+        post_code = None if post is None else int(post)
+        fits = [j for j in range(self._starts[i], self._starts[i + 1])
+                if (state_code is None or states[j] == state_code)
+                and (post_code is None or posts[j] == post_code)]
+        if not fits:
+            return None
+        if state is None and len({states[j] for j in fits}) == 1:
+            state = STATES[states[fits[0]]]
+        if post is None and len({posts[j] for j in fits}) == 1:
+            post = f'{posts[fits[0]]:04d}'
+        return state, post
+
+    def validate(self, parsed):
+        """Return ``None`` if a :class:`ParsedAddress` has a known locality
+        with its state and postcode, else the ``REASON_*`` code why not."""
+        if parsed.locality not in self.index:
+            return REASON_UNKNOWN_LOCALITY
+        if self.complete(parsed.locality, parsed.state, parsed.post) is None:
+            return REASON_LOCALITY_MISMATCH
+        return None
+
+    def parse(self, addr_string, engine='regex'):
+        """Parse an address, then check its locality against the gazetteer.
+
+        An address without commas is split at the start of a known
+        locality.  A missing state or postcode is filled in when the
+        locality has only one.  Words of the street that spilled into the locality, as in
+        ``42 EXAMPLE ST WEST STANMORE NSW 2048``, are moved back.
+
+        :returns: a :class:`ParsedAddress`, or a :class:`ParseFailure` whose
+                  reason may also be ``'unknown_locality'`` or
+                  ``'locality_mismatch'``.
+        """
+        if not isinstance(addr_string, str):
+            return ParseFailure(addr_string, REASON_NOT_A_STRING)
+        address = GRAMMAR.clean(addr_string.upper())
+        if ',' not in address:
+            parts = GRAMMAR.split_parts(address, self.trie)
+            if parts is not None:
+                address = f'{parts[0]}, {parts[1]}'
+        parsed, reason = AbAddressUtility._parse(address, engine)
+        if reason in (REASON_NO_STATE, REASON_NO_POSTCODE):
+            parsed = self._completed(address, engine)
+        if parsed is None:
+            return ParseFailure(addr_string, reason)
+
+        reason = self.validate(parsed)
+        if reason == REASON_UNKNOWN_LOCALITY:
+            parsed = self._unspilled(address, parsed, engine) or parsed
+            reason = self.validate(parsed)
+        if reason is not None:
+            return ParseFailure(addr_string, reason)
+        return parsed
+
+    def _completed(self, address, engine):
+        """Re-parse an address lacking a state or postcode with them filled
+        in from the gazetteer, or return ``None``."""
+        parts = GRAMMAR.split_parts(address)
+        if parts is None:
+            return None
+        street_part, locality_part = parts
+        tokens = locality_part.split()
+        post = tokens.pop() if tokens and tokens[-1].isdigit() else None
+        state = tokens.pop() if tokens and tokens[-1] in STATES else None
+        completed = self.complete(' '.join(tokens), state, post)
+        if completed is None or None in completed:
+            return None
+        return AbAddressUtility._parse(
+            f"{street_part}, {' '.join(tokens)} {completed[0]} {completed[1]}", engine)[0]
+
+    def _unspilled(self, address, parsed, engine):
+        """Move leading words of an unknown locality back into the street
+        while the rest is a known locality, or return ``None``."""
+        tokens = parsed.locality.split()
+        for k in range(1, len(tokens)):
+            locality = ' '.join(tokens[k:])
+            if self.complete(locality, parsed.state, parsed.post) is None:
+                continue
+            street_part = GRAMMAR.split_parts(address)[0]
+            reparsed, _ = AbAddressUtility._parse(
+                f"{street_part} {' '.join(tokens[:k])}, {locality} {parsed.state} {parsed.post}", engine)
+            if reparsed is not None:
+                return reparsed
+        return None
+
+    def info(self):
+        """Return the size of the table and what loading it cost, as a dict
+        of ``localities``, ``pairs``, ``load_seconds`` and ``memory_bytes``."""
+        index = self.index
+        memory = (sys.getsizeof(index) + sum(sys.getsizeof(name) for name in index)
+                  + sys.getsizeof(self._starts) + sys.getsizeof(self._states)
+                  + sys.getsizeof(self._posts))
+        return {
+            'localities': len(index),
+            'pairs': len(self._posts),
+            'load_seconds': self.load_seconds,
+            'memory_bytes': memory,
+        }
@@ -0,0 +1,131 @@
+"""Stream G-NAF pipe-separated (PSV) address files into parsed addresses.
+
+G-NAF rows already hold the address parts, so they are built straight into
+:class:`ParsedAddress` results with no address string parsed, see
+:meth:`AbAddressUtility.from_gnaf_fields`.
+"""
+import csv
+
+from .addr_parser import (GNAF_FIELDS, AbAddressUtility, AddressParseError, ParseFailure,
+                          _GNAF_ALIASES)
+from .reasons import REASON_FORMAT
+
+_BUFFER_SIZE = 1 << 20
+
+
+def read_gnaf_psv(source, *, on_error='record', id_column='address_detail_pid', delimiter='|'):
+    """Parse the rows of a G-NAF address PSV file lazily, one row at a time.
+
+    The file needs a header naming the :data:`GNAF_FIELDS` columns, in any
+    case and order, as an export of the G-NAF ``ADDRESS_VIEW`` has.  Other
+    columns are ignored.
+
+    :param source: path of the file, or a text file object.
+    :param on_error: ``'record'`` (default), ``'skip'`` or ``'raise'``, as
+                     for :func:`parse_many`.  A :class:`ParseFailure` holds
+                     the row formatted as an address string.
+    :param id_column: column yielded with each result.
+    :param delimiter: column separator.
+    :returns: iterator of ``(id, parsed)`` pairs, ``parsed`` being a
+              :class:`ParsedAddress` or :class:`ParseFailure`.  A row with
+              too few columns fails with ``'format'``, its id ``None`` if
+              it lacks that too.
+    :raises ValueError: if the header lacks a needed column.
+
+    >>> from au_address_parser import read_gnaf_psv
+    >>> for pid, parsed in read_gnaf_psv('NSW_ADDRESS_VIEW.psv'):
+    ...     print(pid, parsed.std_address, parsed.prop_id)
+    GANSW704511383 2/42 EXAMPLE ST, STANMORE NSW 2048 b8b3b969b70b290b44900e070fcf4b37
+
+    """
+    if on_error not in ('record', 'skip', 'raise'):
+        raise ValueError(f"on_error must be 'record', 'skip' or 'raise', not {on_error!r}")
+    return _read_gnaf_psv(source, on_error, id_column, delimiter)
+
+
+def _columns(header, id_column):
+    """Return the indexes of ``id_column`` and the :data:`GNAF_FIELDS` in
+    ``header``, falling back to ``parsed_addr`` names."""
+    index = {name.strip().lower(): i for i, name in enumerate(header)}
+    columns, missing = [], []
+    for name in (id_column,) + GNAF_FIELDS:
+        names = (name,) + _GNAF_ALIASES.get(name, ())
+        found = [index[n] for n in names if n in index]
+        if found:
+            columns.append(found[0])
+        else:
+            missing.append(name)
+    if missing:
+        raise ValueError(f'G-NAF file is missing columns {missing}')
+    return columns
+
+
+def read_gnaf_places(source, *, delimiter='|'):
+    """Read the locality, state and postcode of every row of a G-NAF
+    address PSV file, without building the addresses.
+
+    Unlike :func:`read_gnaf_psv`, rows whose street can't be parsed or
+    whose state the parser doesn't know, such as ``OT`` (Other
+    Territories), are read too.
+
+    :param source: path of the file, or a text file object.
+    :param delimiter: column separator.
+    :returns: iterator of ``(locality, state, post)`` as in the file, or
+              ``None`` for a row with too few columns.
+    :raises ValueError: if the header lacks a needed column.
+    """
+    if hasattr(source, 'read'):
+        yield from _read_places(source, delimiter)
+        return
+    with open(source, encoding='utf-8', newline='', buffering=_BUFFER_SIZE) as f:
+        yield from _read_places(f, delimiter)
+
+
+def _read_places(stream, delimiter):
+    rows = csv.reader(stream, delimiter=delimiter, quoting=csv.QUOTE_NONE)
+    header = next(rows, None)
+    if header is None:
+        return
+    indexes = _columns(header, 'locality_name')[1:]
+    place = [indexes[GNAF_FIELDS.index(name)]
+             for name in ('locality_name', 'state_abbreviation', 'postcode')]
+    width = max(place) + 1
+    for row in rows:
+        if not row:
+            continue
+        yield (row[place[0]], row[place[1]], row[place[2]]) if len(row) >= width else None
+
+
+def _read_gnaf_psv(source, on_error, id_column, delimiter):
+    if hasattr(source, 'read'):
+        yield from _read_rows(source, on_error, id_column, delimiter)
+        return
+    with open(source, encoding='utf-8', newline='', buffering=_BUFFER_SIZE) as f:
+        yield from _read_rows(f, on_error, id_column, delimiter)
+
+
+def _read_rows(stream, on_error, id_column, delimiter):
+    rows = csv.reader(stream, delimiter=delimiter, quoting=csv.QUOTE_NONE)
+    header = next(rows, None)
+    if header is None:
+        return
+    id_index, *indexes = _columns(header, id_column)
+    width = max(indexes + [id_index]) + 1
+    parse_gnaf = AbAddressUtility._parse_gnaf
+
+    for row in rows:
+        if not row:
+            continue
+        if len(row) < width:
+            # A truncated row, recorded as it is
+            values, parsed, reason = None, None, REASON_FORMAT
+        else:
+            values = [row[i] for i in indexes]
+            parsed, reason = parse_gnaf(values)
+        if parsed is not None:
+            yield row[id_index], parsed
+        elif on_error == 'record':
+            addr_string = delimiter.join(row) if values is None else AbAddressUtility._gnaf_string(values)
+            yield row[id_index] if id_index < len(row) else None, ParseFailure(addr_string, reason)
+        elif on_error == 'raise':
+            raise AddressParseError(reason)
@@ -0,0 +1,448 @@
+import re
+from hashlib import md5
+from types import MappingProxyType
+
+from .reasons import REASON_NO_LOCALITY, REASON_NO_POSTCODE, REASON_NO_STATE
+
+# Kinds of street name tokens in ``AddressGrammar.street_tokens``
+STREET_TYPE = 'type'
+STREET_TYPE_ABBR = 'type_abbr'
+STREET_TYPE_UNOFFICIAL = 'type_unofficial'
+STREET_SUFFIX = 'suffix'
+STREET_SUFFIX_ABBR = 'suffix_abbr'
+
+# Kinds of the other entries of ``AddressGrammar.token_trie``
+STATE = 'state'
+LOCALITY = 'locality'
+
+_TYPE_KINDS = frozenset((STREET_TYPE, STREET_TYPE_ABBR, STREET_TYPE_UNOFFICIAL))
+_ABBR_TYPE_KINDS = frozenset((STREET_TYPE_ABBR, STREET_TYPE_UNOFFICIAL))
+
+# Branches reported by ``match_street`` and ``match_locality``, one per pattern
+_STREET_BRANCHES = ('street.marker', 'street.slash', 'street.number')
+_LOCALITY_BRANCHES = ('locality.state_post', 'locality.state', 'locality.post', 'locality.name')
+
+# Trie node of no entry
+_LEAF = MappingProxyType({})
+
+_has_digit = re.compile(r'\d').search
+
+
+def _invert(mapping):
+    """Return a read-only ``value -> key`` mapping, keeping the first key."""
+    inverted = {}
+    for k, v in mapping.items():
+        inverted.setdefault(v, k)
+    return MappingProxyType(inverted)
+
+
+class AddressGrammar(object):
+    """Compiled patterns and lookup tables used by every parse.
+
+    The grammar is built once at import time as :data:`GRAMMAR`, so parsing
+    never depends on the ``re`` module cache and never rebuilds the
+    abbreviation tables.  All lookup tables are read-only mappings.
+
+    >>> from au_address_parser.grammar import GRAMMAR
+    >>> GRAMMAR.street_type_abbrs['STREET']
+    'ST'
+    >>> GRAMMAR.street_type_fulls['ST']
+    'STREET'
+    >>> GRAMMAR.street_tokens['AV']
+    ('type_unofficial', 'AVENUE', 'AVE')
+
+    """
+
+    states = ('NSW', 'ACT', 'QLD', 'VIC', 'TAS', 'SA', 'NT', 'WA')
+
+    flat_markers = ('UNIT', 'LOT', 'SHOP', 'SUITE', 'U', 'ROOM')
+
+    def __init__(self):
+        states = '|'.join(self.states)
+        flat_markers = '|'.join(self.flat_markers)
+
+        # (pattern, replacement) pairs applied by ``clean``, in order
+        self.clean_subs = (
+            (re.compile(r'"[A-Z\s]*"\s'), ''),
+            (re.compile(r"'[A-Z\s]*'\s"), ''),
+            (re.compile(r"\s{2,}"), ' '),
+            (re.compile(r",{2,}"), ','),
+        )
+        self.clean_replaces = (
+            ('"', ''),
+            ('- ', '-'),
+            (' -', '-'),
+            ('/ ', '/'),
+            (' /', '/'),
+            (' ,', ','),
+        )
+
+        self.state_post_pattern = re.compile(
+            rf"(?P<state>({states})){{1}}\s+(?P<post>(\d{{1,4}}){{1}})")
+
+        self.street_part_patterns = tuple(re.compile(p) for p in (
+            rf"({flat_markers})\s*(?P<flat_number>[A-Z]*\d+[A-Z]*)\s+(?P<number>[A-Z]*\d+[A-Z]*(-[A-Z]*\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$",
+            r"(?P<flat_number>\b[A-Z]*\d+[A-Z]*)/(?P<number>[A-Z]*\d+[A-Z]*(-[A-Z]*\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$",
+            r"(?P<number>[A-Z]*\d+[A-Z]*(-[A-Z]*\d*[A-Z]*)*\b)\s+(?P<street_name>[^,]*?)$",
+        ))
+
+        self.locality_part_patterns = tuple(re.compile(p) for p in (
+            rf'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<state>({states})){{1}}\s+(?P<post>(\d{{1,4}}){{1}})\b)',
+            rf'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<state>({states})){{1}})',
+            r'((?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)\s+(?P<post>(\d{1,4}){1})\b)',
+            r'(?P<locality>^[A-Z]+((\s|-)*[A-Z]*)*)',
+        ))
+
+        self.flat_number_pattern = re.compile(
+            r"(?P<flat_number_prefix>\b[A-Z]*)(?P<flat_number>\d+)(?P<flat_number_suffix>[A-Z]*)")
+
+        self.number_pattern = re.compile(
+            r"((?P<number_first_prefix>\b[A-Z]+))*(?P<number_first>\d+)((?P<number_first_suffix>[A-Z]+))*(-((?P<number_last_prefix>\b[A-Z]+))*(?P<number_last>\d+)((?P<number_last_suffix>[A-Z]+))*)*")
+
+        self.unofficial_abbrs = MappingProxyType({
+            'BLVD': 'BOULEVARD', 'LN': 'LANE', 'AV': 'AVENUE', 'CR': 'CRESCENT'})
+
+        self.street_suffix_abbrs = MappingProxyType({
+            'WEST': 'W', 'EAST': 'E', 'NORTH': 'N', 'SOUTH': 'S', 'NORTHEAST': 'NE',
+            'SOUTHEAST': 'SE', 'NORTHWEST': 'NW', 'SOUTHWEST': 'SW'})
+
+        self.street_type_abbrs = MappingProxyType({
+            'ACCESS': 'ACCS', 'ALLEY': 'ALLY', 'ALLEYWAY': 'ALWY', 'AMBLE': 'AMBL', 'APPROACH': 'APP',
+            'ARCADE': 'ARC', 'ARTERY': 'ART', 'ARTERIAL': 'ARTL', 'AVENUE': 'AVE', 'BANAN': 'BA',
+            'BROADWAY': 'BDWY', 'BEND': 'BEND', 'BRAE': 'BRAE', 'BRACE': 'BRCE', 'BREAK': 'BRK',
+            'BROW': 'BROW', 'BOULEVARD': 'BVD', 'BOARDWALK': 'BWLK', 'BYPASS': 'BYPA', 'BYWAY': 'BYWY',
+            'CAUSEWAY': 'CAUS', 'CIRCUIT': 'CCT', 'CUL': 'CDS', 'CHASE': 'CH', 'CIRCLE': 'CIR',
+            'CLOSE': 'CL', 'CIRCLET': 'CLT', 'COMMON': 'CMMN', 'CORNER': 'CNR', 'CONCOURSE': 'CON',
+            'COVE': 'COVE', 'COPSE': 'CPS', 'CIRCUS': 'CRCS', 'CRESCENT': 'CRES', 'CROSSING': 'CRSG',
+            'CROSS': 'CRSS', 'CREST': 'CRST', 'CUL-DE-SAC': 'CSAC', 'COURT': 'CT', 'CENTRE': 'CTR',
+            'COURTYARD': 'CTYD', 'CUTTING': 'CUTT', 'DALE': 'DALE', 'DEVIATION': 'DEVN', 'DIP': 'DIP',
+            'DRIVE': 'DR', 'DRIVEWAY': 'DRWY', 'DISTRIBUTOR': 'DSTR', 'EDGE': 'EDGE', 'ELBOW': 'ELB',
+            'END': 'END', 'ENTRANCE': 'ENT', 'ESPLANADE': 'ESP', 'EXPRESSWAY': 'EXP', 'EXTENSION': 'EXTN',
+            'FAIRWAY': 'FAWY', 'FIRETRAIL': 'FITR', 'FOLLOW': 'FOLW', 'FORMATION': 'FORM',
+            'FRONTAGE': 'FRTG', 'FIRETRACK': 'FTRK', 'FOOTWAY': 'FTWY', 'FREEWAY': 'FWY', 'GAP': 'GAP',
+            'GATE': 'GATE', 'GARDEN': 'GDN', 'GARDENS': 'GDNS', 'GLADE': 'GLD', 'GLEN': 'GLEN',
+            'GROVE': 'GR', 'GRANGE': 'GRA', 'GREEN': 'GRN', 'HILL': 'HILL', 'HIGHROAD': 'HRD',
+            'HEIGHTS': 'HTS', 'HIGHWAY': 'HWY', 'INTERCHANGE': 'INTG', 'JUNCTION': 'JNC', 'KEY': 'KEY',
+            'LANE': 'LANE', 'LINE': 'LINE', 'LINK': 'LINK', 'LOOKOUT': 'LKT', 'LANEWAY': 'LNWY',
+            'LOOP': 'LOOP', 'MALL': 'MALL', 'MEWS': 'MEWS', 'MEANDER': 'MNDR', 'MOTORWAY': 'MWY',
+            'NOOK': 'NOOK', 'OUTLOOK': 'OTLK', 'PASS': 'PASS', 'PATH': 'PATH', 'PARADE': 'PDE',
+            'PATHWAY': 'PHWY', 'PIAZZA': 'PIAZ', 'POCKET': 'PKT', 'PARKWAY': 'PKWY', 'PLACE': 'PL',
+            'PLAZA': 'PLZA', 'POINT': 'PNT', 'PORT': 'PORT', 'PROMENADE': 'PROM', 'PASSAGE': 'PSGE',
+            'QUADRANT': 'QDRT', 'QUAY': 'QY', 'QUAYS': 'QYS', 'RAMP': 'RAMP', 'ROAD': 'RD',
+            'RIDGE': 'RDGE', 'ROADS': 'RDS', 'REST': 'REST', 'RING': 'RING', 'RISE': 'RISE',
+            'RAMBLE': 'RMBL', 'ROW': 'ROW', 'ROWE': 'ROWE', 'ROUTE': 'RTE', 'RETREAT': 'RTT',
+            'ROTARY': 'RTY', 'RUE': 'RUE', 'SUBWAY': 'SBWY', 'SHUNT': 'SHUN', 'SPUR': 'SPUR',
+            'SQUARE': 'SQ', 'STREET': 'ST', 'STEPS': 'STPS', 'STRIP': 'STRP', 'STAIRS': 'STRS',
+            'SERVICEWAY': 'SVWY', 'TARN': 'TARN', 'TERRACE': 'TCE', 'THOROUGHFARE': 'THOR',
+            'TOLLWAY': 'TLWY', 'TOP': 'TOP', 'TOR': 'TOR', 'TRACK': 'TRK', 'TRAIL': 'TRL', 'TURN': 'TURN',
+            'UNDERPASS': 'UPAS', 'VALE': 'VALE', 'VIADUCT': 'VIAD', 'VIEW': 'VIEW', 'VISTA': 'VSTA',
+            'WALK': 'WALK', 'WAY': 'WAY', 'WHARF': 'WHRF', 'WALKWAY': 'WKWY', 'WYND': 'WYND',
+            'OVAL': 'OVAL'})
+
+        # Reverse indexes, so an abbreviated token costs a single lookup
+        self.street_type_fulls = _invert(self.street_type_abbrs)
+        self.street_suffix_fulls = _invert(self.street_suffix_abbrs)
+
+        # Every street type and suffix spelling to ``(kind, full, abbr)``, so
+        # classifying a street name token costs a single lookup
+        street_tokens = {}
+        for unofficial, full in self.unofficial_abbrs.items():
+            street_tokens[unofficial] = (STREET_TYPE_UNOFFICIAL, full, self.street_type_abbrs[full])
+        for full, abbr in self.street_type_abbrs.items():
+            street_tokens[abbr] = (STREET_TYPE_ABBR, full, abbr)
+        for full, abbr in self.street_type_abbrs.items():
+            street_tokens[full] = (STREET_TYPE, full, abbr)
+        for full, abbr in self.street_suffix_abbrs.items():
+            street_tokens[abbr] = (STREET_SUFFIX_ABBR, full, abbr)
+            street_tokens[full] = (STREET_SUFFIX, full, abbr)
+        self.street_tokens = MappingProxyType(street_tokens)
+
+        self.trie = self.token_trie()
+
+        # Digest of every pattern and table, so stored results can be told
+        # apart from those of a different grammar
+        self.version = md5(repr((
+            self.states, self.flat_markers,
+            [(p.pattern, r) for p, r in self.clean_subs], self.clean_replaces,
+            [p.pattern for p in (self.state_post_pattern, self.flat_number_pattern, self.number_pattern)
+             + self.street_part_patterns + self.locality_part_patterns],
+            sorted(self.street_tokens.items()),
+        )).encode()).hexdigest()[:12]
+
+    def token_trie(self, localities=()):
+        """Return a trie of the tokens of every street type and suffix
+        spelling, every state and the given ``localities``.
+
+        Each node is a dict from a token to the next node.  The kinds of the
+        entries ending at a node, such as ``'type_abbr'`` or ``'locality'``,
+        are a tuple under its ``''`` key, and those of the whole trie under
+        the root's.
+
+        >>> trie = GRAMMAR.token_trie(['ST KILDA'])
+        >>> trie['ST']['']
+        ('type_abbr',)
+        >>> trie['ST']['KILDA']['']
+        ('locality',)
+
+        """
+        entries = [(token, entry[0]) for token, entry in self.street_tokens.items()]
+        entries += [(state, STATE) for state in self.states]
+        entries += [(locality, LOCALITY) for locality in localities]
+        trie = {'': tuple(sorted({kind for _, kind in entries}))}
+        for words, kind in entries:
+            node = trie
+            for word in words.split():
+                node = node.setdefault(word, {})
+            node[''] = node.get('', ()) + (kind,)
+        return trie
+
+    def split_parts(self, address, trie=None, branches=None):
+        """Split a cleaned address into its street and locality parts.
+
+        :param trie: token trie finding the end of the street when there is
+                     no comma, :attr:`trie` if ``None``, see
+                     :meth:`split_tokens`.
+        :param branches: list the layout found is appended to, such as
+                         ``'split.one_comma'``, for parse statistics.
+        :returns: ``(street_part, locality_part)``, or ``None`` if the commas
+                  don't fit any known layout.
+        """
+        # Try to locat comma
+        split_addr = address.split(',')
+        if len(split_addr) == 2:      # Try to parse with 1 comma
+            if branches is not None:
+                branches.append('split.one_comma')
+            street_part, locality_part = [i.strip() for i in split_addr]
+
+        elif len(split_addr) == 3:    # Try to parse with 2 commas
+            if self.state_post_pattern.match(split_addr[-1].strip()):
+                if branches is not None:
+                    branches.append('split.two_commas')
+                street_part, locality_part = split_addr[0].strip(
+                ), ' '.join([i.strip() for i in split_addr[-2:]])
+            else:
+                # The first part is a property name
+                if branches is not None:
+                    branches.append('split.property_name')
+                street_part, locality_part = [i.strip() for i in split_addr[1:]]
+
+        elif len(split_addr) == 1:    # Find the end of the street
+            if branches is not None:
+                branches.append('split.no_comma')
+            tokens = address.split()
+            boundary = self.split_tokens(tokens, trie)
+            if boundary is None:
+                return None
+            street_part, locality_part = ' '.join(tokens[:boundary]), ' '.join(tokens[boundary:])
+        else:
+            if branches is not None:
+                branches.append('split.bad_commas')
+            return None
+        return street_part, locality_part
+
+    def split_tokens(self, tokens, trie=None):
+        """Find where the street ends in the tokens of an address without
+        commas, in one pass from left to right.
+
+        The street starts after the flat and street numbers and has at least
+        one name token.  The locality ends before a trailing state and
+        postcode.  The first token starting a known locality of ``trie``
+        that runs to that end wins.  Failing that, the street ends at its
+        first street type, along with an abbreviated suffix after it.  A
+        full street type word followed by an abbreviated type, as in
+        ``OCEAN VIEW RD``, is taken as part of the name, and a full suffix
+        word such as ``NORTH`` as the start of the locality.  A street with
+        no type has a one-word name.
+
+        :param tokens: upper-cased tokens of a cleaned address.
+        :param trie: token trie from :meth:`token_trie`, :attr:`trie` if
+                     ``None``.
+        :returns: index of the first locality token, or ``None`` if the
+                  street or locality would be empty.
+
+        >>> GRAMMAR.split_tokens('U2 42 OCEAN VIEW RD W ST KILDA VIC 3182'.split())
+        6
+
+        """
+        if trie is None:
+            trie = self.trie
+        get = trie.get
+        end = len(tokens)
+        if end and tokens[end - 1].isdigit():
+            end -= 1
+        if end and STATE in get(tokens[end - 1], _LEAF).get('', ()):
+            end -= 1
+
+        start = 0
+        if tokens and tokens[0] in self.flat_markers:
+            start = 1
+        if start < end and _has_digit(tokens[start]):
+            start += 1
+            # A flat number, as in ``UNIT 2 42`` or ``U2 42``
+            if start < end and (start == 2 or tokens[0].startswith(self.flat_markers)) \
+                    and _has_digit(tokens[start]):
+                start += 1
+
+        localities = LOCALITY in trie['']
+        boundary = None
+        for i in range(start + 1, end):
+            node = get(tokens[i])
+            if node is None:
+                continue
+            if localities:
+                # Does a known locality run from here to the end?
+                locality = node
+                for token in tokens[i + 1:end]:
+                    locality = locality.get(token)
+                    if locality is None:
+                        break
+                else:
+                    if LOCALITY in locality.get('', ()):
+                        return i
+
+            if boundary is not None or i + 1 == end or _TYPE_KINDS.isdisjoint(node.get('', ())):
+                continue
+            after = get(tokens[i + 1], _LEAF).get('', ())
+            if i + 2 < end and STREET_SUFFIX_ABBR in after:
+                boundary = i + 2
+            elif i + 2 < end and STREET_TYPE in node.get('', ()) and STREET_TYPE_ABBR in after \
+                    and tokens[i + 1] != 'ST':
+                # A full type word before an abbreviated type is part of
+                # the name; ``ST`` may be Saint starting the locality
+                continue
+            else:
+                boundary = i + 1
+            if not localities:
+                break
+
+        if boundary is None and start + 1 < end \
+                and _ABBR_TYPE_KINDS.isdisjoint(get(tokens[end - 1], _LEAF).get('', ())):
+            # No street type: take a one-word street name, unless an
+            # abbreviated type is last and the locality missing.  A full
+            # type word can end a locality, as in ``KINGS CROSS``.
+            boundary = start + 1
+        return boundary
+
+    def match_street(self, street_part, branches=None):
+        """Match the flat and street numbers of a street part with the
+        street patterns.
+
+        :param branches: list the pattern matched is appended to, such as
+                         ``'street.slash'``, or ``'street.none'``.
+        :returns: ``(parts, street_name_list)`` where ``parts`` holds the
+                  ``flat_number*`` and ``number*`` parts with empty strings
+                  for missing ones, or ``None`` if there's no street number.
+        """
+        for i, pattern in enumerate(self.street_part_patterns):
+            searched = pattern.search(street_part)
+            if searched:
+                street_part_dict = searched.groupdict()
+                break
+        else:
+            if branches is not None:
+                branches.append('street.none')
+            return None
+        if branches is not None:
+            branches.append(_STREET_BRANCHES[i])
+
+        parts = self.street_numbers(street_part_dict.get('flat_number', None),
+                                    street_part_dict['number'])
+        return parts, street_part_dict['street_name'].split()
+
+    def street_numbers(self, flat_number, number):
+        """Split a matched flat number (or ``None``) and street number into
+        the ``flat_number*`` and ``number*`` parts."""
+        # Parse flat number
+        if flat_number:
+            parts = self.flat_number_pattern.search(flat_number).groupdict()
+        else:
+            parts = {
+                'flat_number_prefix': '',
+                'flat_number': '',
+                'flat_number_suffix': '',
+            }
+
+        # Parse street number
+        number_dict = self.number_pattern.search(number).groupdict()
+        for k, v in number_dict.items():
+            parts[k] = '' if v is None else v
+        return parts
+
+    def match_locality(self, locality_part, branches=None):
+        """Match the locality, state and postcode with the locality patterns.
+
+        :param branches: list the pattern matched is appended to, such as
+                         ``'locality.state_post'``, or ``'locality.none'``.
+        :returns: ``(parts, None)``, or ``(None, reason)`` if the state or
+                  postcode is missing.
+        """
+        for i, pattern in enumerate(self.locality_part_patterns):
+            searched = pattern.search(locality_part)
+            if searched:
+                locality_part_dict = searched.groupdict()
+                break
+        else:
+            if branches is not None:
+                branches.append('locality.none')
+            return None, REASON_NO_LOCALITY
+        if branches is not None:
+            branches.append(_LOCALITY_BRANCHES[i])
+        if 'state' not in locality_part_dict:
+            return None, REASON_NO_STATE
+        if 'post' not in locality_part_dict:
+            return None, REASON_NO_POSTCODE
+        return locality_part_dict, None
+
+    def split_street_name(self, street_name_list):
+        """Split street name tokens into name, type and suffix.
+
+        A trailing suffix (``WEST``, ``W``, ...) is taken first, then a street
+        type before it.  Unofficial abbreviations such as ``LN`` only count as
+        the very last token.
+
+        :param street_name_list: non-empty list of upper-cased tokens.
+        :returns: dict of the ``street_*`` parts with empty strings for
+                  missing ones, or ``None`` if only a suffix is left.
+        """
+        street_name_dict = {
+            'street_name': '',
+            'street_type_abbr': '',
+            'street_type': '',
+            'street_suffix': '',
+            'street_suffix_abbr': ''
+        }
+        street_tokens = self.street_tokens
+        entry = street_tokens.get(street_name_list[-1])
+
+        if entry is not None and (entry[0] == STREET_SUFFIX or entry[0] == STREET_SUFFIX_ABBR):
+            street_name_dict['street_suffix'] = entry[1]
+            street_name_dict['street_suffix_abbr'] = entry[2]
+            street_name_list = street_name_list[:-1]
+            if not street_name_list:
+                return None
+            entry = street_tokens.get(street_name_list[-1])
+            if entry is not None and entry[0] == STREET_TYPE_UNOFFICIAL:
+                entry = None
+
+        if entry is None or entry[0] == STREET_SUFFIX or entry[0] == STREET_SUFFIX_ABBR:
+            street_name_dict['street_name'] = ' '.join(street_name_list)
+            return street_name_dict
+
+        kind, full, abbr = entry
+        if kind != STREET_TYPE_ABBR and street_name_list[0] == 'THE' and len(street_name_list) == 2:
+            abbr = full
+        street_name_dict['street_name'] = ' '.join(street_name_list[:-1])
+        street_name_dict['street_type_abbr'] = abbr
+        street_name_dict['street_type'] = full
+        return street_name_dict
+
+    def clean(self, address):
+        """Normalise spacing and punctuation of an upper-cased address."""
+        for pattern, repl in self.clean_subs:
+            address = pattern.sub(repl, address)
+        for old, new in self.clean_replaces:
+            address = address.replace(old, new)
+        return address
+
+
+GRAMMAR = AddressGrammar()
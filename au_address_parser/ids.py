@@ -0,0 +1,83 @@
+"""Property ID schemes: functions from a standardised address to a join key.
+
+Every scheme hashes the UTF-8 bytes of :attr:`ParsedAddress.std_address`,
+so two addresses get the same ID under any scheme exactly when they have
+the same ``prop_id``.
+
+``'md5_hex'``
+    32 hex digits, the :attr:`~ParsedAddress.prop_id` every release has
+    produced.  Stable across platforms, processes and releases for as long
+    as an address standardises to the same ``std_address``.
+
+``'md5'``
+    The same MD5 as the raw 16-byte digest, without the hex string; the
+    digest :class:`PropIndex` stores.  Same stability as ``'md5_hex'``.
+
+``'xxh3_64'``
+    XXH3 64-bit hash with seed 0, as an ``int``.  Not cryptographic but
+    several times cheaper.  Stable across platforms, processes and releases
+    (XXH3 output is frozen since xxHash 0.8).  With 64 bits, 15 million
+    properties collide with probability about 1 in 160,000; use it for
+    in-memory dedup, not as a key persisted across large datasets.
+
+``'xxh3_128'``
+    XXH3 128-bit hash with seed 0, as 16 raw bytes.  Same stability as
+    ``'xxh3_64'`` with collisions as unlikely as MD5's.
+
+The ``xxh3`` schemes need xxhash, installed with
+``pip install au_address_parser[fast]``.
+"""
+from hashlib import md5
+
+ID_SCHEMES = ('md5_hex', 'md5', 'xxh3_64', 'xxh3_128')
+
+
+def _md5_hex(data):
+    return md5(data).hexdigest()
+
+
+def _md5(data):
+    return md5(data).digest()
+
+
+def id_function(scheme):
+    """Return the function taking ``std_address`` UTF-8 bytes to an ID
+    under ``scheme``, one of :data:`ID_SCHEMES`.
+
+    :raises ValueError: for an unknown scheme.
+    :raises ImportError: for an ``xxh3`` scheme without xxhash installed.
+    """
+    if scheme == 'md5_hex':
+        return _md5_hex
+    if scheme == 'md5':
+        return _md5
+    if scheme not in ID_SCHEMES:
+        raise ValueError(f'scheme must be one of {list(ID_SCHEMES)}, not {scheme!r}')
+    try:
+        import xxhash
+    except ImportError:
+        raise ImportError(f'the {scheme} ID scheme needs xxhash, '
+                          f'install au_address_parser[fast]') from None
+    return xxhash.xxh3_64_intdigest if scheme == 'xxh3_64' else xxhash.xxh3_128_digest
+
+
+def prop_ids(addresses, scheme='md5_hex'):
+    """Return the IDs of many addresses under one scheme.
+
+    The hash function is looked up once for the whole batch, so this costs
+    little more than formatting each ``std_address``.
+
+    :param addresses: iterable of :class:`ParsedAddress` or
+                      :class:`AbAddressUtility` results, or of
+                      ``std_address`` strings.
+    :param scheme: one of :data:`ID_SCHEMES`.
+    :returns: list of IDs, in order.
+
+    >>> from au_address_parser import parse_many, prop_ids
+    >>> parsed = parse_many(['U2 42-44 Example St, STANMORE, NSW 2048'], compact=True)
+    >>> prop_ids(parsed, 'xxh3_64')
+    [11334234064938275909]
+
+    """
+    func = id_function(scheme)
+    return [func((a if isinstance(a, str) else a.std_address).encode()) for a in addresses]
@@ -0,0 +1,241 @@
+"""Incremental standardisation of feeds that are delivered again and again.
+
+A state file keeps, for every row of the last delivery, the digest of its
+key, the fingerprint of its address text and its standardised address (or
+failure reason)::
+
+    header   magic, row count, version size, version
+    rows     sorted by key digest, each
+             key digest (16 bytes), fingerprint (8 bytes), parsed flag,
+             key size, value size, UTF-8 key, UTF-8 value
+
+Numbers are big-endian.  A new delivery is sorted by key digest in runs
+spilled to disk, like :func:`build_prop_index` does, and merged with the
+state file, so memory use is bounded by the run size, not the size of the
+feed.  Only rows whose text changed, or every row if the parser, the
+grammar, the engine or ``max_length`` changed since the state was
+written, are parsed again.
+"""
+import heapq
+import os
+import struct
+import tempfile
+from collections import namedtuple
+from hashlib import blake2b, md5
+
+from .addr_parser import ENGINES, PARSER_VERSION, AbAddressUtility
+from .grammar import GRAMMAR
+from .reasons import REASON_TOO_LONG
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+
+Change = namedtuple('Change', ['op', 'key', 'std_address', 'prop_id', 'reason'])
+Change.__doc__ = """A row inserted, updated or deleted since the last delivery, with
+its standardised address and ``prop_id``, or the ``reason`` it can't be
+parsed.  A deleted row carries its last values."""
+
+_MAGIC = b'AUINCR01'
+_HEADER = struct.Struct('>8sQI')
+_ROW = struct.Struct('>16s8sBII')
+# Run entries: key digest, input position, fingerprint, key size, address size
+_RUN = struct.Struct('>16sQ8sII')
+
+
+def state_version(engine='regex', max_length=None):
+    """Return the version stored with a state file written with ``engine``
+    and ``max_length``; rows of a state file with another version are all
+    parsed again."""
+    return f'{PARSER_VERSION}.{GRAMMAR.version}.{engine}.{max_length}'
+
+
+def _fingerprint(text):
+    return blake2b(text.encode(), digest_size=8).digest()
+
+
+def _key_digest(key):
+    return blake2b(str(key).encode(), digest_size=16).digest()
+
+
+def restandardise(rows, state_path, *, engine='regex', max_length=None, run_size=1000000):
+    """Standardise a new delivery of a feed, yielding only what changed
+    since the delivery ``state_path`` was written for.
+
+    Changes come in the order of their key digests, not of the rows.  When
+    the last one has been read, ``state_path`` is replaced with the state
+    of this delivery; stopping early leaves it as it was.  A row whose text
+    changed but whose standardised address didn't isn't an update.
+
+    :param rows: iterable of ``(key, address)`` pairs, ``key`` identifying
+                 the row between deliveries.  When a key repeats, its first
+                 row is kept.  An address that isn't a string counts as
+                 empty.
+    :param state_path: state file, created if it doesn't exist.
+    :param engine: parse engine, see :func:`parse_many`.
+    :param max_length: longest address parsed, see :func:`parse_many`.
+    :param run_size: rows sorted in memory at a time.
+    :returns: iterator of :class:`Change`.
+
+    >>> from au_address_parser import restandardise
+    >>> rows = [('P1', '22 Example ST, STANMORE NSW 2048')]
+    >>> list(restandardise(rows, 'feed.state'))
+    [Change(op='insert', key='P1', std_address='22 EXAMPLE ST, STANMORE NSW 2048', prop_id='...', reason=None)]
+    >>> list(restandardise(rows, 'feed.state'))
+    []
+
+    """
+    if engine not in ENGINES:
+        raise ValueError(f'engine must be one of {sorted(ENGINES)}, not {engine!r}')
+    if run_size < 1:
+        raise ValueError(f'run_size must be at least 1, not {run_size}')
+    return _restandardise(rows, state_path, engine, max_length, run_size)
+
+
+def _standardise(address, engine, max_length):
+    """Return ``(parsed, value)``: ``(True, std_address)``, or ``(False,
+    reason)`` if the address can't be parsed."""
+    if max_length is not None and len(address) > max_length:
+        return False, REASON_TOO_LONG
+    parsed, reason = AbAddressUtility._parse(GRAMMAR.clean(address.upper()), engine)
+    if parsed is None:
+        return False, reason
+    return True, parsed.std_address
+
+
+def _change(op, key, parsed, value):
+    if parsed:
+        return Change(op, key, value, md5(value.encode()).hexdigest(), None)
+    return Change(op, key, None, None, value)
+
+
+def _restandardise(rows, state_path, engine, max_length, run_size):
+    directory = os.path.dirname(os.path.abspath(state_path))
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        runs, last_run = _sorted_runs(rows, tmp, run_size)
+        run_files = [open(run, 'rb') for run in runs]
+        old_file = open(state_path, 'rb') if os.path.exists(state_path) else None
+        new_path = os.path.join(tmp, 'state')
+        try:
+            old_version, old_rows = _read_state(old_file)
+            version = state_version(engine, max_length)
+            reparse_all = old_version != version
+            new = _unique(heapq.merge(*[_read_run(f) for f in run_files], last_run))
+            with open(new_path, 'wb') as out:
+                out.write(_HEADER.pack(_MAGIC, 0, 0))
+                version = version.encode()
+                out.write(version)
+                count = 0
+                for old, row in _join(old_rows, new):
+                    if row is None:
+                        digest, _, parsed, key, value = old
+                        yield _change(DELETE, key, parsed, value)
+                        continue
+                    digest, fingerprint, key, address = row
+                    if old is not None and not reparse_all and old[1] == fingerprint:
+                        parsed, value = old[2], old[4]
+                    else:
+                        parsed, value = _standardise(address, engine, max_length)
+                        if old is None:
+                            yield _change(INSERT, key, parsed, value)
+                        elif (old[2], old[4]) != (parsed, value):
+                            yield _change(UPDATE, key, parsed, value)
+                    key_data, value_data = key.encode(), value.encode()
+                    out.write(_ROW.pack(digest, fingerprint, parsed, len(key_data), len(value_data))
+                              + key_data + value_data)
+                    count += 1
+                out.seek(0)
+                out.write(_HEADER.pack(_MAGIC, count, len(version)))
+        finally:
+            for f in run_files:
+                f.close()
+            if old_file is not None:
+                old_file.close()
+        os.replace(new_path, state_path)
+
+
+def _sorted_runs(rows, tmp, run_size):
+    """Sort ``rows`` into runs of entries by key digest.
+
+    :returns: ``(paths, last)``, the files full runs were spilled to and
+              the entries of the last run, kept in memory.
+    """
+    runs, entries = [], []
+    for position, (key, address) in enumerate(rows):
+        key = str(key)
+        text = address if isinstance(address, str) else ''
+        entries.append((_key_digest(key), position, _fingerprint(text), key, text))
+        if len(entries) >= run_size:
+            runs.append(_spill(tmp, len(runs), entries))
+            entries = []
+    entries.sort()
+    return runs, entries
+
+
+def _spill(tmp, number, entries):
+    entries.sort()
+    run = os.path.join(tmp, f'run{number}')
+    with open(run, 'wb') as f:
+        for digest, position, fingerprint, key, text in entries:
+            key_data, text_data = key.encode(), text.encode()
+            f.write(_RUN.pack(digest, position, fingerprint, len(key_data), len(text_data))
+                    + key_data + text_data)
+    return run
+
+
+def _read_run(f):
+    read, unpack, size = f.read, _RUN.unpack, _RUN.size
+    while True:
+        entry = read(size)
+        if not entry:
+            return
+        digest, position, fingerprint, key_size, text_size = unpack(entry)
+        yield digest, position, fingerprint, read(key_size).decode(), read(text_size).decode()
+
+
+def _unique(entries):
+    """Drop all but the first row of each key digest; yield ``(digest,
+    fingerprint, key, address)``."""
+    last = None
+    for digest, _, fingerprint, key, text in entries:
+        if digest != last:
+            yield digest, fingerprint, key, text
+            last = digest
+
+
+def _read_state(f):
+    """Return the version of a state file and an iterator of its rows,
+    ``(digest, fingerprint, parsed, key, value)``, or ``(None, ())`` for
+    no file."""
+    if f is None:
+        return None, ()
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size or header[:8] != _MAGIC:
+        raise ValueError(f'{f.name} is not a state file')
+    _, count, version_size = _HEADER.unpack(header)
+    version = f.read(version_size).decode()
+
+    def rows():
+        read, unpack, size = f.read, _ROW.unpack, _ROW.size
+        for _ in range(count):
+            digest, fingerprint, parsed, key_size, value_size = unpack(read(size))
+            yield digest, fingerprint, bool(parsed), read(key_size).decode(), read(value_size).decode()
+
+    return version, rows()
+
+
+def _join(old_rows, new_rows):
+    """Merge two iterators sorted by digest into ``(old, new)`` pairs, with
+    ``None`` for the side a digest is missing from."""
+    old_rows, new_rows = iter(old_rows), iter(new_rows)
+    old, new = next(old_rows, None), next(new_rows, None)
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield old, None
+            old = next(old_rows, None)
+        elif old is None or new[0] < old[0]:
+            yield None, new
+            new = next(new_rows, None)
+        else:
+            yield old, new
+            old, new = next(old_rows, None), next(new_rows, None)
@@ -0,0 +1,229 @@
+"""On-disk ``prop_id`` index, read through ``mmap``.
+
+The file holds the 16-byte digests of the keys in sorted order, the offset
+of each key's record, and the records themselves::
+
+    header   magic, count, offsets start, records start
+    digests  count x 16 bytes, sorted
+    offsets  count x 8 bytes into the records
+    records  4-byte length, then UTF-8 text, per record
+
+Numbers are big-endian, so ``digest + offset`` entries sort as bytes.
+
+Opening it maps the file without reading it, so startup takes the same
+time for ten properties or tens of millions, and a lookup is a binary search
+over the digests that decodes only the record it finds.
+"""
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+from .addr_parser import AbAddressUtility
+from .grammar import GRAMMAR
+
+_MAGIC = b'AUPROPX1'
+_HEADER = struct.Struct('>8sQQQ')
+_OFFSET = struct.Struct('>Q')
+_LENGTH = struct.Struct('>I')
+_DIGEST_SIZE = 16
+_ENTRY_SIZE = _DIGEST_SIZE + _OFFSET.size
+
+
+def _digest(key):
+    """Return the 16-byte digest of a ``prop_id`` hex string or digest."""
+    if isinstance(key, str):
+        key = bytes.fromhex(key)
+    if len(key) != _DIGEST_SIZE:
+        raise ValueError(f'prop_id must be 16 bytes or 32 hex digits, not {key!r}')
+    return bytes(key)
+
+
+def _read_entries(f):
+    while True:
+        entry = f.read(_ENTRY_SIZE)
+        if not entry:
+            return
+        yield entry
+
+
+def build_prop_index(path, records, *, run_size=1000000):
+    """Write a ``prop_id`` index of ``records`` to ``path``.
+
+    Keys are sorted in runs of ``run_size`` spilled to temporary files and
+    merged, so building takes memory for one run whatever the number of
+    records.  When a key repeats, its first record is kept.
+
+    :param path: file to write, replaced if it exists.
+    :param records: iterable of ``(prop_id, record)`` pairs, ``prop_id``
+                    being a hex string or 16-byte digest and ``record`` a
+                    string, such as a property key or a JSON document.
+    :param run_size: keys sorted in memory at a time.
+    :returns: number of keys in the index.
+
+    >>> from au_address_parser import build_prop_index, parse_many
+    >>> parsed = parse_many(master_addresses, compact=True, on_error='skip')
+    >>> build_prop_index('properties.idx', ((p.prop_id, p.std_address) for p in parsed))
+    2
+
+    """
+    if run_size < 1:
+        raise ValueError(f'run_size must be at least 1, not {run_size}')
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        # Records go to disk in input order; sorted runs of
+        # ``digest + offset`` entries are spilled next to them
+        runs = []
+        with open(os.path.join(tmp, 'records'), 'wb') as records_file:
+            offset, entries = 0, []
+            for key, record in records:
+                data = record.encode()
+                entries.append(_digest(key) + _OFFSET.pack(offset))
+                records_file.write(_LENGTH.pack(len(data)))
+                records_file.write(data)
+                offset += _LENGTH.size + len(data)
+                if len(entries) >= run_size:
+                    runs.append(_spill(tmp, len(runs), entries))
+                    entries = []
+            if entries or not runs:
+                runs.append(_spill(tmp, len(runs), entries))
+
+        run_files = [open(run, 'rb') for run in runs]
+        try:
+            count = _write_index(path, tmp, heapq.merge(*(_read_entries(f) for f in run_files)))
+        finally:
+            for f in run_files:
+                f.close()
+    return count
+
+
+def _spill(tmp, number, entries):
+    # Entries sort by digest, then by offset, so the first record of a
+    # repeated key comes first
+    entries.sort()
+    run = os.path.join(tmp, f'run{number}')
+    with open(run, 'wb') as f:
+        f.write(b''.join(entries))
+    return run
+
+
+def _write_index(path, tmp, entries):
+    count, last = 0, None
+    offsets_path = os.path.join(tmp, 'offsets')
+    with open(path, 'wb') as out:
+        out.write(_HEADER.pack(_MAGIC, 0, 0, 0))
+        with open(offsets_path, 'wb') as offsets:
+            for entry in entries:
+                digest = entry[:_DIGEST_SIZE]
+                if digest == last:
+                    continue
+                out.write(digest)
+                offsets.write(entry[_DIGEST_SIZE:])
+                count, last = count + 1, digest
+
+        offsets_start = _HEADER.size + count * _DIGEST_SIZE
+        records_start = offsets_start + count * _OFFSET.size
+        for name in (offsets_path, os.path.join(tmp, 'records')):
+            with open(name, 'rb') as f:
+                shutil.copyfileobj(f, out)
+        out.seek(0)
+        out.write(_HEADER.pack(_MAGIC, count, offsets_start, records_start))
+    return count
+
+
+class PropIndex(object):
+    """Read-only ``prop_id`` index written by :func:`build_prop_index`.
+
+    :param path: index file.
+    :raises ValueError: if the file isn't a ``prop_id`` index.
+
+    >>> from au_address_parser import PropIndex
+    >>> with PropIndex('properties.idx') as index:
+    ...     index.get('b8b3b969b70b290b44900e070fcf4b37')
+    ...     index.match('Unit 2 42 Example St, Stanmore NSW 2048')
+    '2/42 EXAMPLE ST, STANMORE NSW 2048'
+    '2/42 EXAMPLE ST, STANMORE NSW 2048'
+
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._offsets_start, self._records_start = \
+            _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC:
+            self._mm.close()
+            raise ValueError(f'{path} is not a prop_id index')
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, prop_id):
+        return self._find(_digest(prop_id)) is not None
+
+    def __getitem__(self, prop_id):
+        record = self.get(prop_id)
+        if record is None:
+            raise KeyError(prop_id)
+        return record
+
+    def get(self, prop_id, default=None):
+        """Return the record of a ``prop_id`` hex string or digest, or
+        ``default`` if it isn't in the index."""
+        i = self._find(_digest(prop_id))
+        if i is None:
+            return default
+        mm = self._mm
+        offset = self._records_start + _OFFSET.unpack_from(mm, self._offsets_start + i * _OFFSET.size)[0]
+        length, = _LENGTH.unpack_from(mm, offset)
+        start = offset + _LENGTH.size
+        return mm[start:start + length].decode()
+
+    def match(self, addr_string, default=None, engine='regex'):
+        """Return the record of the property at ``addr_string``, or
+        ``default`` if the address can't be parsed or isn't in the index."""
+        if not isinstance(addr_string, str):
+            return default
+        parsed, _ = AbAddressUtility._parse(GRAMMAR.clean(addr_string.upper()), engine)
+        if parsed is None:
+            return default
+        return self.get(parsed.prop_id, default)
+
+    def _find(self, digest):
+        """Return the position of ``digest`` in the sorted digests, or
+        ``None``."""
+        mm, count = self._mm, self._count
+        lo, hi = 0, count
+        if count > 64:
+            # Digests are uniformly spread, so the leading bytes give the
+            # position to within a few standard deviations of sqrt(count)
+            guess = (int.from_bytes(digest[:8], 'big') * count) >> 64
+            spread = 4 * int(count ** 0.5) + 16
+            lo, hi = max(guess - spread, 0), min(guess + spread, count)
+            if lo and mm[_HEADER.size + lo * _DIGEST_SIZE:_HEADER.size + (lo + 1) * _DIGEST_SIZE] > digest:
+                lo = 0
+            if hi < count and mm[_HEADER.size + hi * _DIGEST_SIZE:_HEADER.size + (hi + 1) * _DIGEST_SIZE] <= digest:
+                hi = count
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = _HEADER.size + mid * _DIGEST_SIZE
+            found = mm[start:start + _DIGEST_SIZE]
+            if found < digest:
+                lo = mid + 1
+            elif found > digest:
+                hi = mid
+            else:
+                return mid
+        return None
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,309 @@
+"""Fuzzy matching of addresses against a reference set through blocking keys.
+
+Every reference goes into one block keyed by its postcode, the phonetic key
+of its street name and its first street number, so a query is scored only
+against the handful of references in its own blocks.  A locality n-gram
+index finds the postcodes of localities spelled like the query's, so a
+wrong postcode or a misspelt locality still reaches the right block.  Only
+when those blocks hold no match, because a typo changed the phonetic key,
+are the larger blocks of every street with the same postcode and number
+scored.
+
+Near-duplicates such as ``STANMOR`` for ``STANMORE``, ``EXMAPLE`` for
+``EXAMPLE`` or a missing unit number score just below an exact match.
+References whose first street number differs are never candidates.
+"""
+import math
+import sys
+from collections import namedtuple
+
+from .addr_parser import AbAddressUtility, ParsedAddress
+from .grammar import GRAMMAR
+
+Match = namedtuple('Match', ['key', 'score', 'parsed'])
+Match.__doc__ = """A reference matched by :meth:`AddressMatcher.match`, with the
+``key`` it was added under and its ``score`` from 0 to 1."""
+
+#: Weight of each component in a match score, summing to 1
+WEIGHTS = {
+    'street_name': 0.3,
+    'locality': 0.15,
+    'post': 0.1,
+    'state': 0.05,
+    'flat': 0.15,
+    'number': 0.1,
+    'street_type': 0.1,
+    'street_suffix': 0.05,
+}
+
+# Soundex digits of each letter; vowels, H, W and Y give none
+_SOUNDEX = {letter: digit for letters, digit in (
+    ('BFPV', '1'), ('CGJKQSXZ', '2'), ('DT', '3'), ('L', '4'), ('MN', '5'), ('R', '6'))
+    for letter in letters}
+
+
+def street_key(street_name):
+    """Return the phonetic key of a street name: the Soundex code of its
+    letters, or the name itself when it holds digits.
+
+    >>> street_key('EXAMPLE'), street_key('EXMAPLE'), street_key('EXAMPLES')
+    ('E251', 'E251', 'E251')
+
+    """
+    if not street_name:
+        return ''
+    letters = [c for c in street_name if c.isalpha()]
+    if not letters or any(c.isdigit() for c in street_name):
+        return street_name
+    code, last = [letters[0]], _SOUNDEX.get(letters[0])
+    for letter in letters[1:]:
+        digit = _SOUNDEX.get(letter)
+        if digit is not None and digit != last:
+            code.append(digit)
+            if len(code) == 4:
+                break
+        if letter not in 'HW':
+            last = digit
+    return ''.join(code).ljust(4, '0')
+
+
+def _block_add(blocks, block, ref):
+    refs = blocks.get(block)
+    if refs is None:
+        blocks[block] = ref
+    elif isinstance(refs, int):
+        blocks[block] = [refs, ref]
+    else:
+        refs.append(ref)
+
+
+def _grams(text):
+    padded = f' {text} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _dice(grams, other_grams):
+    if not grams or not other_grams:
+        return 0.0
+    return 2 * len(grams & other_grams) / (len(grams) + len(other_grams))
+
+
+class AddressMatcher(object):
+    """Index of reference addresses for ranked fuzzy matching.
+
+    :param locality_threshold: least n-gram similarity, from 0 to 1, of
+                               another locality whose postcodes a query
+                               also searches.
+
+    >>> from au_address_parser import AddressMatcher
+    >>> matcher = AddressMatcher()
+    >>> matcher.add('P1', '2/42 Example St, STANMORE NSW 2048')
+    True
+    >>> matcher.add('P2', '44 Example St, STANMORE NSW 2048')
+    True
+    >>> [(m.key, m.score) for m in matcher.match('42 Example St, Stanmor NSW 2049')]
+    [('P1', 0.795)]
+
+    """
+
+    def __init__(self, *, locality_threshold=0.5):
+        self.locality_threshold = locality_threshold
+        self._keys = []
+        self._references = []
+        # ``post street_key number`` and ``post number`` to a reference id,
+        # or a list of them when several share the block
+        self._blocks = {}
+        self._number_blocks = {}
+        self._locality_posts = {}
+        self._locality_grams = {}
+        self._grams = {}
+        self._localities = []
+        # Each indexed locality to those spelled like it, itself included
+        self._similar = {}
+        # Other query localities to ``[similar, localities checked]``
+        self._unindexed = {}
+
+    def __len__(self):
+        return len(self._references)
+
+    @staticmethod
+    def _parsed(address):
+        if isinstance(address, ParsedAddress):
+            return address
+        if isinstance(address, AbAddressUtility):
+            return address._parsed
+        if isinstance(address, str):
+            return AbAddressUtility._parse(GRAMMAR.clean(address.upper()))[0]
+        return None
+
+    def _text_grams(self, text):
+        grams = self._grams.get(text)
+        if grams is None:
+            grams = self._grams[text] = _grams(text)
+        return grams
+
+    def add(self, key, address):
+        """Add a reference under ``key``, any value to return on a match.
+
+        :param address: address string, :class:`ParsedAddress` or
+                        :class:`AbAddressUtility`.
+        :returns: ``False`` if the address can't be parsed, else ``True``.
+        """
+        parsed = self._parsed(address)
+        if parsed is None:
+            return False
+        # Interning shares the strings of references on the same streets
+        parsed = ParsedAddress._make(None if v is None else sys.intern(v) for v in parsed)
+        ref = len(self._references)
+        self._keys.append(key)
+        self._references.append(parsed)
+
+        _block_add(self._blocks, f'{parsed.post} {street_key(parsed.street_name)} {parsed.number_first}', ref)
+        _block_add(self._number_blocks, f'{parsed.post} {parsed.number_first}', ref)
+
+        locality = parsed.locality
+        posts = self._locality_posts.get(locality)
+        if posts is None:
+            posts = self._locality_posts[locality] = set()
+            grams = self._text_grams(locality)
+            similar = self._search(grams)
+            for other in similar:
+                self._similar[other].append(locality)
+            self._similar[locality] = similar + [locality]
+            self._localities.append(locality)
+            for gram in grams:
+                self._locality_grams.setdefault(gram, []).append(locality)
+        posts.add(parsed.post)
+        self._text_grams(parsed.street_name)
+        return True
+
+    def add_many(self, references):
+        """Add ``(key, address)`` pairs; return how many could be parsed."""
+        return sum(self.add(key, address) for key, address in references)
+
+    def _similar_localities(self, locality):
+        """Return the indexed localities spelled like ``locality``."""
+        similar = self._similar.get(locality)
+        if similar is not None:
+            return similar
+        # A locality that isn't indexed, such as a misspelt one; its cached
+        # result only needs checking against the localities added since
+        grams = _grams(locality)
+        cached = self._unindexed.get(locality)
+        if cached is None:
+            if len(self._unindexed) >= 10000:
+                self._unindexed.clear()
+            cached = self._unindexed[locality] = [self._search(grams), len(self._localities)]
+        elif cached[1] < len(self._localities):
+            threshold = self.locality_threshold
+            for other in self._localities[cached[1]:]:
+                other_grams = self._grams[other]
+                if 2 * len(grams & other_grams) / (len(grams) + len(other_grams)) >= threshold:
+                    cached[0] = cached[0] + [other]
+            cached[1] = len(self._localities)
+        return cached[0]
+
+    def _search(self, grams):
+        """Return the indexed localities whose n-grams are within the
+        threshold of ``grams``.
+
+        A locality that similar shares at least ``need`` n-grams, so at
+        least one of the rarest ``len(grams) - need + 1``; only their lists
+        are read, skipping the long ones of n-grams like ``' ST'``.
+        """
+        threshold, index = self.locality_threshold, self._locality_grams
+        size = len(grams)
+        need = max(1, math.ceil(threshold * size / (2 - threshold) - 1e-9))
+        rarest = sorted(grams, key=lambda gram: len(index.get(gram, ())))[:max(size - need + 1, 0)]
+        candidates = set()
+        for gram in rarest:
+            candidates.update(index.get(gram, ()))
+        return [other for other in candidates
+                if 2 * len(grams & self._grams[other]) / (size + len(self._grams[other])) >= threshold]
+
+    def candidates(self, parsed, any_street=False):
+        """Return the ids of the references in the blocks of a
+        :class:`ParsedAddress`.
+
+        :param any_street: use the blocks of every street with the same
+                           postcodes and number instead.
+        """
+        posts = {parsed.post}
+        if parsed.locality:
+            for locality in self._similar_localities(parsed.locality):
+                posts.update(self._locality_posts[locality])
+        if any_street:
+            blocks, key = self._number_blocks, f' {parsed.number_first}'
+        else:
+            blocks, key = self._blocks, f' {street_key(parsed.street_name)} {parsed.number_first}'
+        found = []
+        for post in posts:
+            refs = blocks.get(f'{post}{key}')
+            if refs is None:
+                continue
+            if isinstance(refs, int):
+                found.append(refs)
+            else:
+                found.extend(refs)
+        return found
+
+    def score(self, parsed, reference):
+        """Return the similarity, from 0 to 1, of two :class:`ParsedAddress`
+        results, weighting components by :data:`WEIGHTS`."""
+        w = WEIGHTS
+        score = 0.0
+        if parsed.street_name == reference.street_name:
+            score += w['street_name']
+        else:
+            score += w['street_name'] * _dice(_grams(parsed.street_name or ''),
+                                              self._text_grams(reference.street_name))
+        if parsed.locality == reference.locality:
+            score += w['locality']
+        elif parsed.locality:
+            score += w['locality'] * _dice(_grams(parsed.locality),
+                                           self._text_grams(reference.locality))
+        score += w['post'] * (parsed.post == reference.post)
+        score += w['state'] * (parsed.state == reference.state)
+
+        if parsed._flat == reference._flat:
+            score += w['flat']
+        elif not parsed.flat_number or not reference.flat_number:
+            # A unit number missing on one side is a likely near-duplicate
+            score += w['flat'] / 2
+        score += w['number'] * (parsed._number_first == reference._number_first)
+        for field in ('street_type', 'street_suffix'):
+            mine, theirs = getattr(parsed, field), getattr(reference, field)
+            if mine == theirs:
+                score += w[field]
+            elif mine is None or theirs is None:
+                score += w[field] / 2
+        return score
+
+    def match(self, address, *, limit=5, min_score=0.6):
+        """Return the references most like ``address``, best first.
+
+        :param address: address string, :class:`ParsedAddress` or
+                        :class:`AbAddressUtility`.
+        :param limit: most matches returned.
+        :param min_score: least score of a match.
+        :returns: list of :class:`Match`, scores rounded to 4 places, empty
+                  if the address can't be parsed or nothing scores
+                  ``min_score``.
+        """
+        parsed = self._parsed(address)
+        if parsed is None:
+            return []
+        matches = self._matches(parsed, self.candidates(parsed), min_score)
+        if not matches:
+            matches = self._matches(parsed, self.candidates(parsed, any_street=True), min_score)
+        matches.sort(key=lambda m: -m.score)
+        return matches[:limit]
+
+    def _matches(self, parsed, candidates, min_score):
+        matches = []
+        for ref in candidates:
+            reference = self._references[ref]
+            score = self.score(parsed, reference)
+            if score >= min_score:
+                matches.append(Match(self._keys[ref], round(score, 4), reference))
+        return matches
@@ -0,0 +1,102 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .addr_parser import ENGINES, AbAddressUtility, ParseFailure, parse_many
+from .grammar import GRAMMAR
+from .ids import id_function
+
+
+def _warm_worker():
+    """Import the grammar and run one parse before the worker's first chunk."""
+    AbAddressUtility._parse(GRAMMAR.clean('1 EXAMPLE ST, STANMORE NSW 2048'))
+
+
+def _standardise_chunk(addresses, engine='regex', max_length=None, id_scheme='md5_hex'):
+    address_id = id_function(id_scheme)
+    results = []
+    for addr in parse_many(addresses, compact=True, engine=engine, max_length=max_length):
+        if isinstance(addr, ParseFailure):
+            results.append((None, None))
+        else:
+            std_address = addr.std_address
+            results.append((std_address, address_id(std_address.encode())))
+    return results
+
+
+def _parse_chunk(addresses, engine='regex', max_length=None):
+    return list(parse_many(addresses, compact=True, engine=engine, max_length=max_length))
+
+
+def _chunks(addresses, chunksize):
+    it = iter(addresses)
+    while True:
+        chunk = list(islice(it, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def standardise_many(addresses, workers=None, chunksize=2000, engine='regex', max_length=None,
+                     id_scheme='md5_hex'):
+    """Standardise many addresses across a pool of worker processes.
+
+    Results are yielded lazily and in input order.  At most two chunks per
+    worker are in flight, so memory stays bounded for any input size.
+
+    :param addresses: iterable of address strings.
+    :param workers: number of worker processes, defaults to
+                    ``os.cpu_count()``.  ``1`` parses in the calling process.
+    :param chunksize: number of addresses sent to a worker at a time.
+    :param engine: parse engine, see :func:`parse_many`.
+    :param max_length: longest address parsed, see :func:`parse_many`.
+    :param id_scheme: ID yielded with each address, one of
+                      :data:`~au_address_parser.ids.ID_SCHEMES`.  The
+                      default ``'md5_hex'`` is the ``prop_id``.
+    :returns: iterator of ``(std_address, prop_id)`` tuples, ``(None, None)``
+              for addresses that can't be parsed.
+
+    >>> from au_address_parser import standardise_many
+    >>> list(standardise_many(['22 Example ST, STANMORE, NSW 2048'], workers=1))
+    [('22 EXAMPLE ST, STANMORE NSW 2048', 'e5fee06eb1c63f682f3b8b83e4f3c19c')]
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f'workers must be at least 1, not {workers}')
+    if chunksize < 1:
+        raise ValueError(f'chunksize must be at least 1, not {chunksize}')
+    if engine not in ENGINES:
+        raise ValueError(f'engine must be one of {sorted(ENGINES)}, not {engine!r}')
+    id_function(id_scheme)
+    return _standardise_many(addresses, workers, chunksize, engine, max_length, id_scheme)
+
+
+def _standardise_many(addresses, workers, chunksize, engine, max_length, id_scheme):
+    for results in _map_chunks(_standardise_chunk, _chunks(addresses, chunksize), workers,
+                               engine, max_length, id_scheme):
+        yield from results
+
+
+def _map_chunks(func, chunks, workers, *args):
+    """Yield ``func(chunk, *args)`` for every chunk, in order.
+
+    With more than one worker the calls run in a process pool, with at most
+    two chunks per worker in flight, so ``chunks`` is consumed lazily and
+    memory stays bounded.  ``func`` must be a module-level function.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
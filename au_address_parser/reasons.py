@@ -0,0 +1,12 @@
+"""Codes for why an address couldn't be parsed, shared by every engine."""
+
+REASON_NOT_A_STRING = 'not_a_string'
+REASON_FORMAT = 'format'
+REASON_NO_STREET_NUMBER = 'no_street_number'
+REASON_NO_STREET_NAME = 'no_street_name'
+REASON_NO_LOCALITY = 'no_locality'
+REASON_NO_STATE = 'no_state'
+REASON_NO_POSTCODE = 'no_postcode'
+REASON_TOO_LONG = 'too_long'
+REASON_UNKNOWN_LOCALITY = 'unknown_locality'
+REASON_LOCALITY_MISMATCH = 'locality_mismatch'
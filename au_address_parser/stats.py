@@ -0,0 +1,197 @@
+"""Opt-in counters and stage timings of every parse.
+
+While statistics are off, a parse checks one module attribute and goes on.
+While they are on, each address is parsed by its engine with a trace, which
+the grammar and engine fill in with the branch each stage took:
+
+``split.*``
+    how the address was split: ``one_comma``, ``two_commas`` (state and
+    postcode after the second), ``property_name`` (a name before the first
+    comma), ``no_comma`` or ``bad_commas``.
+``street.*``
+    which street pattern matched: ``marker`` (``UNIT 2 42``), ``slash``
+    (``2/42``) or ``number``; ``read`` or ``scan`` with the token engine.
+``locality.*``
+    which locality pattern matched: ``state_post``, ``state``, ``post`` or
+    ``name``; ``scan`` with the token engine.
+``street_name.*``
+    what followed the name: ``type``, ``suffix``, ``type_suffix`` or
+    ``none``.
+
+Results served from the parse cache aren't parsed, so aren't counted.
+"""
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from threading import Lock
+
+
+#: Stages timed by :class:`ParseStats`
+STAGES = ('split', 'street', 'locality', 'street_name', 'total')
+
+#: Upper bounds, in seconds, of the buckets of the stage timing histograms;
+#: a last bucket holds anything slower
+BUCKETS = (1e-6, 2e-6, 5e-6, 1e-5, 2e-5, 5e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+
+ParseTrace = namedtuple('ParseTrace', ['address', 'engine', 'branches', 'reason', 'timings'])
+ParseTrace.__doc__ = """One parse as passed to the ``callback`` of :class:`ParseStats`:
+the cleaned ``address``, the ``branches`` it took, the failure ``reason`` or
+``None``, and the seconds of each stage, or ``None`` without timings."""
+
+
+class ParseStats(object):
+    """Thread-safe counters of the branches and failures of parses, with
+    optional stage timing histograms.
+
+    :param timings: also time each stage of :data:`STAGES`.
+    :param callback: called with a :class:`ParseTrace` after every parse,
+                     to sample or log the slow or failing shapes.
+    """
+
+    def __init__(self, *, timings=False, callback=None):
+        self.timings = timings
+        self.callback = callback
+        self._lock = Lock()
+        self.clear()
+
+    def clear(self):
+        """Reset every counter and histogram."""
+        with self._lock:
+            self._parses = 0
+            self._branches = {}
+            self._reasons = {}
+            self._seconds = dict.fromkeys(STAGES, 0.0)
+            self._histograms = {stage: [0] * (len(BUCKETS) + 1) for stage in STAGES}
+
+    def count_failure(self, reason):
+        """Count an address failed before it was parsed, such as one too
+        long."""
+        with self._lock:
+            self._reasons[reason] = self._reasons.get(reason, 0) + 1
+
+    def _record(self, address, engine, branches, reason, timings):
+        with self._lock:
+            self._parses += 1
+            counts = self._branches
+            for branch in branches:
+                counts[branch] = counts.get(branch, 0) + 1
+            if reason is not None:
+                self._reasons[reason] = self._reasons.get(reason, 0) + 1
+            if timings is not None:
+                for stage, seconds in timings.items():
+                    self._seconds[stage] += seconds
+                    self._histograms[stage][bisect_left(BUCKETS, seconds)] += 1
+        if self.callback is not None:
+            self.callback(ParseTrace(address, engine, tuple(branches), reason, timings))
+
+    def as_dict(self):
+        """Return the counters as a dict of plain values.
+
+        ``timings`` maps each stage to its ``count``, ``seconds`` in total
+        and ``histogram``, the counts of stages taking at most each of
+        :data:`BUCKETS` seconds (keyed ``'<=1e-06'`` and so on) or more
+        (``'>0.1'``).  It is empty without timings.
+        """
+        with self._lock:
+            result = {
+                'parses': self._parses,
+                'failures': sum(self._reasons.values()),
+                'branches': dict(sorted(self._branches.items())),
+                'reasons': dict(sorted(self._reasons.items())),
+                'timings': {},
+            }
+            if self.timings:
+                labels = [f'<={bound:g}' for bound in BUCKETS] + [f'>{BUCKETS[-1]:g}']
+                for stage in STAGES:
+                    histogram = self._histograms[stage]
+                    result['timings'][stage] = {
+                        'count': sum(histogram),
+                        'seconds': self._seconds[stage],
+                        'histogram': dict(zip(labels, histogram)),
+                    }
+        return result
+
+
+class _Trace(object):
+    """Branches and stage timings of one parse, filled in by the engine
+    as it goes."""
+
+    __slots__ = ('branches', 'timings', '_last')
+
+    def __init__(self, timings):
+        self.branches = []
+        self.timings = {} if timings else None
+        self._last = time.perf_counter() if timings else None
+
+    def stage(self, name):
+        """Time the stage ``name`` as ending now."""
+        if self.timings is not None:
+            now = time.perf_counter()
+            self.timings[name] = now - self._last
+            self._last = now
+
+
+def _street_name_branch(parts):
+    if parts['street_type']:
+        return 'street_name.type_suffix' if parts['street_suffix'] else 'street_name.type'
+    return 'street_name.suffix' if parts['street_suffix'] else 'street_name.none'
+
+
+def parse_traced(address, engine, parse_address, stats):
+    """Parse a cleaned, upper-cased address with the ``engine`` function
+    ``parse_address``, recording its branches, failure and timings in
+    ``stats``.
+
+    :returns: ``(parts, None)`` or ``(None, reason)``, as the engine does.
+    """
+    trace = _Trace(stats.timings)
+    start = trace._last
+    parts, reason = parse_address(address, trace)
+    if parts is not None:
+        trace.branches.append(_street_name_branch(parts))
+    if trace.timings is not None:
+        trace.timings['total'] = time.perf_counter() - start
+    stats._record(address, engine, trace.branches, reason, trace.timings)
+    return parts, reason
+
+
+# The statistics every parse records into, ``None`` while they are off
+active = None
+
+
+def count_failure(reason):
+    """Count an address failed before it was parsed in the active
+    statistics, if any."""
+    stats = active
+    if stats is not None:
+        stats.count_failure(reason)
+
+
+def enable_parse_stats(*, timings=False, callback=None):
+    """Start recording statistics of every parse and return the new
+    :class:`ParseStats`.
+
+    >>> from au_address_parser import enable_parse_stats, parse_stats, standardise_address
+    >>> stats = enable_parse_stats(timings=True)
+    >>> standardise_address('22 Example ST, STANMORE NSW 2048')
+    '22 EXAMPLE ST, STANMORE NSW 2048'
+    >>> parse_stats()['branches']
+    {'locality.state_post': 1, 'split.one_comma': 1, 'street.number': 1, 'street_name.type': 1}
+
+    """
+    global active
+    active = ParseStats(timings=timings, callback=callback)
+    return active
+
+
+def disable_parse_stats():
+    """Stop recording statistics and drop them."""
+    global active
+    active = None
+
+
+def parse_stats():
+    """Return the active statistics as a dict, see
+    :meth:`ParseStats.as_dict`, or ``None`` if they are off."""
+    stats = active
+    return None if stats is None else stats.as_dict()
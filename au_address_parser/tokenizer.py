@@ -0,0 +1,344 @@
+"""Token engine, an alternative to the regex cascade in
+:meth:`AbAddressUtility._parse_address`.
+
+The street part is split into tokens once and the common shapes (``42 ...``,
+``42-44 ...``, ``2/42 ...``, ``UNIT 2 42 ...``, ``U2 42 ...``) are read with
+string methods.  The locality part is scanned right to left for the state and
+postcode, so its cost is linear in the length of the address, unlike the
+nested quantifiers of the locality patterns.
+
+For every address it returns exactly the parts the regex engine would.
+Street parts of any other shape (several numbers, hyphen lists such as
+``12-14-16``, odd punctuation) go through :func:`_scan_street`, which finds
+the match the street patterns would in linear time, as the patterns
+themselves backtrack exponentially on hyphenated junk.
+"""
+from string import ascii_uppercase
+
+from .grammar import GRAMMAR
+from .reasons import (REASON_FORMAT, REASON_NO_LOCALITY, REASON_NO_POSTCODE, REASON_NO_STATE,
+                      REASON_NO_STREET_NAME, REASON_NO_STREET_NUMBER)
+
+_LETTERS = ascii_uppercase
+_LOCALITY_CHARS = frozenset(ascii_uppercase + '-')
+_MARKER_STARTS = frozenset(marker[0] for marker in GRAMMAR.flat_markers)
+
+
+def _split_number(token):
+    """Split ``[A-Z]*\\d+[A-Z]*`` into ``(prefix, digits, suffix)``, or
+    return ``None`` if the token doesn't have that shape."""
+    rest = token.lstrip(_LETTERS)
+    digits = rest.rstrip(_LETTERS)
+    if not digits.isdecimal():
+        return None
+    return token[:len(token) - len(rest)], digits, rest[len(digits):]
+
+
+def _split_range(token):
+    """Split a street number such as ``42``, ``42A`` or ``A42-44B`` into the
+    six ``number_*`` parts, or return ``None``."""
+    first, sep, last = token.partition('-')
+    first = _split_number(first)
+    if first is None:
+        return None
+    if not sep:
+        return first + ('', '', '')
+    last = _split_number(last)
+    if last is None:
+        return None
+    return first + last
+
+
+def _has_digit(token):
+    for c in token:
+        if c.isdecimal():
+            return True
+    return False
+
+
+def _numbers(flat, number):
+    return {
+        'flat_number_prefix': flat[0],
+        'flat_number': flat[1],
+        'flat_number_suffix': flat[2],
+        'number_first_prefix': number[0],
+        'number_first': number[1],
+        'number_first_suffix': number[2],
+        'number_last_prefix': number[3],
+        'number_last': number[4],
+        'number_last_suffix': number[5],
+    }
+
+
+def _read_street(street_part):
+    """Read the common street part shapes.
+
+    :returns: ``(parts, street_name_list)`` like
+              :meth:`AddressGrammar.match_street`, or ``None`` if the shape
+              isn't one the token engine models.
+    """
+    tokens = street_part.split(' ')
+    if '' in tokens or len(tokens) != len(street_part.split()):
+        return None
+    numbered = [k for k, token in enumerate(tokens) if _has_digit(token)]
+
+    if len(numbered) == 1:
+        # Only one token has digits, so no flat marker pattern can match
+        k = numbered[0]
+        if k + 1 == len(tokens):
+            return None
+        flat_part, slash, number_part = tokens[k].partition('/')
+        if slash:
+            flat = _split_number(flat_part)
+            number = _split_range(number_part)
+            if flat is None or number is None:
+                return None
+            return _numbers(flat, number), tokens[k + 1:]
+        number = _split_range(tokens[k])
+        if number is None:
+            return None
+        return _numbers(('', '', ''), number), tokens[k + 1:]
+
+    if len(numbered) == 2 and numbered[0] < 2:
+        # UNIT 2 42 ... or U2 42 ...
+        first = tokens[0]
+        for marker in GRAMMAR.flat_markers:
+            if not first.startswith(marker):
+                continue
+            rest = first[len(marker):]
+            if rest:
+                flat, start = _split_number(rest), 1
+            else:
+                flat, start = _split_number(tokens[1]), 2
+            if flat is None or start != numbered[1] or start + 1 == len(tokens):
+                return None
+            number = _split_range(tokens[start])
+            if number is None:
+                return None
+            return _numbers(flat, number), tokens[start + 1:]
+    return None
+
+
+def _is_word(c):
+    # What \w and \b in the patterns count as a word character
+    return c.isalnum() or c == '_'
+
+
+def _number_suffixes(text):
+    """Return ``(lo, hi)`` such that ``text[q:]`` matches
+    ``[A-Z]*\\d+[A-Z]*`` exactly when ``lo <= q < hi``."""
+    i = len(text) - 1
+    while i >= 0 and text[i] in _LETTERS:
+        i -= 1
+    if i < 0 or not text[i].isdecimal():
+        return 0, 0
+    hi = i + 1
+    while i >= 0 and text[i].isdecimal():
+        i -= 1
+    while i >= 0 and text[i] in _LETTERS:
+        i -= 1
+    return i + 1, hi
+
+
+def _is_simple_number(text):
+    lo, hi = _number_suffixes(text)
+    return lo == 0 and hi > 0
+
+
+def _is_range_tail(segment):
+    """Whether ``segment`` matches ``[A-Z]*\\d*[A-Z]*``."""
+    rest = segment.lstrip(_LETTERS).rstrip(_LETTERS)
+    return not rest or rest.isdecimal()
+
+
+def _number_start(text):
+    """Return the smallest ``q`` such that ``text[q:]`` is a street number
+    ending in a word character, or ``-1``."""
+    best = -1
+    end = len(text)
+    while True:
+        dash = text.rfind('-', 0, end)
+        segment = text[dash + 1:end]
+        if end == len(text) and not segment:
+            return -1
+        lo, hi = _number_suffixes(segment)
+        if lo < hi:
+            best = dash + 1 + lo
+        if dash < 0 or not _is_range_tail(segment):
+            return best
+        end = dash
+
+
+def _is_number(text):
+    """Whether all of ``text`` is a street number ending in a word
+    character, the number group of the street patterns."""
+    first, sep, rest = text.partition('-')
+    if not _is_simple_number(first):
+        return False
+    if not sep:
+        return True
+    return rest[-1:] != '-' and rest != '' and all(
+        _is_range_tail(segment) for segment in rest.split('-'))
+
+
+def _scan_street(street_part):
+    """Find the flat number, street number and street name the way
+    :meth:`AddressGrammar.match_street` does, with every street pattern
+    checked in one linear pass over the whitespace-separated chunks.
+
+    :returns: ``(parts, street_name_list)``, or ``None``.
+    """
+    chunks = []
+    start = None
+    for i, c in enumerate(street_part):
+        if c.isspace():
+            if start is not None:
+                chunks.append((start, i))
+                start = None
+        elif start is None:
+            start = i
+    if start is not None:
+        chunks.append((start, len(street_part)))
+    texts = [street_part[start:end] for start, end in chunks]
+    followed = [end < len(street_part) for _, end in chunks]
+    n = len(chunks)
+
+    def found(flat_number, number, ci):
+        parts = GRAMMAR.street_numbers(flat_number, number)
+        return parts, street_part[chunks[ci][1]:].split()
+
+    # Flat marker, flat number, number: UNIT 2 42 ..., ABCU2 42 ...
+    suffixes = [_number_suffixes(text) for text in texts]
+    numbers = [followed[ci] and _is_number(text) for ci, text in enumerate(texts)]
+    for ci, text in enumerate(texts):
+        for q, c in enumerate(text):
+            if c not in _MARKER_STARTS:
+                continue
+            for marker in GRAMMAR.flat_markers:
+                if not text.startswith(marker, q):
+                    continue
+                fi, fq = (ci, q + len(marker)) if q + len(marker) < len(text) else (ci + 1, 0)
+                ni = fi + 1
+                if ni < n and suffixes[fi][0] <= fq < suffixes[fi][1] and numbers[ni]:
+                    return found(texts[fi][fq:], texts[ni], ni)
+
+    # Flat number slash number: 2/42 ...
+    for ci, text in enumerate(texts):
+        slash = text.rfind('/')
+        if slash < 0 or not followed[ci]:
+            continue
+        p = slash
+        while p > 0 and _is_word(text[p - 1]):
+            p -= 1
+        flat_number = text[p:slash]
+        if _is_simple_number(flat_number) and _is_number(text[slash + 1:]):
+            return found(flat_number, text[slash + 1:], ci)
+
+    # Number: 42 ..., the leftmost place a number can start
+    for ci, text in enumerate(texts):
+        if followed[ci]:
+            q = _number_start(text)
+            if q >= 0:
+                return found(None, text[q:], ci)
+    return None
+
+
+def _state_post(text, j):
+    """Return ``(state, post)`` if ``text[j:]`` starts with a state, spaces
+    and a digit, else ``(state, None)`` or ``(None, None)``."""
+    for state in GRAMMAR.states:
+        if text.startswith(state, j):
+            break
+    else:
+        return None, None
+    k = j + len(state)
+    m = k
+    while m < len(text) and text[m].isspace():
+        m += 1
+    if m == k or m == len(text) or not text[m].isdecimal():
+        return state, None
+    end = m
+    while end < len(text) and end - m < 4 and text[end].isdecimal():
+        end += 1
+    if end < len(text) and _is_word(text[end]):
+        # Not a postcode of at most four digits
+        return state, None
+    return state, text[m:end]
+
+
+def _scan_locality(locality_part):
+    """Find the locality, state and postcode the way the locality patterns
+    do, in one pass.
+
+    :returns: ``(parts, None)``, or ``(None, reason)``.
+    """
+    if not locality_part or locality_part[0] not in _LETTERS:
+        return None, REASON_NO_LOCALITY
+
+    # The locality can only span letters, hyphens and spaces
+    n = 1
+    for c in locality_part[1:]:
+        if c in _LOCALITY_CHARS or c.isspace():
+            n += 1
+        else:
+            break
+
+    # The patterns prefer the longest locality, which ends at the last space
+    # of a run before the state
+    no_post = False
+    i = n - 1
+    while i > 0:
+        if not locality_part[i].isspace():
+            i -= 1
+            continue
+        state, post = _state_post(locality_part, i + 1)
+        if post is not None:
+            return {'locality': locality_part[:i], 'state': state, 'post': post}, None
+        if state is not None:
+            no_post = True
+        while i > 0 and locality_part[i].isspace():
+            i -= 1
+    return None, REASON_NO_POSTCODE if no_post else REASON_NO_STATE
+
+
+def parse_tokens(address, trace=None):
+    """Split a cleaned, upper-cased address into parts with the token engine.
+
+    :param address: cleaned, upper-cased address string.
+    :param trace: records the branches and timings of the stages, as for
+                  :meth:`AbAddressUtility._parse_address`.
+    :returns: ``(parts, None)`` like
+              :meth:`AbAddressUtility._parse_address`, or ``(None, reason)``.
+    """
+    parts = GRAMMAR.split_parts(address, branches=None if trace is None else trace.branches)
+    if trace is not None:
+        trace.stage('split')
+    if parts is None:
+        return None, REASON_FORMAT
+    street_part, locality_part = parts
+
+    street = _read_street(street_part)
+    if trace is not None:
+        trace.branches.append('street.read' if street is not None else 'street.scan')
+    if street is None:
+        street = _scan_street(street_part)
+    if trace is not None:
+        trace.stage('street')
+    if street is None:
+        return None, REASON_NO_STREET_NUMBER
+    locality, reason = _scan_locality(locality_part)
+    if trace is not None:
+        trace.branches.append('locality.scan')
+        trace.stage('locality')
+    if locality is None:
+        return None, reason
+
+    parsed_addr, street_name_list = street
+    street_name_dict = GRAMMAR.split_street_name(street_name_list) if street_name_list else None
+    if trace is not None:
+        trace.stage('street_name')
+    if street_name_dict is None:
+        return None, REASON_NO_STREET_NAME
+    parsed_addr.update(street_name_dict)
+    parsed_addr.update(locality)
+    return parsed_addr, None
@@ -0,0 +1,120 @@
+"""Load test of a stand-in HTTP standardisation service.
+
+A minimal asyncio HTTP server answers ``GET /?address=...`` in a separate
+process, either calling :func:`standardise_address` in the handler
+(``blocking``) or awaiting an :class:`AsyncStandardiser` on threads
+(``async``) or on a process pool (``async-process``).  Keep-alive clients
+send requests at rising concurrency and the p50/p99 latency is reported.
+
+    python benchmarks/bench_async.py --concurrency 1 16 64 256 --requests 4000
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote, unquote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import AsyncStandardiser, standardise_address  # noqa: E402
+from corpus import generate  # noqa: E402
+
+MODES = ('blocking', 'async', 'async-process')
+
+
+async def serve(mode):
+    if mode == 'blocking':
+        async def standardise(address):
+            return standardise_address(address)
+    else:
+        executor = ProcessPoolExecutor(2) if mode == 'async-process' else None
+        standardise = AsyncStandardiser(executor=executor).standardise
+
+    async def handle(reader, writer):
+        while True:
+            request = await reader.readline()
+            if not request:
+                break
+            while (await reader.readline()).strip():
+                pass
+            address = unquote(request.split()[1].decode().partition('address=')[2])
+            body = ((await standardise(address)) or '').encode()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    print(server.sockets[0].getsockname()[1], flush=True)
+    await asyncio.Event().wait()
+
+
+async def client(port, addresses, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for address in addresses:
+        start = time.perf_counter()
+        writer.write(f'GET /?address={quote(address)} HTTP/1.1\r\nHost: bench\r\n\r\n'.encode())
+        await reader.readline()
+        length = 0
+        while True:
+            header = await reader.readline()
+            if not header.strip():
+                break
+            if header.lower().startswith(b'content-length:'):
+                length = int(header.split(b':')[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load(port, addresses, concurrency):
+    latencies = []
+    per_client = len(addresses) // concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, addresses[i * per_client:(i + 1) * per_client], latencies)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)],
+            len(latencies) / elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 16, 64, 256])
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    if args.serve:
+        loop.run_until_complete(serve(args.serve))
+        return
+
+    pool = generate(args.requests // 2, args.seed)
+    rnd = random.Random(args.seed)
+    addresses = [rnd.choice(pool) for _ in range(args.requests)]
+
+    print(f"{'mode':<14} {'clients':>7} {'p50':>9} {'p99':>9} {'req/s':>8}")
+    for mode in args.modes:
+        server = subprocess.Popen([sys.executable, __file__, '--serve', mode],
+                                  stdout=subprocess.PIPE, universal_newlines=True)
+        try:
+            port = int(server.stdout.readline())
+            loop.run_until_complete(load(port, addresses[:200], 4))  # warm up
+            for concurrency in args.concurrency:
+                p50, p99, rate = loop.run_until_complete(load(port, addresses, concurrency))
+                print(f'{mode:<14} {concurrency:>7} {p50 * 1e3:>7.2f}ms {p99 * 1e3:>7.2f}ms {rate:>8,.0f}')
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
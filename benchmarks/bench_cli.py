@@ -0,0 +1,60 @@
+"""Throughput and peak memory of ``au-addr standardise`` on growing CSV files.
+
+Each size runs in a fresh process, so its peak RSS (``VmHWM``, Linux only)
+shows whether memory grows with the input.
+
+    python benchmarks/bench_cli.py --sizes 10000 100000 1000000 --workers 2
+"""
+import argparse
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import generate  # noqa: E402
+
+_RUN = '''
+import sys
+from au_address_parser.cli import main
+main(sys.argv[1:])
+with open('/proc/self/status') as f:
+    print(next(line for line in f if line.startswith('VmHWM')).split()[1], file=sys.stderr)
+'''
+
+
+def run(path, workers, tmp):
+    summary = os.path.join(tmp, 'summary.json')
+    proc = subprocess.run(
+        [sys.executable, '-c', _RUN, 'standardise', path, '-o', os.devnull,
+         '--workers', str(workers), '--summary', summary],
+        cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    with open(summary) as f:
+        return json.load(f), int(proc.stderr.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 400000])
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'rows/s':>10} {'peak RSS':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'in.csv')
+        for size in args.sizes:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['id', 'address'])
+                writer.writerows(enumerate(generate(size, args.seed)))
+            summary, rss = run(path, args.workers, tmp)
+            print(f"{size:>10,} {summary['rows_per_second']:>10,} {rss / 1024:>8.0f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Series.map(standardise_address) against parse_column on a column that
+repeats its addresses, as real address columns do.
+
+    python benchmarks/bench_columns.py --size 1000000 --unique 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from au_address_parser import parse_column, standardise_address  # noqa: E402
+from corpus import repeated  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--unique', type=int, default=100000,
+                        help='distinct addresses in the column')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    column = pd.Series(repeated(args.size, args.unique, args.seed))
+    print(f'{args.size} rows, {column.nunique()} distinct')
+
+    start = time.perf_counter()
+    column.map(standardise_address)
+    elapsed = time.perf_counter() - start
+    print(f'map(standardise_address): {elapsed:.2f}s, {args.size / elapsed:,.0f} rows/s')
+
+    for categorical in (True, False):
+        start = time.perf_counter()
+        frame = parse_column(column, categorical=categorical)
+        elapsed = time.perf_counter() - start
+        memory = frame.memory_usage(deep=True).sum() / args.size
+        print(f'parse_column(categorical={categorical}): {elapsed:.2f}s, '
+              f'{args.size / elapsed:,.0f} rows/s, {memory:.0f} B/row')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Regex engine against the token engine: throughput on a synthetic corpus
+and latency on street and locality strings that make the regex engine
+backtrack.
+
+    python benchmarks/bench_engines.py --size 200000
+    python benchmarks/bench_engines.py --max-seconds 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import parse_many  # noqa: E402
+from au_address_parser.addr_parser import ENGINES  # noqa: E402
+from au_address_parser.grammar import GRAMMAR  # noqa: E402
+from corpus import generate  # noqa: E402
+
+# Growing prefixes of these are parsed, the ``{}`` filled in with the prefix
+ADVERSARIAL = (
+    ('1 KING ST, {}', 'CUL-DE-SAC SHOP WEST SHOP LOT STANMORE CUL-DE-SAC'),
+    ('1 KING ST, {}', 'ABCDEFGHIJKLMNOPQRSTUVWXYZABCDEFGHIJKLMNOPQRSTUVWXYZ'),
+    ('1 KING ST, {}', 'AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB-AB'),
+    ('1-{}-. KING ST, STANMORE NSW 2048', 'AAAAAAAAAAAA-AAAAAAAAAAAA-AAAAAAAAAAAA-AAAAAAAAAAAA-AAAAAAAAAAAA-AAAAAAAAAAAA'),
+)
+
+
+def throughput(addresses, engine):
+    start = time.perf_counter()
+    for _ in parse_many(addresses, compact=True, engine=engine):
+        pass
+    return len(addresses) / (time.perf_counter() - start)
+
+
+def latency(engine, address):
+    address = GRAMMAR.clean(address)
+    start = time.perf_counter()
+    ENGINES[engine](address)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-seconds', type=float, default=1.0,
+                        help='stop growing an adversarial locality once a parse takes this long')
+    args = parser.parse_args()
+
+    addresses = list(generate(args.size, args.seed))
+    for engine in ENGINES:
+        print(f'{engine}: {args.size} addresses at {throughput(addresses, engine):,.0f} parses/s')
+
+    for template, text in ADVERSARIAL:
+        print('\n' + template.format(text))
+        print(f"{'chars':>5} {'regex':>10} {'token':>10}")
+        for end in range(10, len(text) + 1, 4):
+            address = template.format(text[:end].rstrip())
+            regex, token = latency('regex', address), latency('token', address)
+            print(f'{end:>5} {regex:>9.4f}s {token:>9.6f}s')
+            if regex > args.max_seconds:
+                break
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Build size, load time, memory and per-address cost of a
+:class:`Gazetteer` the size of G-NAF's (about 16,000 localities).
+
+    python benchmarks/bench_gazetteer.py --localities 16000 --addresses 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import AbAddressUtility, Gazetteer, build_gazetteer  # noqa: E402
+from au_address_parser.grammar import GRAMMAR  # noqa: E402
+from corpus import generate, places  # noqa: E402
+
+
+def per_call(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--localities', type=int, default=16000)
+    parser.add_argument('--addresses', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    pairs = places(args.localities, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gazetteer.bin')
+        start = time.perf_counter()
+        localities = build_gazetteer(path, pairs)
+        build = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        gazetteer = Gazetteer(path)
+        tracemalloc.start()
+        info = gazetteer.info()
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    print(f"localities {localities:,}, pairs {info['pairs']:,}, file {size / 1024:,.0f} KiB, "
+          f"built in {build * 1e3:.0f}ms")
+    print(f"load {info['load_seconds'] * 1e3:.1f}ms, memory {info['memory_bytes'] / 1024:,.0f} KiB "
+          f"(tracemalloc {traced / 1024:,.0f} KiB)")
+
+    addresses = generate(args.addresses, args.seed)
+    cleaned = [GRAMMAR.clean(a.upper()) for a in addresses]
+    parsed = [p for p, _ in map(AbAddressUtility._parse, cleaned) if p is not None]
+    print(f"{'operation':<22} {'ns/address':>10}")
+    for name, func, items in (
+            ('validate', gazetteer.validate, parsed),
+            ('complete (no state)', lambda p: gazetteer.complete(p.locality, post=p.post), parsed),
+            ('parse', AbAddressUtility._parse, cleaned),
+            ('gazetteer.parse', gazetteer.parse, addresses)):
+        print(f'{name:<22} {per_call(func, items) * 1e9:>10,.0f}')
+
+
+if __name__ == '__main__':
+    main()
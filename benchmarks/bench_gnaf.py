@@ -0,0 +1,54 @@
+"""Rows per second building addresses from G-NAF fields: formatting and
+re-parsing a string (``from_gnaf_dict``), building them directly
+(``from_gnaf_fields``), and streaming a PSV file (``read_gnaf_psv``).
+
+    python benchmarks/bench_gnaf.py --size 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import AbAddressUtility, read_gnaf_psv  # noqa: E402
+from corpus import GNAF_HEADER, gnaf_rows  # noqa: E402
+
+
+def timed(name, size, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<18} {elapsed:>6.2f}s {size / elapsed:>10,.0f} rows/s')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = gnaf_rows(args.size, args.seed)
+    header = [name.lower() for name in GNAF_HEADER]
+    dicts = [dict(zip(header, row)) for row in rows]
+
+    by_string = timed('from_gnaf_dict', args.size, lambda: [
+        AbAddressUtility.from_gnaf_dict(**d).std_address for d in dicts])
+    direct = timed('from_gnaf_fields', args.size, lambda: [
+        AbAddressUtility.from_gnaf_fields(**d).std_address for d in dicts])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ADDRESS_VIEW.psv')
+        with open(path, 'w') as f:
+            f.write('|'.join(GNAF_HEADER) + '\n')
+            f.writelines('|'.join(row) + '\n' for row in rows)
+        streamed = timed('read_gnaf_psv', args.size, lambda: [
+            parsed.std_address for _, parsed in read_gnaf_psv(path)])
+
+    print('identical std_address:', by_string == direct == streamed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Cost of each ID scheme over parsed addresses: one ``address_id`` call
+per address, a batch :func:`prop_ids`, and deduplicating with a set of IDs.
+
+    python benchmarks/bench_ids.py --size 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import ID_SCHEMES, parse_many, prop_ids  # noqa: E402
+from corpus import generate  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    parsed = list(parse_many(generate(args.size, args.seed), compact=True, on_error='skip'))
+    std_addresses = [p.std_address for p in parsed]
+    n = len(parsed)
+
+    start = time.perf_counter()
+    [p.std_address for p in parsed]
+    print(f'std_address alone: {(time.perf_counter() - start) / n * 1e9:.0f} ns/address')
+    print(f"{'scheme':<10} {'address_id':>11} {'prop_ids':>9} {'from std':>9} {'set':>9} {'B/ID':>6}")
+    for scheme in ID_SCHEMES:
+        try:
+            parsed[0].address_id(scheme)
+        except ImportError as e:
+            print(f'{scheme:<10} skipped: {e}')
+            continue
+        start = time.perf_counter()
+        for p in parsed:
+            p.address_id(scheme)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ids = prop_ids(parsed, scheme)
+        batch = time.perf_counter() - start
+
+        start = time.perf_counter()
+        prop_ids(std_addresses, scheme)
+        from_std = time.perf_counter() - start
+
+        start = time.perf_counter()
+        unique = set(ids)
+        dedup = time.perf_counter() - start
+        size = sys.getsizeof(ids[0])
+        print(f'{scheme:<10} {single / n * 1e9:>8.0f} ns {batch / n * 1e9:>6.0f} ns '
+              f'{from_std / n * 1e9:>6.0f} ns {dedup / n * 1e9:>6.0f} ns {size:>6}'
+              f'   ({len(unique):,} unique)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Full against incremental standardisation of a re-delivered feed.
+
+A feed of ``--size`` rows is delivered twice; between deliveries
+``--changed`` of the rows get a new address, as many are reformatted
+without changing the address, and as many are added and removed.  The
+second delivery is standardised in full with ``au-addr standardise`` and
+incrementally with ``au-addr changes``, each in a fresh process so its
+peak RSS (``VmHWM``, Linux only) is its own.
+
+    python benchmarks/bench_incremental.py --size 1000000 --changed 0.01
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import generate  # noqa: E402
+
+_RUN = '''
+import sys
+from au_address_parser.cli import main
+main(sys.argv[1:])
+with open('/proc/self/status') as f:
+    print(next(line for line in f if line.startswith('VmHWM')).split()[1], file=sys.stderr)
+'''
+
+
+def run(args, tmp):
+    summary = os.path.join(tmp, 'summary.json')
+    proc = subprocess.run([sys.executable, '-c', _RUN] + args + ['--summary', summary],
+                          cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    with open(summary) as f:
+        return json.load(f), int(proc.stderr.split()[-1]) * 1024
+
+
+def deliveries(size, changed, seed):
+    """Return the rows of two deliveries of a feed."""
+    rnd = random.Random(seed)
+    addresses = generate(size + int(size * changed) * 2, seed)
+    first = [(f'P{i}', address) for i, address in enumerate(addresses[:size])]
+    second = list(first)
+    extra = iter(addresses[size:])
+    for i in rnd.sample(range(size), int(size * changed) * 2):
+        key, address = second[i]
+        second[i] = (key, next(extra)) if i % 2 else (key, address.lower())
+    removed = set(rnd.sample(range(size), int(size * changed)))
+    second = [row for i, row in enumerate(second) if i not in removed]
+    second += [(f'N{i}', address) for i, address in enumerate(extra)]
+    return first, second
+
+
+def write(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'address'])
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--changed', type=float, default=0.01,
+                        help='share of rows given a new address, also reformatted, added and removed')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    first, second = deliveries(args.size, args.changed, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ('first.csv', 'second.csv')]
+        write(paths[0], first)
+        write(paths[1], second)
+        state = os.path.join(tmp, 'feed.state')
+        changes = ['changes', '--state', state, '--key-column', 'id', '-o', os.devnull]
+
+        print(f"{'run':<28} {'seconds':>8} {'rows/s':>10} {'peak RSS':>10}  changes")
+        results = (
+            ('full (standardise)', run(['standardise', paths[1], '-o', os.devnull], tmp)),
+            ('first delivery (changes)', run(changes + [paths[0]], tmp)),
+            ('incremental (changes)', run(changes + [paths[1]], tmp)),
+        )
+        for name, (summary, peak) in results:
+            seconds = summary['seconds']
+            counts = ' '.join(f'{op}={summary[op]:,}' for op in ('inserts', 'updates', 'deletes') if op in summary)
+            print(f'{name:<28} {seconds:>8.2f} {len(second) / seconds:>10,.0f} '
+                  f'{peak / 2 ** 20:>8.0f}MB  {counts}')
+        print(f'state file: {os.path.getsize(state) / len(second):.0f} bytes/row')
+
+
+if __name__ == '__main__':
+    main()
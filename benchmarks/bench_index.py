@@ -0,0 +1,74 @@
+"""Startup and lookup latency of a :class:`PropIndex` against loading the
+same properties into a dict of hex ``prop_id`` strings.
+
+    python benchmarks/bench_index.py --size 1000000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from hashlib import md5
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import PropIndex, build_prop_index  # noqa: E402
+
+
+def percentiles(timings):
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+def lookups(get, keys):
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        get(key)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    records = ((md5(str(i).encode()).hexdigest(), f'PROPERTY-{i:09d}') for i in range(args.size))
+    rnd = random.Random(args.seed)
+    hits = [md5(str(rnd.randrange(args.size)).encode()).hexdigest() for _ in range(args.lookups)]
+    misses = [md5(str(args.size + i).encode()).hexdigest() for i in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, csv_path = os.path.join(tmp, 'props.idx'), os.path.join(tmp, 'props.csv')
+        start = time.perf_counter()
+        build_prop_index(path, records)
+        print(f'build {args.size:,} keys: {time.perf_counter() - start:.2f}s, '
+              f'{os.path.getsize(path) / args.size:.0f} B/key on disk')
+
+        with open(csv_path, 'w', newline='') as f:
+            csv.writer(f).writerows(
+                (md5(str(i).encode()).hexdigest(), f'PROPERTY-{i:09d}') for i in range(args.size))
+
+        start = time.perf_counter()
+        with open(csv_path, newline='') as f:
+            table = dict(csv.reader(f))
+        print(f'dict startup:      {(time.perf_counter() - start) * 1e3:>10.1f}ms')
+        start = time.perf_counter()
+        index = PropIndex(path)
+        print(f'PropIndex startup: {(time.perf_counter() - start) * 1e3:>10.3f}ms')
+
+        print(f"{'':<18} {'hit p50':>8} {'hit p99':>8} {'miss p50':>9} {'miss p99':>9}")
+        for name, get in (('dict', table.get), ('PropIndex', index.get)):
+            hit, miss = lookups(get, hits), lookups(get, misses)
+            print(f'{name:<18} {hit[0] * 1e6:>6.2f}us {hit[1] * 1e6:>6.2f}us '
+                  f'{miss[0] * 1e6:>7.2f}us {miss[1] * 1e6:>7.2f}us')
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Worst-case parse latency on pathological input, per family of
+:data:`corpus.PATHOLOGICAL` and per engine.
+
+The token engine runs on addresses up to ``--length`` characters.  The regex
+engine backtracks exponentially on them, so its inputs grow from 32
+characters until one parse takes ``--max-seconds``.
+
+    python benchmarks/bench_latency.py
+    python benchmarks/bench_latency.py --length 1000 --count 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import MAX_LENGTH, parse_many  # noqa: E402
+from corpus import PATHOLOGICAL, pathological  # noqa: E402
+
+
+def latencies(addresses, engine, max_length=None):
+    timings = []
+    for address in addresses:
+        start = time.perf_counter()
+        for _ in parse_many([address], compact=True, engine=engine, max_length=max_length):
+            pass
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--length', type=int, default=MAX_LENGTH)
+    parser.add_argument('--count', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-seconds', type=float, default=1.0)
+    args = parser.parse_args()
+
+    by_family = {}
+    for family, address in pathological(args.count, args.length, args.seed):
+        by_family.setdefault(family, []).append(address)
+
+    print(f"{'family':<18} {'token p50':>10} {'token p99':>10} {'token max':>10}   regex")
+    for family in sorted(by_family):
+        timings = latencies(by_family[family], 'token', args.length)
+        p50, p99 = timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+        length, regex = 32, 0.0
+        rnd = random.Random(args.seed)
+        while regex < args.max_seconds and length < args.length:
+            length += 1
+            regex = max(latencies([PATHOLOGICAL[family](rnd, length) for _ in range(3)], 'regex'))
+        print(f'{family:<18} {p50 * 1e6:>8.0f}us {p99 * 1e6:>8.0f}us {timings[-1] * 1e6:>8.0f}us'
+              f'   {regex:.3f}s at {length} chars')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Build size, memory and per-query latency and recall of
+:class:`AddressMatcher` on synthetic references and near-duplicate queries.
+
+Each query is a reference written with one defect: a dropped unit number,
+a misspelt locality, a misspelt street name or a wrong postcode.  Latency
+percentiles are wall-clock, plus the p99 of process CPU time, which leaves
+out time the process was descheduled or throttled.
+
+    python benchmarks/bench_matching.py --size 1000000 --queries 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import AbAddressUtility, AddressMatcher  # noqa: E402
+from corpus import references  # noqa: E402
+
+
+def rss():
+    with open('/proc/self/status') as f:
+        return int(next(line for line in f if line.startswith('VmRSS')).split()[1]) * 1024
+
+
+def _typo(rnd, word):
+    if len(word) < 4:
+        return word + 'E'
+    i = rnd.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:] if rnd.random() < 0.5 else word[:i] + word[i + 1:]
+
+
+DEFECTS = {
+    'no unit': lambda rnd, row: dict(row, flat_number=''),
+    'locality typo': lambda rnd, row: dict(row, locality_name=_typo(rnd, row['locality_name'])),
+    'street typo': lambda rnd, row: dict(row, street_name=_typo(rnd, row['street_name'])),
+    'wrong postcode': lambda rnd, row: dict(row, postcode=str(int(row['postcode']) + 1).zfill(4)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = references(args.size, args.seed)
+    rnd = random.Random(args.seed)
+    picks = [rnd.randrange(args.size) for _ in range(args.queries)]
+
+    before = rss()
+    start = time.perf_counter()
+    matcher = AddressMatcher()
+    for i, row in enumerate(rows):
+        matcher.add(i, AbAddressUtility.from_gnaf_fields(**row)._parsed)
+    elapsed = time.perf_counter() - start
+    print(f'build {len(matcher):,} references: {elapsed:.1f}s, '
+          f'{(rss() - before) / len(matcher):.0f} B/reference')
+
+    print(f"{'defect':<15} {'p50':>8} {'p99':>8} {'p99 CPU':>10} {'top 1':>7} {'top 5':>7} {'candidates':>10}")
+    for name, defect in DEFECTS.items():
+        queries = [(i, AbAddressUtility.from_gnaf_fields(**defect(rnd, rows[i])).address)
+                   for i in picks]
+        timings, cpu_timings, top1, top5, candidates = [], [], 0, 0, 0
+        for i, query in queries:
+            start, cpu_start = time.perf_counter(), time.process_time()
+            matches = matcher.match(query)
+            timings.append(time.perf_counter() - start)
+            cpu_timings.append(time.process_time() - cpu_start)
+            keys = [m.key for m in matches]
+            if i in keys:
+                # Without a unit number, every unit of the building ties
+                top1 += matches[keys.index(i)].score == matches[0].score
+                top5 += 1
+            candidates += len(matcher.candidates(matcher._parsed(query)))
+        timings.sort()
+        cpu_timings.sort()
+        n = len(queries)
+        print(f'{name:<15} {timings[n // 2] * 1e6:>6.0f}us {timings[int(n * 0.99)] * 1e6:>6.0f}us '
+              f'{cpu_timings[int(n * 0.99)] * 1e6:>8.0f}us '
+              f'{top1 / n:>7.1%} {top5 / n:>7.1%} {candidates / n:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
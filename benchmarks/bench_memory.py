@@ -0,0 +1,38 @@
+"""Bytes per parsed address kept in memory, measured with tracemalloc.
+
+    python benchmarks/bench_memory.py --size 100000
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import parse_many  # noqa: E402
+from corpus import generate  # noqa: E402
+
+
+def measure(addresses, compact):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = list(parse_many(addresses, compact=compact))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    return (after - before) / len(addresses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    addresses = generate(args.size, args.seed)
+    for name, compact in (('AbAddressUtility', False), ('ParsedAddress', True)):
+        print(f'{name:<17} {measure(addresses, compact):>8,.0f} bytes/address')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Throughput of :func:`standardise_many` as the worker count grows.
+
+    python benchmarks/bench_parallel.py --size 1000000 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import standardise_many  # noqa: E402
+from corpus import generate  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunksize', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    addresses = generate(args.size, args.seed)
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        for _ in standardise_many(addresses, workers=workers, chunksize=args.chunksize):
+            pass
+        rate = args.size / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f'workers={workers:<3} {rate:>10,.0f} addresses/s  x{rate / baseline:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Parses per second on a synthetic corpus.
+
+    python benchmarks/bench_parse.py --size 1000000
+    python benchmarks/bench_parse.py --api parse_many
+    python benchmarks/bench_parse.py --access prop_id
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import (AbAddressUtility, enable_parse_cache, parse_cache_info,  # noqa: E402
+                               parse_many, standardise_address)
+from corpus import generate, repeated  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--api', choices=('class', 'parse_many', 'standardise'), default='class')
+    parser.add_argument('--access', choices=('none', 'prop_id', 'parsed_addr', 'all'), default='none',
+                        help='attributes read from each AbAddressUtility')
+    parser.add_argument('--cache', type=int, default=0, metavar='MAXSIZE',
+                        help='enable the parse cache with this many entries')
+    parser.add_argument('--unique', type=int, default=0,
+                        help='draw the corpus from this many distinct addresses')
+    args = parser.parse_args()
+
+    if args.unique:
+        addresses = repeated(args.size, args.unique, args.seed)
+    else:
+        addresses = generate(args.size, args.seed)
+    if args.cache:
+        enable_parse_cache(args.cache)
+    start = time.perf_counter()
+    if args.api == 'class':
+        for address in addresses:
+            address_cls = AbAddressUtility(address)
+            if args.access == 'prop_id':
+                address_cls.prop_id
+            elif args.access == 'parsed_addr':
+                address_cls.parsed_addr
+            elif args.access == 'all':
+                address_cls.parsed_addr, address_cls.address_abbr
+                address_cls.std_address, address_cls.address, address_cls.prop_id
+    elif args.api == 'parse_many':
+        for _ in parse_many(addresses):
+            pass
+    else:
+        for address in addresses:
+            standardise_address(address)
+    elapsed = time.perf_counter() - start
+    print(f'{args.api} ({args.access}): {args.size} addresses in {elapsed:.2f}s: {args.size / elapsed:,.0f} parses/s')
+    if args.cache:
+        print(parse_cache_info())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Accuracy and throughput of splitting addresses without commas.
+
+The synthetic corpus is parsed with its commas, then again with them
+removed.  A comma-less address counts as right when it standardises to the
+same address as with commas.  The word-count guess the parser used to make
+(street = first 3 tokens of a 6 or 7 token address) is compared with the
+token trie, alone and with the corpus localities added as a gazetteer
+would.
+
+    python benchmarks/bench_split.py --size 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import AbAddressUtility  # noqa: E402
+from au_address_parser.grammar import GRAMMAR  # noqa: E402
+from corpus import LOCALITIES, generate  # noqa: E402
+
+
+def word_count_split(tokens):
+    return 3 if len(tokens) in (6, 7) else None
+
+
+def trie_split(trie):
+    return lambda tokens: GRAMMAR.split_tokens(tokens, trie)
+
+
+def run(split, addresses, expected):
+    right = failed = 0
+    start = time.perf_counter()
+    for address, std in zip(addresses, expected):
+        tokens = address.split()
+        boundary = split(tokens)
+        parsed = None
+        if boundary is not None:
+            parsed, _ = AbAddressUtility._parse(
+                f"{' '.join(tokens[:boundary])}, {' '.join(tokens[boundary:])}")
+        if parsed is None:
+            failed += 1
+        elif parsed.std_address == std:
+            right += 1
+    elapsed = time.perf_counter() - start
+    return right / len(addresses), failed / len(addresses), len(addresses) / elapsed
+
+
+def split_rate(split, addresses):
+    token_lists = [address.split() for address in addresses]
+    start = time.perf_counter()
+    for tokens in token_lists:
+        split(tokens)
+    return (time.perf_counter() - start) / len(token_lists)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    addresses, expected = [], []
+    for address in generate(args.size, args.seed):
+        parsed, _ = AbAddressUtility._parse(GRAMMAR.clean(address.upper()))
+        if parsed is not None:
+            addresses.append(GRAMMAR.clean(address.upper().replace(',', ' ')))
+            expected.append(parsed.std_address)
+
+    splits = (
+        ('word count', word_count_split),
+        ('trie', trie_split(None)),
+        ('trie + localities', trie_split(GRAMMAR.token_trie(locality for locality, _, _ in LOCALITIES))),
+    )
+    print(f'{len(addresses):,} comma-less addresses')
+    print(f"{'split':<18} {'right':>7} {'failed':>7} {'split ns':>9} {'parses/s':>9}")
+    for name, split in splits:
+        right, failed, rate = run(split, addresses, expected)
+        ns = split_rate(split, addresses) * 1e9
+        print(f'{name:<18} {right:>7.2%} {failed:>7.2%} {ns:>9,.0f} {rate:>9,.0f}')
+
+
+if __name__ == '__main__':
+    main()
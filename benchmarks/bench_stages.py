@@ -0,0 +1,192 @@
+"""Per-stage timings, parses per second and memory per parse of the hot
+paths, on a seeded mix of standard, comma-less and malformed addresses.
+
+Each stage is timed on its own over the inputs it sees in a real parse,
+taking the best of ``--repeat`` runs.  ``--json`` writes the results for
+comparing with a later run through ``--compare``::
+
+    python benchmarks/bench_stages.py --size 100000 --json before.json
+    python benchmarks/bench_stages.py --size 100000 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from hashlib import md5
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import (AbAddressUtility, AddressParseError, ParsedAddress,  # noqa: E402
+                               disable_parse_cache, parse_many, standardise_address)
+from au_address_parser.addr_parser import ENGINES  # noqa: E402
+from au_address_parser.grammar import GRAMMAR  # noqa: E402
+from corpus import MIX, mixed  # noqa: E402
+
+
+def best_ns(func, items, repeat):
+    """Best time of ``func`` over ``items``, in nanoseconds per item."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e9
+
+
+def stage_inputs(addresses):
+    """Replay a parse, keeping what each stage is given."""
+    inputs = {name: [] for name in ('clean', 'split', 'street', 'locality', 'abbreviations',
+                                    'assemble', 'format')}
+    for address in addresses:
+        inputs['clean'].append(address)
+        cleaned = GRAMMAR.clean(address.upper())
+        inputs['split'].append(cleaned)
+        parts = GRAMMAR.split_parts(cleaned)
+        if parts is None:
+            continue
+        inputs['street'].append(parts[0])
+        street = GRAMMAR.match_street(parts[0])
+        if street is None:
+            continue
+        inputs['locality'].append(parts[1])
+        locality, _ = GRAMMAR.match_locality(parts[1])
+        if locality is None or not street[1]:
+            continue
+        inputs['abbreviations'].append(street[1])
+        street_name = GRAMMAR.split_street_name(street[1])
+        if street_name is None:
+            continue
+        assembled = dict(street[0], **street_name, **locality)
+        inputs['assemble'].append(assembled)
+        inputs['format'].append(ParsedAddress._from_parts(assembled))
+    return inputs
+
+
+def stages(addresses, repeat):
+    inputs = stage_inputs(addresses)
+    parsed = inputs['format']
+    funcs = {
+        'clean': lambda address: GRAMMAR.clean(address.upper()),
+        'split': GRAMMAR.split_parts,
+        'street': GRAMMAR.match_street,
+        'locality': GRAMMAR.match_locality,
+        'abbreviations': GRAMMAR.split_street_name,
+        'assemble': ParsedAddress._from_parts,
+        'format': lambda p: p.std_address,
+    }
+    result = {name: {'ns': round(best_ns(func, inputs[name], repeat)), 'calls': len(inputs[name])}
+              for name, func in funcs.items()}
+    standardised = [p.std_address.encode() for p in parsed]
+    result['hash'] = {'ns': round(best_ns(lambda s: md5(s).hexdigest(), standardised, repeat)),
+                      'calls': len(standardised)}
+    return result
+
+
+def _rate(func, addresses, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(addresses)
+        best = min(best, time.perf_counter() - start)
+    return round(len(addresses) / best)
+
+
+def throughput(rows, repeat):
+    """Parses per second of each API, then of ``standardise_address`` on
+    each kind of address and with each engine."""
+    addresses = [address for _, address in rows]
+    result = {
+        'standardise_address': _rate(lambda a: [standardise_address(x) for x in a], addresses, repeat),
+        'AbAddressUtility.prop_id': _rate(lambda a: [_prop_id(x) for x in a], addresses, repeat),
+        'parse_many': _rate(lambda a: list(parse_many(a, compact=True)), addresses, repeat),
+    }
+    for kind, _ in MIX:
+        result[f'kind.{kind}'] = _rate(lambda a: [standardise_address(x) for x in a],
+                                       [address for k, address in rows if k == kind], repeat)
+    for engine in sorted(ENGINES):
+        result[f'engine.{engine}'] = _rate(lambda a: [standardise_address(x, engine) for x in a],
+                                           addresses, repeat)
+    return result
+
+
+def _prop_id(address):
+    try:
+        return AbAddressUtility(address).prop_id
+    except AddressParseError:
+        return None
+
+
+def memory(addresses):
+    """Bytes kept per result of ``parse_many``, failures included."""
+    result = {}
+    for name, compact in (('AbAddressUtility', False), ('ParsedAddress', True)):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        results = list(parse_many(addresses, compact=compact))
+        result[name] = round((tracemalloc.get_traced_memory()[0] - before) / len(addresses))
+        tracemalloc.stop()
+        del results
+    return result
+
+
+def compare(current, baseline):
+    """Print each metric of ``current`` next to ``baseline``."""
+    print(f"\n{'metric':<42} {'baseline':>10} {'current':>10} {'change':>8}")
+    for section in ('stages_ns', 'parses_per_second', 'bytes_per_parse'):
+        for name, value in current[section].items():
+            value = value['ns'] if isinstance(value, dict) else value
+            old = baseline.get(section, {}).get(name)
+            old = old['ns'] if isinstance(old, dict) else old
+            change = f'{value / old - 1:+.1%}' if old else ''
+            print(f"{section + '.' + name:<42} {old if old is not None else '':>10} {value:>10} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', help='write the results to this file')
+    parser.add_argument('--compare', help='results of an earlier run to compare with')
+    args = parser.parse_args()
+
+    disable_parse_cache()
+    rows = mixed(args.size, args.seed)
+    addresses = [address for _, address in rows]
+    parsed = sum(p is not None for p in map(standardise_address, addresses))
+    results = {
+        'size': args.size,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'mix': dict(MIX),
+        'parsed_share': round(parsed / len(addresses), 4),
+        'stages_ns': stages(addresses, args.repeat),
+        'parses_per_second': throughput(rows, args.repeat),
+        'bytes_per_parse': memory(addresses),
+    }
+
+    print(f"{args.size:,} addresses, {results['parsed_share']:.1%} parsed")
+    print(f"{'stage':<14} {'ns/call':>8} {'calls':>9}")
+    for name, stage in results['stages_ns'].items():
+        print(f"{name:<14} {stage['ns']:>8,} {stage['calls']:>9,}")
+    for name, rate in results['parses_per_second'].items():
+        print(f'{name:<26} {rate:>9,} parses/s')
+    for name, size in results['bytes_per_parse'].items():
+        print(f'{name:<26} {size:>9,} bytes/parse')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
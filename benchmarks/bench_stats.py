@@ -0,0 +1,52 @@
+"""Cost of parse statistics: parses per second with them off, counting
+branches, and counting with stage timings.
+
+    python benchmarks/bench_stats.py --size 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from au_address_parser import (disable_parse_stats, enable_parse_stats, parse_stats,  # noqa: E402
+                               standardise_address)
+from corpus import mixed  # noqa: E402
+
+
+def rate(addresses, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for address in addresses:
+            standardise_address(address)
+        best = min(best, time.perf_counter() - start)
+    return len(addresses) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--kind', choices=('standard', 'comma-less', 'malformed', 'all'), default='standard')
+    args = parser.parse_args()
+
+    addresses = [address for kind, address in mixed(args.size, args.seed)
+                 if args.kind in ('all', kind)]
+    off = rate(addresses, args.repeat)
+    print(f"{'statistics':<18} {'parses/s':>9} {'cost':>7}")
+    print(f"{'off':<18} {off:>9,.0f}")
+    for name, timings in (('counters', False), ('counters+timings', True)):
+        enable_parse_stats(timings=timings)
+        on = rate(addresses, args.repeat)
+        stats = parse_stats()
+        disable_parse_stats()
+        print(f'{name:<18} {on:>9,.0f} {off / on - 1:>+7.1%}')
+    for branch, count in stats['branches'].items():
+        print(f'  {branch:<24} {count:>9,}')
+
+
+if __name__ == '__main__':
+    main()
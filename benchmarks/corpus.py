@@ -0,0 +1,218 @@
+"""Seeded synthetic Australian address generator used by the benchmarks.
+
+Every benchmark draws its inputs from :func:`generate`, so runs with the
+same seed and size parse exactly the same strings.
+"""
+import random
+
+STREET_NAMES = (
+    'EXAMPLE', 'GEORGE', 'KING', 'QUEEN', 'VICTORIA', 'CHURCH', 'HIGH', 'PARK',
+    'STATION', 'RAILWAY', 'MAIN', 'WILLIAM', 'ELIZABETH', 'BRIDGE', 'MILL',
+    'SMITH', 'PACIFIC', 'OCEAN VIEW', 'BLUE GUM', 'MOUNT ERICA',
+)
+
+STREET_TYPES = (
+    ('STREET', 'ST'), ('ROAD', 'RD'), ('AVENUE', 'AVE'), ('DRIVE', 'DR'),
+    ('PLACE', 'PL'), ('COURT', 'CT'), ('CRESCENT', 'CRES'), ('PARADE', 'PDE'),
+    ('LANE', 'LANE'), ('CLOSE', 'CL'), ('HIGHWAY', 'HWY'), ('TERRACE', 'TCE'),
+)
+
+SUFFIXES = (('WEST', 'W'), ('EAST', 'E'), ('NORTH', 'N'), ('SOUTH', 'S'))
+
+LOCALITIES = (
+    ('STANMORE', 'NSW', '2048'), ('NEWTOWN', 'NSW', '2042'),
+    ('PARRAMATTA', 'NSW', '2150'), ('FITZROY', 'VIC', '3065'),
+    ('ST KILDA', 'VIC', '3182'), ('SOUTH BRISBANE', 'QLD', '4101'),
+    ('FORTITUDE VALLEY', 'QLD', '4006'), ('GLENELG', 'SA', '5045'),
+    ('FREMANTLE', 'WA', '6160'), ('SANDY BAY', 'TAS', '7005'),
+    ('BRADDON', 'ACT', '2612'), ('DARWIN CITY', 'NT', '800'),
+)
+
+
+def _address(rnd):
+    street_name = rnd.choice(STREET_NAMES)
+    street_type = rnd.choice(STREET_TYPES)[rnd.random() < 0.5]
+    locality, state, post = rnd.choice(LOCALITIES)
+    number = str(rnd.randint(1, 400))
+    if rnd.random() < 0.2:
+        number += f'-{int(number) + 2}'
+    if rnd.random() < 0.05:
+        number += 'A'
+
+    street = f'{street_name} {street_type}'
+    if rnd.random() < 0.1:
+        street += ' ' + rnd.choice(SUFFIXES)[rnd.random() < 0.5]
+
+    flat = rnd.random()
+    if flat < 0.15:
+        prefix = f'{rnd.randint(1, 40)}/{number}'
+    elif flat < 0.25:
+        prefix = f"{rnd.choice(('Unit ', 'U', 'Shop '))}{rnd.randint(1, 40)} {number}"
+    else:
+        prefix = number
+
+    form = rnd.random()
+    if form < 0.6:
+        return f'{prefix} {street}, {locality}, {state} {post}'
+    elif form < 0.9:
+        return f'{prefix} {street}, {locality} {state} {post}'
+    return f'{prefix} {street}, {locality.title()} {state} {post}'
+
+
+def generate(n, seed=0):
+    """Return a list of ``n`` synthetic addresses for the given ``seed``."""
+    rnd = random.Random(seed)
+    return [_address(rnd) for _ in range(n)]
+
+
+def repeated(n, unique, seed=0):
+    """Return ``n`` addresses drawn with repetition from ``unique`` distinct
+    ones, like a transaction feed that keeps seeing the same properties."""
+    pool = generate(unique, seed)
+    rnd = random.Random(seed)
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+# Families of input built to make the street and locality patterns backtrack,
+# each a function of a random generator and a target length
+PATHOLOGICAL = {
+    'locality_letters': lambda rnd, length: '1 KING ST, ' + ''.join(
+        rnd.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ') for _ in range(length - 12)) + '!',
+    'locality_words': lambda rnd, length: '1 KING ST, ' + ' '.join(
+        rnd.choice(('CUL-DE-SAC', 'SHOP', 'WEST', 'LOT', 'STANMORE', 'NSWA')) for _ in range(length // 6))[:length - 12] + '!',
+    'locality_hyphens': lambda rnd, length: '1 KING ST, ' + '-'.join(
+        'AB' for _ in range(length // 3))[:length - 12] + '!',
+    'street_hyphens': lambda rnd, length: '1-' + ('A' * 12 + '-') * ((length - 32) // 13) + '. KING ST, STANMORE NSW 2048',
+    'quotes': lambda rnd, length: ('"' + 'A "' * (length // 3))[:length - 30] + ' 1 KING ST, STANMORE NSW 2048',
+    'punctuation': lambda rnd, length: ''.join(
+        rnd.choice('1A -/,"\'U') for _ in range(length)),
+}
+
+
+def pathological(n, length, seed=0):
+    """Return ``n`` ``(family, address)`` pairs of roughly ``length``
+    characters, cycling through :data:`PATHOLOGICAL`."""
+    rnd = random.Random(seed)
+    families = sorted(PATHOLOGICAL)
+    return [(family, PATHOLOGICAL[family](rnd, length))
+            for family in (families[i % len(families)] for i in range(n))]
+
+
+GNAF_HEADER = ('ADDRESS_DETAIL_PID', 'BUILDING_NAME', 'FLAT_TYPE', 'FLAT_NUMBER_PREFIX',
+               'FLAT_NUMBER', 'FLAT_NUMBER_SUFFIX', 'NUMBER_FIRST_PREFIX', 'NUMBER_FIRST',
+               'NUMBER_FIRST_SUFFIX', 'NUMBER_LAST_PREFIX', 'NUMBER_LAST', 'NUMBER_LAST_SUFFIX',
+               'STREET_NAME', 'STREET_TYPE_CODE', 'STREET_SUFFIX_CODE', 'LOCALITY_NAME',
+               'STATE_ABBREVIATION', 'POSTCODE', 'LATITUDE', 'LONGITUDE')
+
+
+def _gnaf_row(rnd, i):
+    locality, state, post = rnd.choice(LOCALITIES)
+    number = rnd.randint(1, 400)
+    flat = rnd.random() < 0.25
+    has_last = rnd.random() < 0.2
+    return (f'GA{state}{704000000 + i}', 'THE PALMS' if rnd.random() < 0.05 else '',
+            'UNIT' if flat else '', '', str(rnd.randint(1, 40)) if flat else '',
+            rnd.choice(('', '', '', 'A')) if flat else '',
+            '', str(number), rnd.choice(('', '', '', '', 'A', 'B')),
+            '', str(number + 2) if has_last else '', '',
+            rnd.choice(STREET_NAMES), rnd.choice(STREET_TYPES)[0],
+            rnd.choice(SUFFIXES)[1] if rnd.random() < 0.1 else '',
+            locality, state, post.zfill(4),
+            f'{-33 - rnd.random():.8f}', f'{151 + rnd.random():.8f}')
+
+
+def gnaf_rows(n, seed=0):
+    """Return ``n`` synthetic rows shaped like a G-NAF ``ADDRESS_VIEW``
+    export, in the order of :data:`GNAF_HEADER`."""
+    rnd = random.Random(seed)
+    return [_gnaf_row(rnd, i) for i in range(n)]
+
+
+_SYLLABLES = ('AL', 'BAR', 'BEL', 'CAR', 'DEN', 'DOR', 'EL', 'FOR', 'GAR', 'HAR', 'KIN',
+              'LAN', 'MAR', 'MOR', 'NEW', 'OR', 'PAR', 'RAN', 'ROS', 'SAN', 'TON', 'VAL',
+              'WIL', 'WOOD', 'YAR', 'BROOK', 'FIELD', 'GLEN', 'HILL', 'DALE')
+
+
+def _name(rnd, syllables):
+    return ''.join(rnd.choice(_SYLLABLES) for _ in range(syllables))
+
+
+def references(n, seed=0, streets=20000, localities=3000):
+    """Return ``n`` distinct reference properties as G-NAF field dicts,
+    drawn from ``streets`` street names in ``localities`` localities, for
+    matching benchmarks."""
+    rnd = random.Random(seed)
+    states = ('NSW', 'VIC', 'QLD', 'SA', 'WA', 'TAS', 'ACT', 'NT')
+    places = [(_name(rnd, rnd.randint(2, 3)), rnd.choice(states), str(rnd.randint(800, 7999)).zfill(4))
+              for _ in range(localities)]
+    names = [_name(rnd, rnd.randint(1, 3)) for _ in range(streets)]
+    seen, rows = set(), []
+    while len(rows) < n:
+        locality, state, post = rnd.choice(places)
+        row = {
+            'flat_number': str(rnd.randint(1, 20)) if rnd.random() < 0.3 else '',
+            'number_first': str(rnd.randint(1, 300)),
+            'street_name': rnd.choice(names),
+            'street_type_code': rnd.choice(STREET_TYPES)[0],
+            'locality_name': locality,
+            'state_abbreviation': state,
+            'postcode': post,
+        }
+        key = tuple(row.values())
+        if key not in seen:
+            seen.add(key)
+            rows.append(row)
+    return rows
+
+
+def places(n, seed=0):
+    """Return the ``(locality, state, post)`` pairs of ``n`` synthetic
+    localities plus those of :data:`LOCALITIES`, about one in five
+    localities having a second pair, as G-NAF's do."""
+    rnd = random.Random(seed)
+    states = ('NSW', 'VIC', 'QLD', 'SA', 'WA', 'TAS', 'ACT', 'NT')
+    names, pairs = set(), list(LOCALITIES)
+    while len(names) < n:
+        name = _name(rnd, rnd.randint(2, 4))
+        if rnd.random() < 0.2:
+            name = f'{rnd.choice(("NORTH", "SOUTH", "MOUNT", "PORT"))} {name}'
+        if name in names:
+            continue
+        names.add(name)
+        for _ in range(2 if rnd.random() < 0.2 else 1):
+            pairs.append((name, rnd.choice(states), str(rnd.randint(800, 7999)).zfill(4)))
+    return pairs
+
+
+# Ways of breaking an address, each a function of a random generator and a
+# well-formed address
+MALFORMED = {
+    'no_postcode': lambda rnd, address: address.rsplit(' ', 1)[0],
+    'no_state': lambda rnd, address: ' '.join(w for w in address.split(' ') if w not in
+                                              ('NSW', 'VIC', 'QLD', 'SA', 'WA', 'TAS', 'ACT', 'NT')),
+    'no_number': lambda rnd, address: address.split(' ', 1)[1].lstrip('0123456789- '),
+    'truncated': lambda rnd, address: address[:rnd.randint(3, len(address) // 2)],
+    'extra_commas': lambda rnd, address: 'THE GROVE, ' + address.replace(', ', ',, '),
+    'noise': lambda rnd, address: ''.join(rnd.choice('ABC 123,/-') for _ in range(rnd.randint(1, 40))),
+}
+
+#: Share of each kind of address :func:`mixed` returns
+MIX = (('standard', 0.7), ('comma-less', 0.2), ('malformed', 0.1))
+
+
+def mixed(n, seed=0):
+    """Return ``n`` ``(kind, address)`` pairs mixing the kinds of :data:`MIX`:
+    addresses from :func:`generate`, the same without commas, and ones
+    broken by a :data:`MALFORMED` function."""
+    rnd = random.Random(seed)
+    families = sorted(MALFORMED)
+    rows = []
+    for _ in range(n):
+        address, draw = _address(rnd), rnd.random()
+        if draw < MIX[0][1]:
+            rows.append(('standard', address))
+        elif draw < MIX[0][1] + MIX[1][1]:
+            rows.append(('comma-less', ' '.join(address.replace(',', ' ').split())))
+        else:
+            rows.append(('malformed', MALFORMED[rnd.choice(families)](rnd, address)))
+    return rows
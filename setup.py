@@ -7,7 +7,15 @@ setup(name='au_address_parser',
       url='https://au-addr-parser.readthedocs.io/',
       author_email='gigi17901@gmail.com',
       packages=['au_address_parser'],
+      package_data={'au_address_parser': ['data/*.bin']},
       install_requires=[],
+      entry_points={
+          'console_scripts': ['au-addr=au_address_parser.cli:main'],
+      },
+      extras_require={
+          'pandas': ['pandas>=0.25', 'numpy'],
+          'fast': ['xxhash>=2.0'],
+      },
       classifiers=[
           'Development Status :: 3 - Alpha',
           'License :: OSI Approved :: MIT License',
@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from au_address_parser import AsyncStandardiser, ParsedAddress, ParseFailure, standardise_address
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             'STANMORE',
+             '22 Example ST west, STANMORE, NSW 2048']
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_standardise_matches_standardise_address():
+    async def main():
+        async with AsyncStandardiser(max_batch_size=4, max_wait=0.001) as standardiser:
+            return await asyncio.gather(*(standardiser.standardise(a) for a in ADDRESSES * 5))
+
+    assert _run(main()) == [standardise_address(a) for a in ADDRESSES * 5]
+
+
+def test_runs_without_deprecated_loop_lookup(recwarn):
+    async def main():
+        async with AsyncStandardiser(max_wait=0.001) as standardiser:
+            return await standardiser.standardise(ADDRESSES[0])
+
+    assert _run(main()) == standardise_address(ADDRESSES[0])
+    assert not [w for w in recwarn if issubclass(w.category, DeprecationWarning)]
+
+
+def test_parse_results_and_failures():
+    async def main():
+        standardiser = AsyncStandardiser()
+        return await asyncio.gather(standardiser.parse(ADDRESSES[0]), standardiser.parse('STANMORE'),
+                                    standardiser.parse(None))
+
+    parsed, failure, not_string = _run(main())
+    assert isinstance(parsed, ParsedAddress)
+    assert failure == ParseFailure('STANMORE', 'format')
+    assert not_string.reason == 'not_a_string'
+
+
+def test_batches_and_shared_in_flight():
+    async def main():
+        standardiser = AsyncStandardiser(max_batch_size=10, max_wait=0.05)
+        addresses = [f'{i} Example ST, STANMORE, NSW 2048' for i in range(25)]
+        await asyncio.gather(*(standardiser.standardise(a) for a in addresses + addresses[:5]))
+        return standardiser.metrics()
+
+    metrics = _run(main())
+    assert metrics['requests'] == 30
+    assert metrics['shared'] == 5
+    assert metrics['batches'] == 3
+    assert metrics['mean_batch_size'] == 25 / 3
+    assert metrics['queue_depth'] == metrics['in_flight'] == 0
+    assert 0 < metrics['latency_p50'] <= metrics['latency_p99'] <= metrics['latency_max']
+
+
+def test_queue_depth_behind_running_batch():
+    async def main():
+        standardiser = AsyncStandardiser(max_batch_size=100, max_wait=10)
+        first = asyncio.ensure_future(standardiser.standardise(ADDRESSES[0]))
+        while not standardiser.metrics()['batches'] and not standardiser._running:
+            await asyncio.sleep(0)
+        second = asyncio.ensure_future(standardiser.standardise(ADDRESSES[2]))
+        await asyncio.sleep(0)
+        metrics = standardiser.metrics()
+        # The second batch goes when the first finishes, not after max_wait
+        results = await asyncio.wait_for(asyncio.gather(first, second), 5)
+        return metrics, results
+
+    metrics, results = _run(main())
+    assert metrics['queue_depth'] == 1
+    assert metrics['in_flight'] == 2
+    assert results == [standardise_address(ADDRESSES[0]), standardise_address(ADDRESSES[2])]
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    async def main():
+        standardiser = AsyncStandardiser(max_wait=0.01, executor=ThreadPoolExecutor(1))
+        first = asyncio.ensure_future(standardiser.standardise(ADDRESSES[0]))
+        second = asyncio.ensure_future(standardiser.standardise(ADDRESSES[0]))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert _run(main()) == standardise_address(ADDRESSES[0])
+
+
+def test_invalid_args():
+    with pytest.raises(ValueError):
+        AsyncStandardiser(max_batch_size=0)
+    with pytest.raises(ValueError):
+        AsyncStandardiser(engine='fast')
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from au_address_parser import (AbAddressUtility, clear_parse_cache,
+                               disable_parse_cache, enable_parse_cache,
+                               parse_cache_info, standardise_address)
+from au_address_parser.cache import ParseCache
+
+
+@pytest.fixture
+def parse_cache():
+    yield enable_parse_cache(maxsize=2)
+    disable_parse_cache()
+
+
+def test_cache_hits_and_copies(parse_cache):
+    first = AbAddressUtility('22 Example ST, STANMORE, NSW 2048')
+    first.parsed_addr['street_name'] = 'CHANGED'
+    second = AbAddressUtility('22  example st , stanmore, NSW 2048')
+    assert second.parsed_addr['street_name'] == 'EXAMPLE'
+    assert second.std_address == '22 EXAMPLE ST, STANMORE NSW 2048'
+    assert parse_cache_info()[:2] == (1, 1)
+
+
+def test_cache_failures(parse_cache):
+    assert standardise_address('22 Example ST, STANMORE') is None
+    assert standardise_address('22 Example ST, STANMORE') is None
+    assert parse_cache_info().hits == 1
+
+
+def test_cache_eviction_and_clear(parse_cache):
+    for address in ('1 A ST, X NSW 1', '2 A ST, X NSW 1', '3 A ST, X NSW 1', '1 A ST, X NSW 1'):
+        standardise_address(address)
+    assert parse_cache_info() == (0, 4, 2, 2, 2)
+    clear_parse_cache()
+    assert parse_cache_info() == (0, 0, 0, 2, 0)
+
+
+def test_cache_disabled():
+    disable_parse_cache()
+    standardise_address('22 Example ST, STANMORE, NSW 2048')
+    assert parse_cache_info() is None
+
+
+def test_cache_thread_safe():
+    parse_cache = ParseCache(maxsize=50)
+
+    def work(offset):
+        for i in range(2000):
+            key = str((i + offset) % 100)
+            if parse_cache.get(key) is None:
+                parse_cache.put(key, key)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = parse_cache.info()
+    assert info.currsize == 50
+    assert info.hits + info.misses == 8000
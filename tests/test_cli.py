@@ -0,0 +1,106 @@
+import csv
+import json
+
+import pytest
+
+from au_address_parser import AbAddressUtility
+from au_address_parser.cli import main
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             'STANMORE',
+             '22 Example ST west, STANMORE, NSW 2048'] * 3
+
+
+def _write_csv(path):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'address'])
+        writer.writerows([str(i), address] for i, address in enumerate(ADDRESSES))
+
+
+def _check_rows(rows):
+    assert [row['id'] for row in rows] == [str(i) for i in range(len(ADDRESSES))]
+    for row, address in zip(rows, ADDRESSES):
+        assert row['address'] == address
+        if address == 'STANMORE':
+            assert row['reason'] == 'format'
+            assert not row['std_address']
+        else:
+            address_cls = AbAddressUtility(address)
+            assert row['std_address'] == address_cls.std_address
+            assert row['prop_id'] == address_cls.prop_id
+            assert row['street_name'] == address_cls.parsed_addr['street_name']
+            assert not row['reason']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_csv_to_csv(tmp_path, workers):
+    src, dst, summary = tmp_path / 'in.csv', tmp_path / 'out.csv', tmp_path / 'summary.json'
+    _write_csv(src)
+    assert main(['standardise', str(src), '-o', str(dst), '--workers', str(workers),
+                 '--chunksize', '2', '--summary', str(summary)]) == 0
+
+    with open(dst, newline='') as f:
+        _check_rows(list(csv.DictReader(f)))
+    summary = json.loads(summary.read_text())
+    assert summary['rows'] == 9
+    assert summary['parsed'] == 6
+    assert summary['failed'] == 3
+    assert summary['failure_reasons'] == {'format': 3}
+
+
+def test_csv_to_jsonl_to_jsonl(tmp_path):
+    src, mid, dst = tmp_path / 'in.csv', tmp_path / 'mid.jsonl', tmp_path / 'out.jsonl'
+    _write_csv(src)
+    main(['standardise', str(src), '-o', str(mid), '--summary', str(tmp_path / 's.json')])
+    main(['standardise', str(mid), '-o', str(dst), '--engine', 'token', '--prefix', 'new_',
+          '--summary', str(tmp_path / 's.json')])
+
+    for path in (mid, dst):
+        with open(path) as f:
+            _check_rows([json.loads(line) for line in f])
+    with open(dst) as f:
+        for row in map(json.loads, f):
+            assert row['new_std_address'] == row['std_address']
+            assert row['new_reason'] == row['reason']
+
+
+def test_clashing_columns(tmp_path):
+    src, dst = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    with open(src, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['address', 'state', 'post'])
+        writer.writerow([ADDRESSES[0], 'New South Wales', '2048-orig'])
+        writer.writerow(['STANMORE', 'New South Wales', '2048-orig'])
+    with pytest.raises(SystemExit, match='state, post'):
+        main(['standardise', str(src), '-o', str(dst)])
+
+    main(['standardise', str(src), '-o', str(dst), '--prefix', 'std_',
+          '--summary', str(tmp_path / 's.json')])
+    with open(dst, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [(row['state'], row['post']) for row in rows] == [('New South Wales', '2048-orig')] * 2
+    assert (rows[0]['std_state'], rows[0]['std_post']) == ('NSW', '2048')
+    assert rows[1]['std_reason'] == 'format'
+
+    jsonl = tmp_path / 'in.jsonl'
+    jsonl.write_text(json.dumps({'address': ADDRESSES[0], 'post': '2048-orig'}) + '\n')
+    with pytest.raises(SystemExit, match='post'):
+        main(['standardise', str(jsonl), '-o', str(tmp_path / 'out.jsonl')])
+
+
+def test_max_length_and_summary_on_stderr(tmp_path, capsys):
+    src, dst = tmp_path / 'in.csv', tmp_path / 'out.jsonl'
+    _write_csv(src)
+    main(['standardise', str(src), '-o', str(dst), '--max-length', '20'])
+
+    summary = json.loads(capsys.readouterr().err)
+    assert summary['failure_reasons'] == {'too_long': 6, 'format': 3}
+
+
+def test_jsonl_to_csv_fails(tmp_path):
+    src = tmp_path / 'in.jsonl'
+    src.write_text(json.dumps({'address': ADDRESSES[0]}) + '\n')
+    with pytest.raises(SystemExit):
+        main(['standardise', str(src), '-o', str(tmp_path / 'out.csv')])
@@ -0,0 +1,36 @@
+import pytest
+
+from au_address_parser import AbAddressUtility, parse_column
+from au_address_parser.addr_parser import PARSED_ADDR_FIELDS
+
+pd = pytest.importorskip('pandas')
+np = pytest.importorskip('numpy')
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             'STANMORE',
+             None,
+             '22 Example ST west, STANMORE, NSW 2048',
+             'Unit 2 42-44 Example ST, STANMORE,  NSW 2048']
+
+
+@pytest.mark.parametrize('categorical', [True, False])
+def test_parse_column_matches_class(categorical):
+    frame = parse_column(pd.Series(ADDRESSES, index=list('abcde')), categorical=categorical)
+    assert list(frame.index) == list('abcde')
+    assert list(frame.columns) == list(PARSED_ADDR_FIELDS) + ['std_address', 'prop_id', 'reason']
+    for label, address in zip('ade', ADDRESSES[0:1] + ADDRESSES[3:]):
+        address_cls = AbAddressUtility(address)
+        row = frame.loc[label]
+        assert row['std_address'] == address_cls.std_address
+        assert row['prop_id'] == address_cls.prop_id
+        for field, value in address_cls.parsed_addr.items():
+            assert row[field] == value or (value is None and pd.isna(row[field]))
+    assert frame.loc['b', 'reason'] == 'format'
+    assert frame.loc['c'].isna().all()
+
+
+def test_parse_column_arrays():
+    frame = parse_column(np.array(ADDRESSES[:2] * 3, dtype=str))
+    assert frame['std_address'].dtype == 'category'
+    assert frame['std_address'].tolist() == ['2/42 EXAMPLE ST, STANMORE NSW 2048', np.nan] * 3
+    assert parse_column([]).shape == (0, len(PARSED_ADDR_FIELDS) + 3)
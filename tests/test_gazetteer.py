@@ -0,0 +1,128 @@
+import pytest
+
+from au_address_parser import AbAddressUtility, Gazetteer, ParseFailure, build_gazetteer
+from au_address_parser.addr_parser import GNAF_FIELDS
+from au_address_parser.cli import main
+from au_address_parser.gazetteer import STATES
+
+
+PLACES = [('STANMORE', 'NSW', '2048'),
+          ('Stanmore', 'QLD', '4514'),
+          ('STANMORE', 'NSW', '2048'),
+          ('NEWTOWN', 'NSW', '2042'),
+          ('NEWTOWN', 'VIC', '3220'),
+          ('NEWTOWN', 'TAS', '7008'),
+          ('NORFOLK  ISLAND', 'OT', '2899'),
+          ('DARWIN', 'NT', '800'),
+          ('SURRY HILLS', 'NSW', '2010')]
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    path = str(tmp_path / 'gazetteer.bin')
+    assert build_gazetteer(path, PLACES) == 5
+    return Gazetteer(path)
+
+
+def test_places(gazetteer):
+    assert len(gazetteer) == 5
+    assert 'STANMORE' in gazetteer and 'STANMOR' not in gazetteer
+    assert gazetteer.places('STANMORE') == [('NSW', '2048'), ('QLD', '4514')]
+    assert gazetteer.places('NORFOLK ISLAND') == [('OT', '2899')]
+    assert gazetteer.places('DARWIN') == [('NT', '0800')]
+    assert gazetteer.places('NOWHERE') == []
+
+
+def test_complete(gazetteer):
+    assert gazetteer.complete('STANMORE', post='2048') == ('NSW', '2048')
+    assert gazetteer.complete('STANMORE', state='QLD') == ('QLD', '4514')
+    assert gazetteer.complete('STANMORE') == (None, None)
+    assert gazetteer.complete('DARWIN', post='800') == ('NT', '800')
+    assert gazetteer.complete('STANMORE', 'VIC') is None
+    assert gazetteer.complete('NOWHERE') is None
+    assert gazetteer.complete('STANMORE', post='ABCD') is None
+    assert gazetteer.complete('STANMORE', post='20480') is None
+
+
+@pytest.mark.parametrize('place', [('NOWHERE', 'XX', '2000'), ('NOWHERE', 'NSW', '20A0')])
+def test_build_rejects_bad_places(tmp_path, place):
+    with pytest.raises(ValueError, match='NOWHERE'):
+        build_gazetteer(str(tmp_path / 'gazetteer.bin'), [place])
+
+
+def test_validate(gazetteer):
+    parsed = AbAddressUtility('42 Example St, STANMORE NSW 2048')._parsed
+    assert gazetteer.validate(parsed) is None
+    assert gazetteer.validate(parsed._replace(post='2049')) == 'locality_mismatch'
+    assert gazetteer.validate(parsed._replace(locality='STANMOR')) == 'unknown_locality'
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('42 Example St, Stanmore NSW 2048', '42 EXAMPLE ST, STANMORE NSW 2048'),
+    ('42 Example St, Stanmore 2048', '42 EXAMPLE ST, STANMORE NSW 2048'),
+    ('42 Example St, Stanmore QLD', '42 EXAMPLE ST, STANMORE QLD 4514'),
+    ('42 Example St West Stanmore NSW 2048', '42 EXAMPLE ST W, STANMORE NSW 2048'),
+    ('1/3 King St Surry Hills NSW 2010', '1/3 KING ST, SURRY HILLS NSW 2010'),
+    ('42 Example St North Surry Hills 2010', '42 EXAMPLE ST N, SURRY HILLS NSW 2010'),
+])
+def test_parse(gazetteer, address, expected):
+    assert gazetteer.parse(address).std_address == expected
+
+
+@pytest.mark.parametrize('address, reason', [
+    ('42 Example St, Stanmore', 'no_state'),
+    ('42 Example St, Newtown 2042 NSW', 'no_state'),
+    ('42 Example St, Newtown NSW 2049', 'locality_mismatch'),
+    ('42 Example St, Stanmor NSW 2048', 'unknown_locality'),
+    (None, 'not_a_string'),
+])
+def test_parse_failures(gazetteer, address, reason):
+    failure = gazetteer.parse(address)
+    assert isinstance(failure, ParseFailure)
+    assert failure.reason == reason
+
+
+def test_loads_lazily_and_reports_cost(tmp_path):
+    gazetteer = Gazetteer(str(tmp_path / 'missing.bin'))
+    with pytest.raises(FileNotFoundError, match='build_gazetteer'):
+        'STANMORE' in gazetteer
+
+    path = str(tmp_path / 'gazetteer.bin')
+    build_gazetteer(path, PLACES)
+    info = Gazetteer(path).info()
+    assert info['localities'] == 5
+    assert info['pairs'] == 8
+    assert info['load_seconds'] >= 0
+    assert info['memory_bytes'] > 0
+
+    empty = str(tmp_path / 'empty.bin')
+    build_gazetteer(empty, [])
+    assert len(Gazetteer(empty)) == 0
+
+    with open(empty, 'wb') as f:
+        f.write(b'NOTATABLE' * 4)
+    with pytest.raises(ValueError):
+        len(Gazetteer(empty))
+    assert STATES[-1] == 'OT'
+
+
+def test_cli_builds_from_gnaf(tmp_path, capsys):
+    psv = tmp_path / 'NSW_ADDRESS_VIEW.psv'
+    rows = ['|'.join(('address_detail_pid',) + GNAF_FIELDS),
+            'GA1|||||42|||||EXAMPLE|ST||STANMORE|NSW|2048',
+            'GA2|||||44|||||EXAMPLE|ST||STANMORE|NSW|2048',
+            'GA3|||||1|||||KING|ST||NEWTOWN|NSW|2042',
+            'GA4|||||9|||||NEW CASCADE|RD||NORFOLK ISLAND|OT|2899',
+            'GA5|||||||||||||CHRISTMAS ISLAND|OT|6798',
+            'GA6|||||1|||||KING|ST||NOWHERE|NSW|20A0',
+            'GA7|||||1']
+    psv.write_text('\n'.join(rows) + '\n')
+    out = str(tmp_path / 'gazetteer.bin')
+    assert main(['gazetteer', str(psv), '-o', out]) == 0
+    summary = capsys.readouterr().err
+    assert '"localities": 4' in summary and '"skipped": 2' in summary
+    built = Gazetteer(out)
+    assert built.places('NEWTOWN') == [('NSW', '2042')]
+    assert built.places('NORFOLK ISLAND') == [('OT', '2899')]
+    assert built.places('CHRISTMAS ISLAND') == [('OT', '6798')]
+    assert 'NOWHERE' not in built
@@ -0,0 +1,171 @@
+import itertools
+import random
+
+import pytest
+
+from au_address_parser import (AbAddressUtility, AddressParseError, ParsedAddress, ParseFailure,
+                               read_gnaf_psv)
+from au_address_parser.addr_parser import GNAF_FIELDS
+
+
+GNAF = {'flat_number': '2',
+        'number_first': '42',
+        'number_last': '44',
+        'street_name': 'EXAMPLE',
+        'street_type_code': 'STREET',
+        'street_suffix_code': 'W',
+        'locality_name': 'STANMORE',
+        'state_abbreviation': 'NSW',
+        'postcode': '2048'}
+
+
+def _rows(n, seed=0):
+    """G-NAF field dicts mixing numbers, types, suffixes and odd names."""
+    rnd = random.Random(seed)
+    names = ('EXAMPLE', 'THE', 'KING GEORGE', 'WEST', 'NORTH ST', 'CUL-DE-SAC', 'AV', 'GRAND')
+    types = ('STREET', 'AVENUE', 'ST', 'CRESCENT', 'CUL-DE-SAC', 'BOULEVARDE', 'LANE', 'WEST', '')
+    suffixes = ('', '', 'W', 'N', 'CN', 'EAST')
+    localities = ('STANMORE', 'ST KILDA', 'MOUNT WA', 'BURNSIDE-HEIGHTS', 'NORTH  SYDNEY')
+    for _ in range(n):
+        flat = rnd.random() < 0.3
+        last = rnd.random() < 0.3
+        first = rnd.random() < 0.95
+        yield {'flat_number_prefix': rnd.choice(('', 'A')) if flat else '',
+               'flat_number': str(rnd.randint(0, 40)) if flat else '',
+               'flat_number_suffix': rnd.choice(('', 'B')) if flat else '',
+               'number_first_prefix': rnd.choice(('', '', 'A')) if first else '',
+               'number_first': str(rnd.randint(0, 400)) if first else '',
+               'number_first_suffix': rnd.choice(('', '', 'B')) if first else '',
+               'number_last_prefix': rnd.choice(('', '', 'B')) if last else '',
+               'number_last': str(rnd.randint(1, 400)) if last else '',
+               'number_last_suffix': rnd.choice(('', 'C')) if last else '',
+               'street_name': rnd.choice(names),
+               'street_type_code': rnd.choice(types),
+               'street_suffix_code': rnd.choice(suffixes),
+               'locality_name': rnd.choice(localities),
+               'state_abbreviation': rnd.choice(('NSW', 'VIC', 'WA')),
+               # Rare, as the regex locality patterns backtrack long without a postcode
+               'postcode': rnd.choice(('2048', '0800', '3182', '800') if rnd.random() < 0.98
+                                      else ('20481', '2O48'))}
+
+
+def _outcome(constructor, fields):
+    try:
+        addr = constructor(**fields)
+    except AddressParseError as e:
+        return e.reason
+    return addr.parsed_addr, addr.std_address, addr.prop_id, addr.addr_string, addr._addr_string
+
+
+def test_from_gnaf_dict_street_type():
+    addr = AbAddressUtility.from_gnaf_dict(**GNAF)
+    assert addr.addr_string == '2/42-44 Example Street W, Stanmore NSW 2048'
+    assert addr.std_address == '2/42 EXAMPLE ST W, STANMORE NSW 2048'
+
+
+def test_from_gnaf_dict_parsed_addr_keys():
+    parsed_addr = AbAddressUtility('U2 42-44 Example St, STANMORE, NSW 2048').parsed_addr
+    addr = AbAddressUtility.from_gnaf_dict(**parsed_addr)
+    assert '  ' not in addr.addr_string
+    assert addr.parsed_addr == parsed_addr
+    assert AbAddressUtility.from_gnaf_fields(**parsed_addr).parsed_addr == parsed_addr
+
+
+def test_from_gnaf_fields_matches_from_gnaf_dict():
+    outcomes = set()
+    for fields in _rows(3000):
+        by_string = _outcome(AbAddressUtility.from_gnaf_dict, fields)
+        assert _outcome(AbAddressUtility.from_gnaf_fields, fields) == by_string, fields
+        outcomes.add(by_string if isinstance(by_string, str) else 'parsed')
+    assert outcomes == {'parsed', 'no_street_name', 'no_street_number', 'no_postcode'}
+
+
+@pytest.mark.parametrize('fields, std_address', [
+    (dict(flat_number='12', number_first='0', number_last_prefix='B', number_last='4'),
+     '12/0 EXAMPLE ST W, STANMORE NSW 2048'),
+    (dict(number_first='', number_last='44'), '2/44 EXAMPLE ST W, STANMORE NSW 2048'),
+    (dict(postcode='20481'), 'no_postcode'),
+])
+def test_from_gnaf_fields_edge_cases(fields, std_address):
+    fields = dict(GNAF, **fields)
+    for constructor in (AbAddressUtility.from_gnaf_dict, AbAddressUtility.from_gnaf_fields):
+        outcome = _outcome(constructor, fields)
+        assert (outcome if isinstance(outcome, str) else outcome[1]) == std_address
+
+
+@pytest.mark.parametrize('missing, reason', [
+    ('number_first', 'no_street_number'),
+    ('street_name', 'no_street_name'),
+    ('locality_name', 'no_locality'),
+    ('state_abbreviation', 'no_state'),
+    ('postcode', 'no_postcode'),
+])
+def test_from_gnaf_fields_missing(missing, reason):
+    fields = dict(GNAF, number_last=None, street_type_code=None, street_suffix_code=None)
+    fields[missing] = None
+    with pytest.raises(AddressParseError) as excinfo:
+        AbAddressUtility.from_gnaf_fields(**fields)
+    assert excinfo.value.reason == reason
+
+
+def _write_psv(path, rows, extra_column=True):
+    with open(path, 'w') as f:
+        header = ['ADDRESS_DETAIL_PID'] + [name.upper() for name in GNAF_FIELDS]
+        if extra_column:
+            header.insert(1, 'BUILDING_NAME')
+        f.write('|'.join(header) + '\n')
+        for i, fields in enumerate(rows):
+            values = [f'GANSW{i}'] + [fields.get(name, '') for name in GNAF_FIELDS]
+            if extra_column:
+                values.insert(1, 'THE "PALMS"')
+            f.write('|'.join(values) + '\n')
+
+
+def test_read_gnaf_psv(tmp_path):
+    rows = list(_rows(500))
+    rows.append(dict(GNAF, flat_number='', number_first='', number_last=''))
+    path = tmp_path / 'ADDRESS_VIEW.psv'
+    _write_psv(path, rows)
+
+    results = list(read_gnaf_psv(str(path)))
+    assert [pid for pid, _ in results] == [f'GANSW{i}' for i in range(len(rows))]
+    for fields, (_, parsed) in zip(rows, results):
+        expected = _outcome(AbAddressUtility.from_gnaf_dict, fields)
+        if isinstance(parsed, ParsedAddress):
+            assert parsed.prop_id == expected[2]
+        else:
+            assert parsed.reason == expected
+    assert results[-1][1].reason == 'no_street_number'
+    failed = sum(not isinstance(parsed, ParsedAddress) for _, parsed in results)
+
+    with open(path) as f:
+        skipped = list(read_gnaf_psv(f, on_error='skip'))
+    assert len(skipped) == len(rows) - failed
+    with pytest.raises(AddressParseError):
+        list(read_gnaf_psv(str(path), on_error='raise'))
+
+
+def test_read_gnaf_psv_short_rows(tmp_path):
+    path = tmp_path / 'ADDRESS_VIEW.psv'
+    _write_psv(path, [GNAF, GNAF])
+    lines = path.read_text().splitlines()
+    path.write_text('\n'.join([lines[0], lines[1], 'GANSW9|THE PALMS|2', '', lines[2]]) + '\n')
+
+    results = list(read_gnaf_psv(str(path)))
+    assert [pid for pid, _ in results] == ['GANSW0', 'GANSW9', 'GANSW1']
+    assert results[1][1] == ParseFailure('GANSW9|THE PALMS|2', 'format')
+    assert [pid for pid, _ in read_gnaf_psv(str(path), on_error='skip')] == ['GANSW0', 'GANSW1']
+    with pytest.raises(AddressParseError):
+        list(read_gnaf_psv(str(path), on_error='raise'))
+
+
+def test_read_gnaf_psv_missing_column(tmp_path):
+    path = tmp_path / 'ADDRESS_VIEW.psv'
+    path.write_text('ADDRESS_DETAIL_PID|STREET_NAME\nGANSW1|EXAMPLE\n')
+    with pytest.raises(ValueError, match='postcode'):
+        list(itertools.islice(read_gnaf_psv(str(path)), 1))
+
+
+def test_read_gnaf_psv_invalid_on_error():
+    with pytest.raises(ValueError):
+        read_gnaf_psv('missing.psv', on_error='ignore')
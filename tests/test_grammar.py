@@ -0,0 +1,88 @@
+import pytest
+
+from au_address_parser import AbAddressUtility
+from au_address_parser.grammar import GRAMMAR
+
+
+def test_grammar_tables_are_read_only():
+    with pytest.raises(TypeError):
+        GRAMMAR.street_type_abbrs['STREET'] = 'STR'
+    with pytest.raises(TypeError):
+        GRAMMAR.street_suffix_abbrs['WEST'] = 'WST'
+
+
+def test_grammar_shared_by_instances():
+    address_cls = AbAddressUtility('22 Example RD, STANMORE, NSW 2048')
+    assert address_cls.rd_abbr_dict is GRAMMAR.street_type_abbrs
+    assert 'rd_abbr_dict' not in vars(address_cls)
+
+
+def test_grammar_clean():
+    assert GRAMMAR.clean('2 / 42 - 44  EXAMPLE ST ,, STANMORE') == '2/42-44 EXAMPLE ST, STANMORE'
+
+
+def test_grammar_reverse_indexes():
+    for full, abbr in GRAMMAR.street_type_abbrs.items():
+        assert GRAMMAR.street_type_fulls[abbr] == full
+    for full, abbr in GRAMMAR.street_suffix_abbrs.items():
+        assert GRAMMAR.street_suffix_fulls[abbr] == full
+    assert GRAMMAR.street_tokens['BLVD'] == ('type_unofficial', 'BOULEVARD', 'BVD')
+    assert GRAMMAR.street_tokens['BVD'] == ('type_abbr', 'BOULEVARD', 'BVD')
+    assert GRAMMAR.street_tokens['BOULEVARD'] == ('type', 'BOULEVARD', 'BVD')
+    assert GRAMMAR.street_tokens['W'] == ('suffix_abbr', 'WEST', 'W')
+
+
+def test_grammar_split_street_name():
+    assert GRAMMAR.split_street_name(['THE', 'AVENUE'])['street_type_abbr'] == 'AVENUE'
+    assert GRAMMAR.split_street_name(['THE', 'AVE'])['street_type_abbr'] == 'AVE'
+    assert GRAMMAR.split_street_name(['EXAMPLE', 'BLVD'])['street_type'] == 'BOULEVARD'
+    # unofficial abbreviations only count as the last token
+    assert GRAMMAR.split_street_name(['EXAMPLE', 'LN', 'W'])['street_name'] == 'EXAMPLE LN'
+    assert GRAMMAR.split_street_name(['W']) is None
+
+
+def test_parse_abbreviated_type_and_suffix():
+    address_cls = AbAddressUtility('22 Example RD N, STANMORE, NSW 2048')
+    assert address_cls.parsed_addr['street_type'] == 'ROAD'
+    assert address_cls.parsed_addr['street_type_abbr'] == 'RD'
+    assert address_cls.parsed_addr['street_suffix'] == 'NORTH'
+    assert address_cls.address == '22 Example Road North, Stanmore NSW 2048'
+
+
+@pytest.mark.parametrize('address, street_part, locality_part', [
+    ('22 EXAMPLE ST STANMORE NSW 2048', '22 EXAMPLE ST', 'STANMORE NSW 2048'),
+    ('22 EXAMPLE ST STANMORE', '22 EXAMPLE ST', 'STANMORE'),
+    ('UNIT 2 42-44 KING GEORGE ST SURRY HILLS NSW 2010', 'UNIT 2 42-44 KING GEORGE ST', 'SURRY HILLS NSW 2010'),
+    ('U2 42 OCEAN VIEW RD W ST KILDA VIC 3182', 'U2 42 OCEAN VIEW RD W', 'ST KILDA VIC 3182'),
+    ('2/42 EXAMPLE ST ST KILDA VIC 3182', '2/42 EXAMPLE ST', 'ST KILDA VIC 3182'),
+    ('42 EXAMPLE ST NORTH SYDNEY NSW 2060', '42 EXAMPLE ST', 'NORTH SYDNEY NSW 2060'),
+    ('42 THE AVENUE STANMORE NSW 2048', '42 THE AVENUE', 'STANMORE NSW 2048'),
+    ('42 KINGSWAY STANMORE NSW 2048', '42 KINGSWAY', 'STANMORE NSW 2048'),
+    ('42 EXAMPLE LN MOUNT WA WA 6000', '42 EXAMPLE LN', 'MOUNT WA WA 6000'),
+    ('5 MAIN ROAD POINT COOK VIC 3030', '5 MAIN ROAD', 'POINT COOK VIC 3030'),
+    ('10 HIGH STREET GLEN WAVERLEY VIC 3150', '10 HIGH STREET', 'GLEN WAVERLEY VIC 3150'),
+    ('7 KING STREET PORT MELBOURNE', '7 KING STREET', 'PORT MELBOURNE'),
+    ('5 MAIN ROAD ST KILDA VIC 3182', '5 MAIN ROAD', 'ST KILDA VIC 3182'),
+    ('22 EXAMPLE KINGS CROSS NSW 2011', '22 EXAMPLE', 'KINGS CROSS NSW 2011'),
+    ('3 MACLEAY POTTS POINT NSW 2011', '3 MACLEAY', 'POTTS POINT NSW 2011'),
+])
+def test_grammar_split_without_comma(address, street_part, locality_part):
+    assert GRAMMAR.split_parts(address) == (street_part, locality_part)
+
+
+@pytest.mark.parametrize('address', ['STANMORE', '42 EXAMPLE ST', '42 EXAMPLE ST NSW 2048', ''])
+def test_grammar_split_without_comma_fails(address):
+    assert GRAMMAR.split_parts(address) is None
+
+
+def test_grammar_split_at_known_locality():
+    trie = GRAMMAR.token_trie(['PORT MELBOURNE', 'STANMORE', 'ST KILDA'])
+    assert trie['ST']['KILDA'][''] == ('locality',)
+    assert trie['NSW'][''] == ('state',)
+    assert GRAMMAR.split_parts('42 PARK STREET PORT MELBOURNE VIC 3207', trie) == (
+        '42 PARK STREET', 'PORT MELBOURNE VIC 3207')
+    assert GRAMMAR.split_parts('42 EXAMPLE ST WEST STANMORE NSW 2048', trie) == (
+        '42 EXAMPLE ST WEST', 'STANMORE NSW 2048')
+    # Without the locality, a full suffix word starts the locality
+    assert GRAMMAR.split_parts('42 EXAMPLE ST WEST STANMORE NSW 2048') == (
+        '42 EXAMPLE ST', 'WEST STANMORE NSW 2048')
@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+
+import pytest
+
+from au_address_parser import (MAX_LENGTH, AbAddressUtility, AddressParseError, ParseFailure,
+                               ParsedAddress, parse_many, standardise_address)
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import generate, pathological  # noqa: E402
+
+
+def test_max_length():
+    address = '1 KING ST, ' + 'A' * MAX_LENGTH + ' NSW 2000'
+    failure, = parse_many([address], max_length=MAX_LENGTH)
+    assert failure == ParseFailure(address, 'too_long')
+    assert standardise_address(address, max_length=MAX_LENGTH) is None
+    with pytest.raises(AddressParseError) as excinfo:
+        AbAddressUtility(address, max_length=MAX_LENGTH)
+    assert excinfo.value.reason == 'too_long'
+    assert AbAddressUtility(address[:20] + ' NSW 2000', max_length=MAX_LENGTH).parsed_addr['post'] == '2000'
+
+
+def _best_time(address, repeat=3):
+    """Least of ``repeat`` timings, so a scheduler pause doesn't count."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result, = parse_many([address], compact=True, engine='token', max_length=MAX_LENGTH)
+        best = min(best, time.perf_counter() - start)
+    assert isinstance(result, (ParsedAddress, ParseFailure))
+    return best
+
+
+def test_pathological_latency():
+    # Each of these backtracks for seconds to minutes in the regex engine;
+    # the token engine takes a few times as long as for an ordinary address,
+    # the inputs being a few times as long.  Timing both in this run keeps
+    # the bound independent of how fast or loaded the machine is.
+    baseline = max(_best_time(address) for address in generate(300, seed=3))
+    worst = max(_best_time(address) for _, address in pathological(300, MAX_LENGTH, seed=3))
+    assert worst < 20 * baseline
@@ -0,0 +1,54 @@
+from hashlib import md5
+
+import pytest
+
+from au_address_parser import ID_SCHEMES, AbAddressUtility, parse_many, prop_ids, standardise_many
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             '2/42 EXAMPLE ST, STANMORE NSW 2048',
+             '22 Example ST west, STANMORE, NSW 2048']
+
+
+def test_md5_schemes_match_prop_id():
+    addr = AbAddressUtility(ADDRESSES[0])
+    assert addr.address_id() == addr.prop_id
+    assert addr.address_id('md5') == md5(addr.std_address.encode()).digest()
+    assert addr.address_id('md5').hex() == addr.prop_id
+
+
+def test_xxh3_schemes():
+    pytest.importorskip('xxhash')
+    first, second, other = parse_many(ADDRESSES, compact=True)
+    # Stable values, documented as frozen across releases
+    assert first.address_id('xxh3_64') == 11334234064938275909
+    assert first.address_id('xxh3_128').hex() == '07b5ab37918ade6bc8ef3cf536b4b6b0'
+    for scheme in ID_SCHEMES:
+        assert first.address_id(scheme) == second.address_id(scheme)
+        assert first.address_id(scheme) != other.address_id(scheme)
+
+
+def test_prop_ids_batch():
+    parsed = list(parse_many(ADDRESSES, compact=True))
+    instances = list(parse_many(ADDRESSES))
+    std_addresses = [p.std_address for p in parsed]
+    for scheme in ('md5_hex', 'md5'):
+        expected = [p.address_id(scheme) for p in parsed]
+        assert prop_ids(parsed, scheme) == expected
+        assert prop_ids(instances, scheme) == expected
+        assert prop_ids(std_addresses, scheme) == expected
+    assert prop_ids(parsed) == [p.prop_id for p in parsed]
+
+
+def test_standardise_many_id_scheme():
+    results = list(standardise_many(ADDRESSES + ['STANMORE'], workers=1, id_scheme='md5'))
+    assert results[0] == (AbAddressUtility(ADDRESSES[0]).std_address,
+                          AbAddressUtility(ADDRESSES[0]).address_id('md5'))
+    assert results[-1] == (None, None)
+
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        prop_ids(ADDRESSES, 'sha1')
+    with pytest.raises(ValueError):
+        standardise_many(ADDRESSES, id_scheme='sha1')
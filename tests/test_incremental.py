@@ -0,0 +1,114 @@
+import csv
+import json
+
+import pytest
+
+from au_address_parser import AbAddressUtility, Change, restandardise
+from au_address_parser import incremental
+from au_address_parser.cli import main
+
+
+FIRST = [('P1', '22 Example ST, STANMORE NSW 2048'),
+         ('P2', 'STANMORE'),
+         ('P3', '1 King St, Newtown NSW 2042'),
+         ('P1', '99 Repeated St, STANMORE NSW 2048')]
+
+SECOND = [('P1', '22 Example Street, Stanmore NSW 2048'),
+          ('P2', '2 King St, STANMORE NSW 2048'),
+          ('P4', '5 Queen St, Newtown NSW 2042')]
+
+
+def _changes(rows, state, **kw):
+    return sorted(restandardise(rows, str(state), **kw), key=lambda change: change.key)
+
+
+def test_inserts_updates_and_deletes(tmp_path):
+    state = tmp_path / 'feed.state'
+    first = _changes(FIRST, state)
+    assert [(c.op, c.key) for c in first] == [('insert', 'P1'), ('insert', 'P2'), ('insert', 'P3')]
+    assert first[0].std_address == '22 EXAMPLE ST, STANMORE NSW 2048'
+    assert first[0].prop_id == AbAddressUtility(FIRST[0][1]).prop_id
+    assert first[1] == Change('insert', 'P2', None, None, 'format')
+    assert _changes(FIRST, state) == []
+
+    # P1's text changed, but not its standardised address
+    second = _changes(SECOND, state)
+    assert [(c.op, c.key) for c in second] == [('update', 'P2'), ('delete', 'P3'), ('insert', 'P4')]
+    assert second[0].std_address == '2 KING ST, STANMORE NSW 2048'
+    assert second[1] == first[2]._replace(op='delete')
+    assert _changes(SECOND, state) == []
+    assert _changes([], state) == [c._replace(op='delete') for c in _changes(SECOND, tmp_path / 'new')]
+
+
+def test_only_changed_rows_are_parsed(tmp_path, monkeypatch):
+    state = tmp_path / 'feed.state'
+    rows = [(i, f'{i} Example St, STANMORE NSW 2048') for i in range(1, 50)]
+    assert len(_changes(rows, state, run_size=7)) == 49
+
+    parsed = []
+    standardise = incremental._standardise
+    monkeypatch.setattr(incremental, '_standardise',
+                        lambda address, *args: parsed.append(address) or standardise(address, *args))
+    rows[10] = (11, '11 Changed St, STANMORE NSW 2048')
+    rows[20] = (21, '21 EXAMPLE STREET, STANMORE NSW 2048')
+    changes = _changes(rows, state, run_size=7)
+    assert sorted(parsed) == ['11 Changed St, STANMORE NSW 2048', '21 EXAMPLE STREET, STANMORE NSW 2048']
+    assert [(c.op, c.key) for c in changes] == [('update', '11')]
+
+    # A new parser version parses every row again
+    parsed.clear()
+    monkeypatch.setattr(incremental, 'PARSER_VERSION', incremental.PARSER_VERSION + 1)
+    assert _changes(rows, state) == []
+    assert len(parsed) == 49
+
+
+def test_new_engine_or_max_length_parses_again(tmp_path):
+    state = tmp_path / 'feed.state'
+    rows = FIRST[:1]
+    assert _changes(rows, state, max_length=10) == [Change('insert', 'P1', None, None, 'too_long')]
+    assert _changes(rows, state, max_length=10) == []
+    raised = _changes(rows, state, max_length=1000)
+    assert [(c.op, c.std_address) for c in raised] == [('update', '22 EXAMPLE ST, STANMORE NSW 2048')]
+    assert _changes(rows, state) == []
+    assert _changes(rows, state, max_length=10)[0].reason == 'too_long'
+    assert _changes(rows, state, engine='token')[0].std_address == '22 EXAMPLE ST, STANMORE NSW 2048'
+
+
+def test_state_kept_when_stopped_early(tmp_path):
+    state = tmp_path / 'feed.state'
+    _changes(FIRST, state)
+    before = state.read_bytes()
+    changes = restandardise(SECOND, str(state))
+    next(changes)
+    changes.close()
+    assert state.read_bytes() == before
+    assert list(tmp_path.iterdir()) == [state]
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        restandardise(FIRST, str(tmp_path / 'state'), engine='nope')
+    with pytest.raises(ValueError):
+        restandardise(FIRST, str(tmp_path / 'state'), run_size=0)
+    bad = tmp_path / 'bad.state'
+    bad.write_bytes(b'NOT A STATE FILE')
+    with pytest.raises(ValueError):
+        list(restandardise(FIRST, str(bad)))
+
+
+def test_cli_changes(tmp_path, capsys):
+    state, out = tmp_path / 'feed.state', tmp_path / 'changes.csv'
+    for name, rows in (('first.csv', FIRST[:3]), ('second.csv', SECOND)):
+        with open(tmp_path / name, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['id', 'address'])
+            writer.writerows(rows)
+    args = ['changes', '--state', str(state), '--key-column', 'id', '-o', str(out)]
+    assert main(args + [str(tmp_path / 'first.csv')]) == 0
+    assert main(args + [str(tmp_path / 'second.csv')]) == 0
+    summaries = [json.loads(s) for s in capsys.readouterr().err.replace('}\n{', '}\0{').split('\0')]
+    assert [s['inserts'] for s in summaries] == [3, 1]
+    assert [(s['updates'], s['deletes']) for s in summaries] == [(0, 0), (1, 1)]
+    with open(out, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert sorted((row['op'], row['key']) for row in rows) == [('delete', 'P3'), ('insert', 'P4'), ('update', 'P2')]
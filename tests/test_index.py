@@ -0,0 +1,61 @@
+import os
+from hashlib import md5
+
+import pytest
+
+from au_address_parser import PropIndex, build_prop_index, parse_many
+
+
+def _records(n):
+    return [(md5(str(i).encode()).hexdigest(), f'property {i}') for i in range(n)]
+
+
+@pytest.mark.parametrize('n, run_size', [(0, 10), (1, 10), (50, 7), (5000, 1000), (5000, 100000)])
+def test_build_and_lookup(tmp_path, n, run_size):
+    path = str(tmp_path / 'props.idx')
+    records = _records(n)
+    assert build_prop_index(path, records, run_size=run_size) == n
+
+    with PropIndex(path) as index:
+        assert len(index) == n
+        for prop_id, record in records:
+            assert index.get(prop_id) == record
+            assert index[bytes.fromhex(prop_id)] == record
+            assert prop_id in index
+        for i in range(n, n + 200):
+            missing = md5(str(i).encode()).hexdigest()
+            assert missing not in index
+            assert index.get(missing, 'none') == 'none'
+        with pytest.raises(KeyError):
+            index['0' * 32]
+    assert os.listdir(tmp_path) == ['props.idx']
+
+
+def test_repeated_key_keeps_first_record(tmp_path):
+    path = str(tmp_path / 'props.idx')
+    records = _records(300)
+    records += [(prop_id, 'again') for prop_id, _ in records[::3]]
+    assert build_prop_index(path, records, run_size=64) == 300
+    with PropIndex(path) as index:
+        assert all(index[prop_id] == record for prop_id, record in records[:300])
+
+
+def test_match_address(tmp_path):
+    path = str(tmp_path / 'props.idx')
+    parsed = parse_many(['U2 42-44 Example St, STANMORE, NSW 2048',
+                         '22 Example ST west, STANMORE, NSW 2048'], compact=True)
+    build_prop_index(path, ((p.prop_id, p.std_address) for p in parsed))
+    with PropIndex(path) as index:
+        assert index.match('Unit 2 42 Example Street, Stanmore NSW 2048') == '2/42 EXAMPLE ST, STANMORE NSW 2048'
+        assert index.match('22 EXAMPLE ST W, STANMORE NSW 2048', engine='token') == '22 EXAMPLE ST W, STANMORE NSW 2048'
+        assert index.match('24 Example St, STANMORE, NSW 2048') is None
+        assert index.match('STANMORE', default='unparsed') == 'unparsed'
+
+
+def test_invalid_keys_and_files(tmp_path):
+    path = tmp_path / 'props.idx'
+    with pytest.raises(ValueError):
+        build_prop_index(str(path), [('abcd', 'short')])
+    path.write_bytes(b'x' * 64)
+    with pytest.raises(ValueError):
+        PropIndex(str(path))
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from au_address_parser import AbAddressUtility, AddressMatcher, parse_many
+from au_address_parser.matching import WEIGHTS, _grams, street_key
+
+
+REFERENCES = [('P1', '2/42 Example St, STANMORE NSW 2048'),
+              ('P2', '3/42 Example St, STANMORE NSW 2048'),
+              ('P3', '44 Example St, STANMORE NSW 2048'),
+              ('P4', '42 Example St, NEWTOWN NSW 2042'),
+              ('P5', '42 King St, STANMORE NSW 2048')]
+
+
+@pytest.fixture
+def matcher():
+    matcher = AddressMatcher()
+    assert matcher.add_many(REFERENCES + [('bad', 'STANMORE')]) == len(REFERENCES)
+    return matcher
+
+
+def _keys(matches):
+    return [m.key for m in matches]
+
+
+def test_street_key():
+    assert street_key('EXAMPLE') == street_key('EXMAPLE') == 'E251'
+    assert street_key('ASHCRAFT') == 'A261'
+    assert street_key('PFISTER') == 'P236'
+    assert street_key('1ST') == '1ST'
+    assert street_key(None) == ''
+    assert sum(WEIGHTS.values()) == pytest.approx(1)
+
+
+def test_exact_match_scores_one(matcher):
+    best = matcher.match('Unit 2 42 Example Street, Stanmore NSW 2048')[0]
+    assert best.key == 'P1'
+    assert best.score == 1
+    assert best.parsed == AbAddressUtility(REFERENCES[0][1])._parsed
+
+
+def test_near_duplicates(matcher):
+    # Misspelt locality and wrong postcode
+    assert _keys(matcher.match('2/42 Example St, STANMOR NSW 2049'))[0] == 'P1'
+    # Misspelt street name
+    assert _keys(matcher.match('3/42 Exmaple St, STANMORE NSW 2048'))[0] == 'P2'
+    # A typo that changes the phonetic key falls back to every street
+    assert street_key('EXAMLE') != street_key('EXAMPLE')
+    assert _keys(matcher.match('3/42 Examle St, STANMORE NSW 2048'))[0] == 'P2'
+    # Missing unit number: both units, just below an exact match
+    matches = matcher.match('42 Example St, STANMORE NSW 2048')
+    assert _keys(matches) == ['P1', 'P2']
+    assert 0.9 < matches[0].score < 1
+
+
+def test_other_numbers_and_streets_are_not_candidates(matcher):
+    assert _keys(matcher.match('46 Example St, STANMORE NSW 2048')) == []
+    assert _keys(matcher.match('42 Example St, STANMORE NSW 2048', min_score=0)) == ['P1', 'P2']
+    assert _keys(matcher.match('42 Example St, NEWTOWN NSW 2042')) == ['P4']
+
+
+def test_limit_min_score_and_inputs(matcher):
+    assert len(matcher.match('42 Example St, STANMORE NSW 2048', limit=1)) == 1
+    assert _keys(matcher.match('42 Example St, STANMORE NSW 2048', min_score=0.95)) == []
+    assert matcher.match('STANMORE') == []
+    parsed, = parse_many(['44 Example St, STANMORE NSW 2048'], compact=True)
+    assert _keys(matcher.match(parsed)) == ['P3']
+    assert _keys(matcher.match(AbAddressUtility('44 Example St, STANMORE NSW 2048'))) == ['P3']
+    assert len(matcher) == len(REFERENCES)
+
+
+def test_similar_localities_follow_added_references(matcher):
+    # A misspelt locality is looked up, then a locality like it is added
+    assert _keys(matcher.match('7 Other St, STANMOR NSW 2049')) == []
+    assert matcher.add('P6', '7 Other St, STANMORR NSW 2050')
+    assert _keys(matcher.match('7 Other St, STANMOR NSW 2049')) == ['P6']
+    assert sorted(matcher._similar['STANMORE']) == ['STANMORE', 'STANMORR']
+
+
+def test_locality_search_matches_brute_force():
+    rnd = random.Random(0)
+    matcher = AddressMatcher()
+    names = {''.join(rnd.choice('ABDELNORST') for _ in range(rnd.randint(3, 10))) for _ in range(300)}
+    for i, name in enumerate(sorted(names)):
+        matcher.add(i, f'1 Example St, {name} NSW 2000')
+    for query in list(names)[:50] + ['STANMOR', 'BARNES', 'LOT']:
+        grams = _grams(query)
+        expected = {name for name in names
+                    if 2 * len(grams & _grams(name)) / (len(grams) + len(_grams(name))) >= 0.5}
+        assert set(matcher._similar_localities(query)) == expected
@@ -0,0 +1,34 @@
+import pytest
+
+from au_address_parser import AbAddressUtility, standardise_many
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             'STANMORE',
+             '22 Example ST west, STANMORE, NSW 2048'] * 5
+
+
+def _expected():
+    expected = []
+    for address in ADDRESSES:
+        try:
+            address_cls = AbAddressUtility(address)
+            expected.append((address_cls.std_address, address_cls.prop_id))
+        except Exception:
+            expected.append((None, None))
+    return expected
+
+
+def test_standardise_many_in_process():
+    assert list(standardise_many(ADDRESSES, workers=1, chunksize=4)) == _expected()
+
+
+def test_standardise_many_pool_keeps_order():
+    assert list(standardise_many(iter(ADDRESSES), workers=2, chunksize=2)) == _expected()
+
+
+def test_standardise_many_invalid_args():
+    with pytest.raises(ValueError):
+        standardise_many(ADDRESSES, workers=0)
+    with pytest.raises(ValueError):
+        standardise_many(ADDRESSES, chunksize=0)
@@ -0,0 +1,53 @@
+import types
+
+import pytest
+
+from au_address_parser import (AbAddressUtility, AddressParseError,
+                               ParseFailure, parse_many, standardise_address)
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             'STANMORE',
+             '22 Example ST, STANMORE',
+             None,
+             '22 Example ST west, STANMORE, NSW 2048']
+
+
+def test_parse_many_records_failures():
+    results = parse_many(ADDRESSES)
+    assert isinstance(results, types.GeneratorType)
+    results = list(results)
+    assert results[0].std_address == '2/42 EXAMPLE ST, STANMORE NSW 2048'
+    assert results[1] == ParseFailure('STANMORE', 'format')
+    assert results[2] == ParseFailure('22 Example ST, STANMORE', 'no_state')
+    assert results[3] == ParseFailure(None, 'not_a_string')
+    assert results[4].std_address == '22 EXAMPLE ST W, STANMORE NSW 2048'
+
+
+def test_parse_many_matches_class():
+    for address_cls, address in zip(parse_many(ADDRESSES, on_error='skip'),
+                                    ADDRESSES[::4]):
+        expected = AbAddressUtility(address)
+        assert address_cls.addr_string == expected.addr_string
+        assert address_cls.parsed_addr == expected.parsed_addr
+        assert address_cls.address == expected.address
+        assert address_cls.prop_id == expected.prop_id
+
+
+def test_parse_many_raise():
+    results = parse_many(ADDRESSES, on_error='raise')
+    next(results)
+    with pytest.raises(AddressParseError) as excinfo:
+        next(results)
+    assert excinfo.value.reason == 'format'
+    with pytest.raises(ValueError):
+        parse_many(ADDRESSES, on_error='ignore')
+
+
+def test_parse_errors():
+    with pytest.raises(AddressParseError) as excinfo:
+        AbAddressUtility('22 Example ST, STANMORE NSW')
+    assert excinfo.value.reason == 'no_postcode'
+    assert standardise_address('22 Example ST, STANMORE NSW') is None
+    assert standardise_address(None) is None
+    assert standardise_address('22 Example ST, STANMORE NSW 2048') == '22 EXAMPLE ST, STANMORE NSW 2048'
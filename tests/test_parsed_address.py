@@ -0,0 +1,52 @@
+import pytest
+
+from au_address_parser import (AbAddressUtility, ParsedAddress, disable_parse_cache,
+                               enable_parse_cache, parse_many)
+
+
+ADDRESSES = ['Unit 2 42-44 Example ST, STANMORE,  NSW 2048',
+             '22 Example ST west, STANMORE, NSW 2048',
+             'Shop 3A 7B Main RD, NEWTOWN NSW 2042']
+
+
+def test_parsed_address_matches_class():
+    for address, parsed in zip(ADDRESSES, parse_many(ADDRESSES, compact=True)):
+        address_cls = AbAddressUtility(address)
+        assert isinstance(parsed, ParsedAddress)
+        assert parsed.parsed_addr == address_cls.parsed_addr
+        assert parsed.address_abbr == address_cls.address_abbr
+        assert parsed.std_address == address_cls.std_address
+        assert parsed.address == address_cls.address
+        assert parsed.prop_id == address_cls.prop_id
+
+
+def test_parsed_address_compact():
+    first, second = parse_many(ADDRESSES[:2], compact=True)
+    assert not hasattr(first, '__dict__')
+    assert first.state is second.state
+    assert first.street_type is second.street_type
+    with pytest.raises(AttributeError):
+        first.street_name = 'OTHER'
+
+
+def test_cache_shares_parsed_address():
+    enable_parse_cache()
+    try:
+        first, second = parse_many(ADDRESSES[:1] * 2, compact=True)
+        assert first is second
+    finally:
+        disable_parse_cache()
+
+
+def test_derived_forms_are_lazy():
+    address_cls = AbAddressUtility(ADDRESSES[0])
+    assert 'prop_id' not in vars(address_cls)
+    assert 'address' not in vars(address_cls)
+    assert address_cls.prop_id == 'b8b3b969b70b290b44900e070fcf4b37'
+    assert 'address' not in vars(address_cls)
+    # the id comes from the parse, not from an overridden std_address
+    other = AbAddressUtility(ADDRESSES[0])
+    other.std_address = 'OVERRIDDEN'
+    assert other.prop_id == address_cls.prop_id
+    address_cls.address = 'Somewhere else'
+    assert address_cls.address == 'Somewhere else'
@@ -0,0 +1,110 @@
+import os
+import sys
+
+import pytest
+
+from au_address_parser import (AbAddressUtility, AddressParseError, disable_parse_cache,
+                               disable_parse_stats, enable_parse_cache, enable_parse_stats,
+                               parse_many, parse_stats, standardise_address)
+from au_address_parser.addr_parser import ENGINES
+from au_address_parser.grammar import GRAMMAR
+from au_address_parser.stats import BUCKETS, STAGES
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import mixed  # noqa: E402
+
+
+@pytest.fixture
+def stats():
+    yield enable_parse_stats()
+    disable_parse_stats()
+
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_traced_parse_matches_engine(engine):
+    addresses = [GRAMMAR.clean(address.upper()) for _, address in mixed(3000, seed=4)]
+    expected = [AbAddressUtility._parse(address, engine) for address in addresses]
+    enable_parse_stats(timings=True)
+    try:
+        assert [AbAddressUtility._parse(address, engine) for address in addresses] == expected
+        stats = parse_stats()
+    finally:
+        disable_parse_stats()
+    assert stats['parses'] == len(addresses)
+    assert stats['failures'] == sum(parsed is None for parsed, _ in expected)
+    assert stats['timings']['total']['count'] == len(addresses)
+
+
+@pytest.mark.parametrize('address, branches', [
+    ('22 Example ST, STANMORE, NSW 2048',
+     ['locality.state_post', 'split.two_commas', 'street.number', 'street_name.type']),
+    ('The Grove, Unit 2 42-44 Example ST W, STANMORE NSW 2048',
+     ['locality.state_post', 'split.property_name', 'street.marker', 'street_name.type_suffix']),
+    ('2/42 Example ST STANMORE NSW 2048',
+     ['locality.state_post', 'split.no_comma', 'street.slash', 'street_name.type']),
+    ('42 Kingsway N, STANMORE', ['locality.name', 'split.one_comma', 'street.number']),
+    ('Example ST, STANMORE NSW 2048', ['split.one_comma', 'street.none']),
+    ('1, 2, 3, 4', ['split.bad_commas']),
+])
+def test_branches(stats, address, branches):
+    standardise_address(address)
+    assert list(parse_stats()['branches']) == branches
+
+
+def test_reasons_include_rejected_addresses(stats):
+    list(parse_many(['22 Example ST, STANMORE', None, 'x' * 30, 'STANMORE'], max_length=25))
+    assert standardise_address(None) is None
+    with pytest.raises(AddressParseError):
+        AbAddressUtility('x' * 30, max_length=25)
+    assert parse_stats()['reasons'] == {'format': 1, 'no_state': 1, 'not_a_string': 2, 'too_long': 2}
+    assert parse_stats()['parses'] == 2
+    assert parse_stats()['failures'] == 6
+    assert parse_stats()['timings'] == {}
+    stats.clear()
+    assert parse_stats()['reasons'] == {}
+
+
+def test_timings_and_callback():
+    traces = []
+    enable_parse_stats(timings=True, callback=traces.append)
+    try:
+        standardise_address('22 Example ST, STANMORE NSW 2048')
+        standardise_address('22 Example ST, STANMORE NSW')
+        timings = parse_stats()['timings']
+    finally:
+        disable_parse_stats()
+    assert list(timings) == list(STAGES)
+    assert timings['total']['count'] == timings['locality']['count'] == 2
+    assert timings['street_name']['count'] == 1
+    assert len(timings['total']['histogram']) == len(BUCKETS) + 1
+    assert sum(timings['split']['histogram'].values()) == 2
+
+    assert [trace.reason for trace in traces] == [None, 'no_postcode']
+    assert traces[1].address == '22 EXAMPLE ST, STANMORE NSW'
+    assert traces[1].branches == ('split.one_comma', 'street.number', 'locality.state')
+    assert set(traces[1].timings) == {'split', 'street', 'locality', 'total'}
+
+
+def test_off_by_default_and_cache_hits_not_counted(stats):
+    enable_parse_cache()
+    try:
+        for _ in range(3):
+            standardise_address('22 Example ST, STANMORE NSW 2048')
+    finally:
+        disable_parse_cache()
+    assert parse_stats()['parses'] == 1
+    disable_parse_stats()
+    assert parse_stats() is None
+    assert standardise_address('22 Example ST, STANMORE NSW 2048')
+
+
+def test_engine_itself_is_traced(stats, monkeypatch):
+    def parse_address(address, trace=None):
+        trace.branches.append('split.custom')
+        trace.stage('split')
+        return None, 'format'
+
+    monkeypatch.setitem(ENGINES, 'regex', parse_address)
+    assert standardise_address('22 Example ST, STANMORE NSW 2048') is None
+    assert parse_stats()['branches'] == {'split.custom': 1}
+    assert parse_stats()['reasons'] == {'format': 1}
@@ -0,0 +1,94 @@
+import os
+import random
+import sys
+
+import pytest
+
+from au_address_parser import AbAddressUtility, enable_parse_cache, disable_parse_cache, parse_many
+from au_address_parser.addr_parser import ENGINES
+from au_address_parser.grammar import GRAMMAR
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+from corpus import generate  # noqa: E402
+
+
+MALFORMED = ['12-14-16 KING ST, X NSW 2000',
+             '1 A/B ST, X NSW 2000',
+             '1 KING U2 3 ST, X NSW 2000',
+             'UNIT 2 42 , X NSW 2000',
+             '2/42-A KING ST, X NSW 2000',
+             '42 ROUTE 66 W, X-Y NSW 20000',
+             'LOT 5 KING ST, X NSW',
+             '5 KING ST, X 2000',
+             '5 KING ST, 2000 NSW',
+             '5 KING ST, X\tNSW\t2000',
+             '5 KING ST, X NSWA 2000',
+             '5 KING ST,, X SA 5000X',
+             'SHOP 1 2 3 THE MALL, X WA 6000',
+             '5 W, X NSW 2000',
+             '5 KING ST X NSW 2000',
+             'KINGU2 42 X ST, Y NSW 2000',
+             'A/42 X ST, Y NSW 2000',
+             '1-A-B2-C X ST, Y NSW 2000',
+             'UNIT A2/3 4 X ST, Y NSW 2000',
+             '5_6/7 X ST, Y NSW 2000',
+             '']
+
+
+def _mutations(addresses, seed):
+    rng = random.Random(seed)
+    alphabet = 'AB NSW-/,0123\t'
+    for address in addresses:
+        chars = list(address)
+        for _ in range(rng.randint(1, 3)):
+            pos = rng.randint(0, len(chars))
+            if rng.random() < 0.5 and chars:
+                del chars[min(pos, len(chars) - 1)]
+            else:
+                chars.insert(pos, rng.choice(alphabet))
+        yield ''.join(chars)
+
+
+def _inputs():
+    corpus = list(generate(2000, seed=7))
+    return corpus + list(_mutations(corpus, seed=7)) + MALFORMED
+
+
+def test_engines_agree():
+    for address in _inputs():
+        clean_addr_string = GRAMMAR.clean(address.upper())
+        assert ENGINES['token'](clean_addr_string) == ENGINES['regex'](clean_addr_string), address
+
+
+def test_token_engine_parsed_addr():
+    for address in MALFORMED[:2]:
+        expected = AbAddressUtility(address)
+        address_cls = AbAddressUtility(address, engine='token')
+        assert address_cls.parsed_addr == expected.parsed_addr
+        assert address_cls.std_address == expected.std_address
+
+
+def test_token_engine_linear():
+    # Each takes seconds or more with the street and locality patterns
+    street = '1-' + '-'.join(['A' * 12] * 8) + '-. KING ST, STANMORE NSW 2048'
+    locality = '1 KING ST, ' + 'CUL-DE-SAC SHOP WEST SHOP LOT STANMORE CUL-DE-SAC ' * 4 + '!'
+    street_failure, locality_failure = parse_many([street, locality], engine='token')
+    assert street_failure.reason == 'no_street_number'
+    assert locality_failure.reason == 'no_state'
+
+
+def test_cache_keyed_by_engine():
+    try:
+        cache = enable_parse_cache()
+        list(parse_many(MALFORMED, engine='token'))
+        list(parse_many(MALFORMED))
+        assert cache.info().currsize == 2 * len(MALFORMED)
+    finally:
+        disable_parse_cache()
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        parse_many([], engine='lalr')
+    with pytest.raises(ValueError):
+        AbAddressUtility(MALFORMED[0], engine='lalr')